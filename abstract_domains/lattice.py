@@ -22,15 +22,26 @@ class Lattice(metaclass=ABCMeta):
         Subclasses are expected to provide consistent method implementations for
         ``bottom()``, ``is_bottom()``, ``top()`` and ``is_top()``.
     """
+    __slots__ = ()  # the lattice classes below hold no state of their own, subclasses may be slotted
 
     def __eq__(self, other: 'Lattice'):
-        return isinstance(other, self.__class__) and repr(self) == repr(other)
+        return isinstance(other, self.__class__) and self._key() == other._key()
 
     def __ne__(self, other: 'Lattice'):
         return not (self == other)
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash(self._key())
+
+    def _key(self):
+        """Canonical key of the current lattice element, used for equality and hashing.
+
+        Subclasses should override this with a cheap key built from primitive values (e.g., tuples of bounds).
+
+        :return: hashable key, equal for equal lattice elements (the representation by default)
+
+        """
+        return repr(self)
 
     @abstractmethod
     def __repr__(self):
@@ -111,10 +122,12 @@ class Lattice(metaclass=ABCMeta):
         :return: current lattice element modified to be the least upper bound of the two lattice elements
 
         """
-        if self.is_bottom() or other.is_top():
+        if self.is_bottom():
             return self.replace(other)
-        elif other.is_bottom() or self.is_top():
+        elif other.is_bottom() or self.is_top():  # bottom is neutral, even if it is represented like top
             return self
+        elif other.is_top():
+            return self.replace(other)
         else:
             return self._join(other)
 
@@ -187,12 +200,32 @@ class Lattice(metaclass=ABCMeta):
         :return: current lattice element updated to be equal to other
 
         """
+        self.__dict__.pop('_hash', None)
         self.__dict__.update(other.__dict__)
         return self
 
 
+class CachedHashMixin(Lattice, metaclass=ABCMeta):
+    """Mixin that caches the hash value of a lattice element.
+
+    Only suitable for lattice elements whose canonical key solely depends on attributes that are never modified in
+    place (e.g., integers or frozen sets): assigning any attribute invalidates the cached hash value.
+    """
+
+    def __setattr__(self, name, value):
+        self.__dict__.pop('_hash', None)
+        super().__setattr__(name, value)
+
+    def __hash__(self):
+        value = self.__dict__.get('_hash')
+        if value is None:
+            value = self.__dict__['_hash'] = super().__hash__()
+        return value
+
+
 class KindMixin(Lattice, metaclass=ABCMeta):
     """Mixin that adds an explicit distinction between bottom, default, and top elements to a lattice."""
+    __slots__ = ()  # slotted subclasses declare a ``_kind`` slot
 
     class Kind(Enum):
         """Kind of a lattice element."""
@@ -216,6 +249,7 @@ class KindMixin(Lattice, metaclass=ABCMeta):
 
 class BottomMixin(KindMixin, metaclass=ABCMeta):
     """Mixin that adds a predefined bottom element to a lattice."""
+    __slots__ = ()
 
     @copy_docstring(Lattice.bottom)
     def bottom(self):
@@ -229,6 +263,7 @@ class BottomMixin(KindMixin, metaclass=ABCMeta):
 
 class TopMixin(KindMixin, metaclass=ABCMeta):
     """Mixin that adds a predefined top element to another lattice."""
+    __slots__ = ()
 
     @copy_docstring(Lattice.top)
     def top(self):
@@ -8,11 +8,11 @@ A program variable is *live* in a state if its value may be used before the vari
 
 from enum import IntEnum
 from typing import List, Set
-from abstract_domains.store import Store
-from abstract_domains.lattice import Lattice
+from abstract_domains.store import FiniteLattice, PackedStore
+from abstract_domains.lattice import Lattice, CachedHashMixin
 from abstract_domains.state import State
 from core.utils import copy_docstring
-from core.expressions import Expression, VariableIdentifier
+from core.expressions import Expression, VariableIdentifier, Index
 
 
 class LivenessLattice(Lattice):
@@ -47,6 +47,9 @@ class LivenessLattice(Lattice):
     def __repr__(self):
         return self.element.name
 
+    def _key(self):
+        return self.element
+
     @copy_docstring(Lattice.bottom)
     def bottom(self):
         """The bottom lattice element is ``Dead``."""
@@ -86,10 +89,11 @@ class LivenessLattice(Lattice):
         return self._join(other)
 
 
-class LivenessState(Store, State):
+class LivenessState(PackedStore, State):
     """Live variable analysis state. An element of the live variable abstract domain.
 
     Map from each program variable to its liveness status. All program variables are *dead* by default.
+    The liveness statuses are packed into an array (cf. ``PackedStore``).
 
     .. document private methods
     .. automethod:: LivenessState._assign_variable
@@ -102,7 +106,28 @@ class LivenessState(Store, State):
 
         :param variables: list of program variables
         """
-        super().__init__(variables, {int: lambda _: LivenessLattice()})
+        super().__init__(variables, LivenessState.LATTICE)
+
+    @copy_docstring(Lattice.is_bottom)
+    def is_bottom(self) -> bool:
+        """The current state is bottom if `all` of its variables are dead."""
+        return self.codes.count(self.lattice.bottom) == len(self.codes)
+
+    def dead_variables(self) -> List[VariableIdentifier]:
+        """Variables that are dead in the current state.
+
+        :return: list of the variables of the current state that are dead
+        """
+        return [var for var, element in self.items() if element == LivenessLattice.Status.Dead]
+
+    def _make_live(self, expression: Expression):
+        """Mark the (tracked) variables appearing in an expression as live.
+
+        :param expression: expression whose variables are used
+        """
+        for identifier in expression.ids():
+            if identifier in self:
+                self[identifier] = LivenessLattice.Status.Live
 
     @copy_docstring(State._access_variable)
     def _access_variable(self, variable: VariableIdentifier) -> Set[Expression]:
@@ -114,9 +139,7 @@ class LivenessState(Store, State):
 
     @copy_docstring(State._assume)
     def _assume(self, condition: Expression) -> 'LivenessState':
-        for identifier in condition.ids():
-            if isinstance(identifier, VariableIdentifier):
-                self.store[identifier] = LivenessLattice(LivenessLattice.Status.Live)
+        self._make_live(condition)
         return self
 
     @copy_docstring(State._evaluate_literal)
@@ -141,17 +164,178 @@ class LivenessState(Store, State):
 
     @copy_docstring(State._output)
     def _output(self, output: Expression) -> 'LivenessState':
-        return self  # nothing to be done
+        self._make_live(output)
+        return self
 
     @copy_docstring(State._substitute_variable)
     def _substitute_variable(self, left: Expression, right: Expression) -> 'LivenessState':
         if isinstance(left, VariableIdentifier):
-            self.store[left] = LivenessLattice(LivenessLattice.Status.Dead)
-            for identifier in right.ids():
-                if isinstance(identifier, VariableIdentifier):
-                    self.store[identifier] = LivenessLattice(LivenessLattice.Status.Live)
-                else:
-                    raise NotImplementedError(f"Variable substitution with {right} is not implemented!")
+            if left in self:
+                self[left] = LivenessLattice.Status.Dead
+            self._make_live(right)
+        elif isinstance(left, Index):
+            # an index assignment does not redefine a tracked variable but uses the index
+            self._make_live(left.index)
+            self._make_live(right)
+        else:
+            raise NotImplementedError(f"Variable substitution for {left} is not implemented!")
+        return self
+
+
+LivenessState.LATTICE = FiniteLattice(list(LivenessLattice.Status), LivenessLattice, lambda lattice: lattice.element)
+
+
+class BitLivenessState(CachedHashMixin, State):
+    """Live variable analysis state represented as a bit vector.
+
+    The live variables are the bits set in a single integer, indexed by the position of each variable in the list of
+    program variables. All program variables are *dead* by default.
+
+    .. document private methods
+    .. automethod:: BitLivenessState._assign_variable
+    .. automethod:: BitLivenessState._assume
+    .. automethod:: BitLivenessState._output
+    .. automethod:: BitLivenessState._substitute_variable
+    """
+    def __init__(self, variables: List[VariableIdentifier]):
+        """Map each program variable to a bit of the bit vector.
+
+        :param variables: list of program variables
+        """
+        super().__init__()
+        self._variables = variables
+        self._bits = {variable: 1 << i for i, variable in enumerate(variables)}
+        self._all = (1 << len(variables)) - 1
+        self._live = 0
+
+    def __deepcopy__(self, memo):
+        # the variables and their bits are shared between all copies
+        result = type(self).__new__(type(self))
+        memo[id(self)] = result
+        result.__dict__.update(self.__dict__)
+        result._result = set(self.result)
+        return result
+
+    @property
+    def variables(self) -> List[VariableIdentifier]:
+        return self._variables
+
+    @property
+    def live(self) -> int:
+        """Bit vector of the live variables."""
+        return self._live
+
+    @live.setter
+    def live(self, live: int):
+        self._live = live
+
+    def __repr__(self):
+        return ", ".join("{}→{}".format(variable, "Live" if self.live & bit else "Dead")
+                         for variable, bit in self._bits.items())
+
+    def _key(self):
+        return tuple(self._bits), self.live
+
+    @copy_docstring(Lattice.bottom)
+    def bottom(self) -> 'BitLivenessState':
+        """The bottom element is the state in which all variables are dead."""
+        self.live = 0
+        return self
+
+    @copy_docstring(Lattice.top)
+    def top(self) -> 'BitLivenessState':
+        """The top element is the state in which all variables are live."""
+        self.live = self._all
+        return self
+
+    @copy_docstring(Lattice.is_bottom)
+    def is_bottom(self) -> bool:
+        return self.live == 0
+
+    @copy_docstring(Lattice.is_top)
+    def is_top(self) -> bool:
+        return self.live == self._all
+
+    @copy_docstring(Lattice._less_equal)
+    def _less_equal(self, other: 'BitLivenessState') -> bool:
+        return (self.live & ~other.live) == 0
+
+    @copy_docstring(Lattice._meet)
+    def _meet(self, other: 'BitLivenessState') -> 'BitLivenessState':
+        self.live &= other.live
+        return self
+
+    @copy_docstring(Lattice._join)
+    def _join(self, other: 'BitLivenessState') -> 'BitLivenessState':
+        self.live |= other.live
+        return self
+
+    @copy_docstring(Lattice._widening)
+    def _widening(self, other: 'BitLivenessState') -> 'BitLivenessState':
+        return self._join(other)
+
+    def dead_variables(self) -> List[VariableIdentifier]:
+        """Variables that are dead in the current state.
+
+        :return: list of the variables of the current state that are dead
+        """
+        return [var for var, bit in self._bits.items() if not self.live & bit]
+
+    def _make_live(self, expression: Expression):
+        """Mark the (tracked) variables appearing in an expression as live.
+
+        :param expression: expression whose variables are used
+        """
+        for identifier in expression.ids():
+            self.live |= self._bits.get(identifier, 0)
+
+    @copy_docstring(State._access_variable)
+    def _access_variable(self, variable: VariableIdentifier) -> Set[Expression]:
+        return {variable}
+
+    @copy_docstring(State._assign_variable)
+    def _assign_variable(self, left: Expression, right: Expression) -> 'BitLivenessState':
+        raise NotImplementedError("Variable assignment is not implemented!")
+
+    @copy_docstring(State._assume)
+    def _assume(self, condition: Expression) -> 'BitLivenessState':
+        self._make_live(condition)
+        return self
+
+    @copy_docstring(State._evaluate_literal)
+    def _evaluate_literal(self, literal: Expression) -> Set[Expression]:
+        return {literal}
+
+    @copy_docstring(State.enter_if)
+    def enter_if(self):
+        return self  # nothing to be done
+
+    @copy_docstring(State.exit_if)
+    def exit_if(self):
+        return self  # nothing to be done
+
+    @copy_docstring(State.enter_loop)
+    def enter_loop(self):
+        return self  # nothing to be done
+
+    @copy_docstring(State.exit_loop)
+    def exit_loop(self):
+        return self  # nothing to be done
+
+    @copy_docstring(State._output)
+    def _output(self, output: Expression) -> 'BitLivenessState':
+        self._make_live(output)
+        return self
+
+    @copy_docstring(State._substitute_variable)
+    def _substitute_variable(self, left: Expression, right: Expression) -> 'BitLivenessState':
+        if isinstance(left, VariableIdentifier):
+            self.live &= ~self._bits.get(left, 0)
+            self._make_live(right)
+        elif isinstance(left, Index):
+            # an index assignment does not redefine a tracked variable but uses the index
+            self._make_live(left.index)
+            self._make_live(right)
         else:
             raise NotImplementedError(f"Variable substitution for {left} is not implemented!")
         return self
@@ -151,10 +151,38 @@ class CDBM(metaclass=ABCMeta):
             self[key] = f(self[key], other[key])
         return self
 
+    def add_dimensions(self, count: int) -> 'CDBM':
+        """Add ``count`` new (unconstrained) rows and columns at the end of this matrix.
+
+        Existing entries are neither moved nor copied.
+        """
+        assert count % 2 == 0, "The number of dimensions added to a CDBM has to be even!"
+        for i in range(self._size, self._size + count):
+            self._m.append([inf] * ((i + 2) // 2 * 2))
+        self._size += count
+        return self
+
+    def select_dimensions(self, indices) -> 'CDBM':
+        """Restrict this matrix to the given rows and columns, in the given order.
+
+        This removes (projects away) all rows and columns that are not selected and can be used to permute the
+        remaining ones. The matrix is rebuilt in one pass.
+
+        :param indices: indices of the rows and columns to keep, positive and negative variants must be kept together
+        """
+        assert len(indices) % 2 == 0, "The number of dimensions of a CDBM has to be even!"
+        self._m = [[self[i, j] for j in indices[:(k + 2) // 2 * 2]] for k, i in enumerate(indices)]
+        self._size = len(indices)
+        return self
+
     def replace(self, other):
         self.__dict__.update(other.__dict__)
         return self
 
+    def key(self):
+        """Canonical key of the (represented) entries of this matrix, used for equality and hashing."""
+        return tuple(map(tuple, self._m))
+
     def __str__(self):
         return "\n".join([" \t".join(map(lambda x: str(x).rjust(5), self._m[row])) for row in range(self._size)])
 
@@ -196,3 +224,181 @@ class IntegerCDBM(CDBM):
                 self[ij] = min(self[ij], (self[ii] + self[jj]) // 2)
 
         return True
+
+
+class DBM:
+    """Difference Bound Matrix.
+
+    A square matrix `m` of size ``n + 1`` for ``n`` variables. Index ``0`` stands for the constant zero, the entry
+    ``m[i, j]`` is the bound `c` of the constraint ``v_j - v_i <= c``. Unary constraints are constraints relative to
+    index ``0``.
+
+    The matrix keeps track of whether it is closed: writing an entry invalidates the closure, while
+    :meth:`tighten` keeps a closed matrix closed in quadratic time.
+    """
+
+    def __init__(self, size):
+        assert size > 0, "A DBM needs at least the zero index!"
+
+        self._size = size
+        self._m = [[inf] * size for _ in range(size)]
+        self._set_diagonal_zero()
+        self._closed = False
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def closed(self):
+        """Whether the matrix is currently in shortest-path closed form."""
+        return self._closed
+
+    def __getitem__(self, index_tuple: Tuple[int, int]):
+        row, col = index_tuple
+        return self._m[row][col]
+
+    def __setitem__(self, index_tuple: Tuple[int, int], value):
+        row, col = index_tuple
+        self._m[row][col] = value
+        self._closed = False
+
+    def keys(self):
+        for row in range(self.size):
+            for col in range(self.size):
+                yield row, col
+
+    def values(self):
+        for row in self._m:
+            yield from row
+
+    def items(self):
+        for key in self.keys():
+            yield key, self[key]
+
+    def key(self):
+        """Canonical key of the entries of this matrix, used for equality and hashing."""
+        return tuple(map(tuple, self._m))
+
+    def _set_diagonal_zero(self):
+        for i in range(self.size):
+            self._m[i][i] = 0
+        return self
+
+    def close(self):
+        """Calculates the shortest-path closure with the Floyd-Warshall algorithm.
+
+        :return: `True`, iff the constraint system is satisfiable (no negative cycle)
+        """
+        m = self._m
+        for k in range(self.size):
+            row_k = m[k]
+            for i in range(self.size):
+                m_ik = m[i][k]
+                if m_ik == inf:
+                    continue
+                row_i = m[i]
+                for j in range(self.size):
+                    if m_ik + row_k[j] < row_i[j]:
+                        row_i[j] = m_ik + row_k[j]
+        if any(m[i][i] < 0 for i in range(self.size)):
+            return False
+        self._closed = True
+        return True
+
+    def tighten(self, i: int, j: int, c):
+        """Lower the bound of ``v_j - v_i <= c``.
+
+        If the matrix is closed, the closure is restored incrementally by going through the new edge once.
+
+        :return: `True`, iff the constraint system is still satisfiable
+        """
+        m = self._m
+        if c >= m[i][j]:
+            return True
+        if not self._closed:
+            m[i][j] = c
+            return True
+        if c + m[j][i] < 0:
+            m[i][j] = c
+            self._closed = False
+            return False
+        # every shortest path using the new edge goes through it exactly once
+        row_j = m[j]
+        for a in range(self.size):
+            m_ai = m[a][i]
+            if m_ai == inf:
+                continue
+            row_a = m[a]
+            for b in range(self.size):
+                if m_ai + c + row_j[b] < row_a[b]:
+                    row_a[b] = m_ai + c + row_j[b]
+        return True
+
+    def forget(self, k: int) -> 'DBM':
+        """Remove all constraints of index ``k``. A closed matrix stays closed."""
+        for i in range(self.size):
+            if i != k:
+                self._m[i][k] = inf
+                self._m[k][i] = inf
+        return self
+
+    def shift(self, k: int, lower, upper) -> 'DBM':
+        """Shift the value of index ``k`` by an amount in ``[lower, upper]``.
+
+        A closed matrix stays closed if the amount is constant.
+        """
+        for i in range(self.size):
+            if i != k:
+                self._m[k][i] -= lower  # v_i - (v_k + d) <= c - d
+                self._m[i][k] += upper  # (v_k + d) - v_i <= c + d
+        self._closed = self._closed and lower == upper
+        return self
+
+    def intersection(self, other: 'DBM') -> 'DBM':
+        return self.zip(other, min)
+
+    def union(self, other: 'DBM') -> 'DBM':
+        closed = self.closed and other.closed
+        self.zip(other, max)
+        self._closed = closed  # the union of closed matrices is closed
+        return self
+
+    def zip(self, other: 'DBM', f) -> 'DBM':
+        if self.size != other.size:
+            raise ValueError("Can not zip DBMs with unequal sizes!")
+        self._m = [list(map(f, row, other_row)) for row, other_row in zip(self._m, other._m)]
+        self._closed = False
+        return self
+
+    def add_dimensions(self, count: int) -> 'DBM':
+        """Add ``count`` new (unconstrained) rows and columns at the end of this matrix.
+
+        A closed matrix stays closed.
+        """
+        for row in self._m:
+            row.extend([inf] * count)
+        for i in range(self._size, self._size + count):
+            row = [inf] * (self._size + count)
+            row[i] = 0
+            self._m.append(row)
+        self._size += count
+        return self
+
+    def select_dimensions(self, indices) -> 'DBM':
+        """Restrict this matrix to the given rows and columns, in the given order.
+
+        A closed matrix stays closed.
+
+        :param indices: indices of the rows and columns to keep
+        """
+        self._m = [[self._m[i][j] for j in indices] for i in indices]
+        self._size = len(indices)
+        return self
+
+    def replace(self, other):
+        self.__dict__.update(other.__dict__)
+        return self
+
+    def __str__(self):
+        return "\n".join([" \t".join(map(lambda x: str(x).rjust(5), row)) for row in self._m])
@@ -1,14 +1,16 @@
 from copy import deepcopy
 from math import inf
 from numbers import Number
+from operator import le
 from typing import List, Union
 
-from abstract_domains.lattice import BottomMixin
+from abstract_domains.lattice import BottomMixin, KindMixin
 from abstract_domains.numerical.numerical import NumericalMixin
 from abstract_domains.state import State
 from abstract_domains.store import Store
 from core.expressions import *
-from core.expressions_tools import ExpressionVisitor
+from core.expressions_tools import ExpressionVisitor, make_condition_not_free
+from core.special_expressions import ExpressionSummary
 
 
 def _auto_convert_numbers(func):
@@ -42,6 +44,8 @@ def _check_non_empty(func):
 
 
 class Interval:
+    __slots__ = ('_lower', '_upper')
+
     def __init__(self, lower=-inf, upper=inf):
         """Create an interval lattice for a single variable.
         """
@@ -111,7 +115,7 @@ class Interval:
 
     @_check_types
     def __eq__(self, other: 'Interval'):
-        return repr(self) == repr(other)
+        return self._key() == other._key()
 
     @_check_types
     def __ne__(self, other: 'Interval'):
@@ -142,7 +146,19 @@ class Interval:
         return self.lower >= other.upper
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash(self._key())
+
+    def __copy__(self):
+        copy = object.__new__(type(self))
+        copy._lower, copy._upper = self._lower, self._upper
+        return copy
+
+    def __deepcopy__(self, memo):
+        return self.__copy__()  # the bounds are numbers
+
+    def _key(self):
+        """Canonical key of this interval, used for equality and hashing."""
+        return None if self.empty() else (self._lower, self._upper)
 
     def __repr__(self):
         if self.empty():
@@ -212,6 +228,8 @@ class Interval:
 
 
 class IntervalLattice(Interval, BottomMixin):
+    __slots__ = ('_kind',)
+
     @staticmethod
     def from_constant(constant):
         interval_lattice = IntervalLattice(constant, constant)
@@ -223,13 +241,31 @@ class IntervalLattice(Interval, BottomMixin):
         else:
             return super().__repr__()
 
+    def _key(self):
+        return KindMixin.Kind.BOTTOM if self.is_bottom() else super()._key()
+
+    def __copy__(self):
+        copy = super().__copy__()
+        copy._kind = self._kind
+        return copy
+
+    def replace(self, other: 'IntervalLattice') -> 'IntervalLattice':
+        self._lower, self._upper, self._kind = other._lower, other._upper, other._kind
+        return self
+
+    def bottom(self) -> 'IntervalLattice':
+        # also empty the interval, a bottom element must not keep the bounds it had before
+        self.set_empty()
+        return super().bottom()
+
     def top(self) -> 'IntervalLattice':
         self.lower = -inf
         self.upper = inf
+        self._kind = KindMixin.Kind.DEFAULT
         return self
 
     def is_top(self) -> bool:
-        return self._lower == -inf and self._upper == inf
+        return not self.is_bottom() and self._lower == -inf and self._upper == inf
 
     def is_bottom(self) -> bool:
         # we have to check if interval is empty, or got empty by an operation on this interval
@@ -281,8 +317,8 @@ class IntervalLattice(Interval, BottomMixin):
             return IntervalLattice().top()
 
         def visit_BinaryArithmeticOperation(self, expr: BinaryArithmeticOperation, *args, **kwargs):
-            l = self.visit(expr.left, *args, **kwargs)
-            r = self.visit(expr.right, *args, **kwargs)
+            l = yield expr.left
+            r = yield expr.right
             if expr.operator == BinaryArithmeticOperation.Operator.Add:
                 return l.add(r)
             elif expr.operator == BinaryArithmeticOperation.Operator.Sub:
@@ -295,7 +331,7 @@ class IntervalLattice(Interval, BottomMixin):
                 raise ValueError(f"Binary operator '{str(expr.operator)}' is not supported!")
 
         def visit_UnaryArithmeticOperation(self, expr: UnaryArithmeticOperation, *args, **kwargs):
-            r = self.visit(expr.expression, *args, **kwargs)
+            r = yield expr.expression
             if expr.operator == UnaryArithmeticOperation.Operator.Add:
                 return r
             elif expr.operator == UnaryArithmeticOperation.Operator.Sub:
@@ -319,9 +355,15 @@ class IntervalLattice(Interval, BottomMixin):
         def visit_ListInput(self, _: ListInput, *args, **kwargs):
             return IntervalLattice().top()
 
+        # noinspection PyMethodMayBeStatic, PyUnusedLocal
+        def visit_ExpressionSummary(self, _: ExpressionSummary, *args, **kwargs):
+            return IntervalLattice().top()
+
         def visit_ListDisplay(self, expr: ListDisplay, *args, **kwargs):
             # find the big join of the intervals of all items of the list display expression
-            intervals = map(lambda item: self.visit(item, *args, **kwargs), expr.items)
+            intervals = []
+            for item in expr.items:
+                intervals.append((yield item))
             return IntervalLattice().bottom().big_join(intervals)
 
     _visitor = Visitor()  # static class member shared between all instances
@@ -404,3 +446,269 @@ class IntervalDomain(Store, NumericalMixin, State):
                 return IntervalLattice().top()
 
     _visitor = Visitor()  # static class member shared between all instances
+
+
+class IntervalArrayDomain(NumericalMixin, State):
+    """Interval domain backed by two arrays of lower and upper bounds, indexed by variable.
+
+    Unlike ``IntervalDomain``, no lattice object is kept per variable: lattice operations work on the whole bound 
+    arrays at once and expressions are evaluated to plain ``(lower, upper)`` tuples. The current element is bottom if 
+    the interval of any variable is empty.
+
+    .. document private methods
+    .. automethod:: IntervalArrayDomain._less_equal
+    .. automethod:: IntervalArrayDomain._meet
+    .. automethod:: IntervalArrayDomain._join
+    .. automethod:: IntervalArrayDomain._widening
+    """
+
+    def __init__(self, variables: List[VariableIdentifier]):
+        """Map each program variable to the interval ``[-inf,inf]``.
+
+        :param variables: list of program variables
+        """
+        super().__init__()
+        self._variables = list(variables)
+        self._index = {var: i for i, var in enumerate(self._variables)}
+        self._lower = [-inf] * len(self._variables)
+        self._upper = [inf] * len(self._variables)
+
+    @property
+    def variables(self):
+        """Variables of the current store."""
+        return self._variables
+
+    @property
+    def lower(self):
+        """Array of the lower bounds, in the order of the variables."""
+        return self._lower
+
+    @property
+    def upper(self):
+        """Array of the upper bounds, in the order of the variables."""
+        return self._upper
+
+    def __repr__(self):
+        return ", ".join("{}→{}".format(var, "⊥" if lower > upper else f"[{lower},{upper}]")
+                         for var, lower, upper in zip(self.variables, self.lower, self.upper))
+
+    def _key(self):
+        return tuple(self.variables), tuple((lower, upper) if lower <= upper else None
+                                            for lower, upper in zip(self.lower, self.upper))
+
+    def bottom(self) -> 'IntervalArrayDomain':
+        self._lower = [inf] * len(self.variables)
+        self._upper = [-inf] * len(self.variables)
+        return self
+
+    def top(self) -> 'IntervalArrayDomain':
+        self._lower = [-inf] * len(self.variables)
+        self._upper = [inf] * len(self.variables)
+        return self
+
+    def is_bottom(self) -> bool:
+        """The current store is bottom if `any` of its variables map to an empty interval."""
+        return not all(map(le, self.lower, self.upper))
+
+    def is_top(self) -> bool:
+        """The current store is top if `all` of its variables map to ``[-inf,inf]``."""
+        return all(lower == -inf for lower in self.lower) and all(upper == inf for upper in self.upper)
+
+    def _less_equal(self, other: 'IntervalArrayDomain') -> bool:
+        """The comparison is performed point-wise for each variable."""
+        return all(map(le, other.lower, self.lower)) and all(map(le, self.upper, other.upper))
+
+    def _meet(self, other: 'IntervalArrayDomain'):
+        """The meet is performed point-wise for each variable."""
+        self._lower = list(map(max, self.lower, other.lower))
+        self._upper = list(map(min, self.upper, other.upper))
+        return self
+
+    def _join(self, other: 'IntervalArrayDomain') -> 'IntervalArrayDomain':
+        """The join is performed point-wise for each variable."""
+        self._lower = list(map(min, self.lower, other.lower))
+        self._upper = list(map(max, self.upper, other.upper))
+        return self
+
+    def _widening(self, other: 'IntervalArrayDomain'):
+        """Unstable bounds are widened to infinity."""
+        self._lower = [lower if lower <= other_lower else -inf for lower, other_lower in zip(self.lower, other.lower)]
+        self._upper = [upper if other_upper <= upper else inf for upper, other_upper in zip(self.upper, other.upper)]
+        return self
+
+    def forget(self, var: VariableIdentifier):
+        self.set_bounds(var, -inf, inf)
+
+    def set_bounds(self, var: VariableIdentifier, lower: int, upper: int):
+        i = self._index[var]
+        self._lower[i] = lower
+        self._upper[i] = upper
+
+    def get_bounds(self, var: VariableIdentifier):
+        i = self._index[var]
+        return self._lower[i], self._upper[i]
+
+    def set_interval(self, var: VariableIdentifier, interval: IntervalLattice):
+        self.set_bounds(var, interval.lower, interval.upper)
+
+    def set_lb(self, var: VariableIdentifier, constant):
+        self._lower[self._index[var]] = constant
+
+    def set_ub(self, var: VariableIdentifier, constant):
+        self._upper[self._index[var]] = constant
+
+    def evaluate(self, expr: Expression):
+        lower, upper = IntervalArrayDomain._visitor.visit(expr, self)
+        return IntervalLattice(lower, upper)
+
+    def _access_variable(self, variable: VariableIdentifier) -> Set[Expression]:
+        return {variable}
+
+    def _assign_variable(self, left: Expression, right: Expression) -> 'IntervalArrayDomain':
+        if isinstance(left, VariableIdentifier):
+            if left.typ == int:
+                self.set_bounds(left, *IntervalArrayDomain._visitor.visit(right, self))
+        else:
+            raise NotImplementedError("Interval domain does only support assignments to variables so far.")
+        return self
+
+    _Comparison = BinaryComparisonOperation.Operator
+    _MIRRORED = {_Comparison.Eq: _Comparison.Eq, _Comparison.Lt: _Comparison.Gt, _Comparison.LtE: _Comparison.GtE,
+                 _Comparison.Gt: _Comparison.Lt, _Comparison.GtE: _Comparison.LtE}  # x op y <=> y mirrored(op) x
+
+    def _refine(self, left: Expression, operator: BinaryComparisonOperation.Operator, right: Expression):
+        """Refine the bounds of ``left``, if it is a variable of the store, to satisfy ``left operator right``."""
+        if not isinstance(left, VariableIdentifier) or left not in self._index:
+            return
+        lower, upper = IntervalArrayDomain._visitor.visit(right, self)
+        i = self._index[left]
+        if operator in (self._Comparison.Eq, self._Comparison.Lt, self._Comparison.LtE):
+            self._upper[i] = min(self._upper[i], upper - 1 if operator == self._Comparison.Lt else upper)
+        if operator in (self._Comparison.Eq, self._Comparison.Gt, self._Comparison.GtE):
+            self._lower[i] = max(self._lower[i], lower + 1 if operator == self._Comparison.Gt else lower)
+
+    def _assume(self, condition: Expression) -> 'IntervalArrayDomain':
+        """Refine the bounds of the variables compared in the (negation-free) condition.
+
+        Comparisons other than ``==``, ``<``, ``<=``, ``>`` and ``>=`` leave the store unchanged.
+        """
+        condition = make_condition_not_free(condition)
+        if isinstance(condition, BinaryBooleanOperation):
+            if condition.operator == BinaryBooleanOperation.Operator.And:
+                return self._assume(condition.left)._assume(condition.right)
+            elif condition.operator == BinaryBooleanOperation.Operator.Or:
+                right = deepcopy(self)._assume(condition.right)
+                return self._assume(condition.left).join(right)
+        elif isinstance(condition, BinaryComparisonOperation) and condition.operator in self._MIRRORED:
+            self._refine(condition.left, condition.operator, condition.right)
+            self._refine(condition.right, self._MIRRORED[condition.operator], condition.left)
+        return self
+
+    def _evaluate_literal(self, literal: Expression) -> Set[Expression]:
+        return {literal}
+
+    def enter_loop(self):
+        return self  # nothing to be done
+
+    def exit_loop(self):
+        return self  # nothing to be done
+
+    def enter_if(self):
+        return self  # nothing to be done
+
+    def exit_if(self):
+        return self  # nothing to be done
+
+    def _output(self, output: Expression) -> 'IntervalArrayDomain':
+        return self  # nothing to be done
+
+    def _substitute_variable(self, left: Expression, right: Expression):
+        raise NotImplementedError("Interval domain does not yet support variable substitution.")
+
+    # noinspection PyPep8Naming
+    class Visitor(ExpressionVisitor):
+        """A visitor to abstractly evaluate an expression to a ``(lower, upper)`` tuple in the interval domain.
+
+        An empty interval is represented by ``(inf, -inf)``.
+        """
+
+        top = (-inf, inf)
+        empty = (inf, -inf)
+
+        def generic_visit(self, expr, *args, **kwargs):
+            raise ValueError(
+                f"{type(self)} does not support generic visit of expressions! "
+                f"Define handling for expression {type(expr)} explicitly!")
+
+        @staticmethod
+        def _mult(a, b):
+            return 0 if a == 0 or b == 0 else a * b  # 0 * inf is 0 for interval bounds
+
+        def visit_BinaryArithmeticOperation(self, expr: BinaryArithmeticOperation, *args, **kwargs):
+            l_lower, l_upper = yield expr.left
+            r_lower, r_upper = yield expr.right
+            if l_lower > l_upper or r_lower > r_upper:
+                return self.empty
+            if expr.operator == BinaryArithmeticOperation.Operator.Add:
+                return l_lower + r_lower, l_upper + r_upper
+            elif expr.operator == BinaryArithmeticOperation.Operator.Sub:
+                return l_lower - r_upper, l_upper - r_lower
+            elif expr.operator == BinaryArithmeticOperation.Operator.Mult:
+                comb = [self._mult(l_lower, r_lower), self._mult(l_lower, r_upper),
+                        self._mult(l_upper, r_lower), self._mult(l_upper, r_upper)]
+                return min(comb), max(comb)
+            elif expr.operator == BinaryArithmeticOperation.Operator.Div:
+                return self.top
+            else:
+                raise ValueError(f"Binary operator '{str(expr.operator)}' is not supported!")
+
+        def visit_UnaryArithmeticOperation(self, expr: UnaryArithmeticOperation, *args, **kwargs):
+            lower, upper = yield expr.expression
+            if expr.operator == UnaryArithmeticOperation.Operator.Add:
+                return lower, upper
+            elif expr.operator == UnaryArithmeticOperation.Operator.Sub:
+                return -upper, -lower
+            else:
+                raise ValueError(f"Unary Operator {expr.operator} is not supported!")
+
+        # noinspection PyMethodMayBeStatic, PyUnusedLocal
+        def visit_Literal(self, expr: Literal, *args, **kwargs):
+            if expr.typ == int:
+                c = int(expr.val)
+                return c, c
+            else:
+                raise ValueError(f"Literal type {expr.typ} is not supported!")
+
+        # noinspection PyMethodMayBeStatic, PyUnusedLocal
+        def visit_VariableIdentifier(self, expr: VariableIdentifier, store, *args, **kwargs):
+            if expr.typ == int and expr in store._index:
+                return store.get_bounds(expr)
+            else:
+                return self.top
+
+        # noinspection PyMethodMayBeStatic, PyUnusedLocal
+        def visit_Index(self, _: Index, *args, **kwargs):
+            return self.top
+
+        # noinspection PyMethodMayBeStatic, PyUnusedLocal
+        def visit_Input(self, _: Input, *args, **kwargs):
+            return self.top
+
+        # noinspection PyMethodMayBeStatic, PyUnusedLocal
+        def visit_ListInput(self, _: ListInput, *args, **kwargs):
+            return self.top
+
+        # noinspection PyMethodMayBeStatic, PyUnusedLocal
+        def visit_ExpressionSummary(self, _: ExpressionSummary, *args, **kwargs):
+            return self.top
+
+        def visit_ListDisplay(self, expr: ListDisplay, *args, **kwargs):
+            # join the intervals of all items of the list display expression
+            intervals = []
+            for item in expr.items:
+                intervals.append((yield item))
+            if not intervals:
+                return self.empty
+            return min(lower for lower, _ in intervals), max(upper for _, upper in intervals)
+
+    _visitor = Visitor()  # static class member shared between all instances
@@ -1,8 +1,12 @@
+from copy import deepcopy
+from functools import reduce
+from weakref import WeakKeyDictionary
+
 from abstract_domains.numerical.interval_domain import IntervalLattice
 from core.expressions import *
 
-from core.expressions_tools import ExpressionVisitor, PLUS, MINUS
-from core.special_expressions import VariadicArithmeticOperation
+from core.expressions_tools import ExpressionVisitor, Visit, PLUS, MINUS, Polynomial, NotPolynomialError
+from core.special_expressions import VariadicArithmeticOperation, ExpressionSummary
 
 
 class InvalidFormError(ValueError):
@@ -11,6 +15,7 @@ class InvalidFormError(ValueError):
 
 class LinearForm:
     """Holds an expression in linear form with one or several variables: `+/- var1 +/- var2 + ... + interval`."""
+    __slots__ = ('_var_summands', '_interval', '_interval_set')
 
     def __init__(self, var_summands=None, interval=None):
         """Initializes this instance with the linear form of an expression.
@@ -25,9 +30,24 @@ class LinearForm:
     @staticmethod
     def from_expression(expr: Expression):
         form = LinearForm()
-        LinearForm._visitor.visit(expr, form)
+        form._read_expression(expr)
         return form
 
+    def _read_expression(self, expr: Expression):
+        """Set the parts of this (empty) form to the linear form of an expression, read off its normal form."""
+        try:
+            polynomial = Polynomial.from_expression(expr)
+        except NotPolynomialError:
+            LinearForm._visitor.visit(expr, self)  # e.g., inputs, which are represented by the interval [-inf,inf]
+            return
+        for monomial, coefficient in polynomial.terms.items():
+            if not monomial:
+                self.encounter_interval(IntervalLattice(coefficient, coefficient))
+            elif len(monomial) == 1 and monomial[0][1] == 1 and abs(coefficient) == 1:
+                self.encounter_new_var(monomial[0][0], sign=PLUS if coefficient > 0 else MINUS)
+            else:
+                raise InvalidFormError(f"Summand {Polynomial({monomial: coefficient})} is not of the form +/- var!")
+
     @property
     def var_summands(self):
         return self._var_summands
@@ -51,10 +71,7 @@ class LinearForm:
         self.interval = interval
 
     def __eq__(self, other: 'LinearForm'):
-        return isinstance(other, self.__class__) \
-               and set(self.var_summands.keys()) == set(other.var_summands.keys()) \
-               and all([self.var_summands[key] == other.var_summands[key] for key in self.var_summands.keys()]) \
-               and self.interval == other.interval
+        return isinstance(other, self.__class__) and self._key() == other._key()
 
     def __ne__(self, other: 'LinearForm'):
         return not (self == other)
@@ -92,7 +109,11 @@ class LinearForm:
         return self.var_summands == other.var_summands and self.interval >= other.interval
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash(self._key())
+
+    def _key(self):
+        """Canonical key of this linear form, used for equality and hashing."""
+        return frozenset(self.var_summands.items()), self._interval
 
     def __str__(self):
         vars_string = ' '.join([f"{str(sign)}{var}" for var, sign in self.var_summands.items()])
@@ -131,6 +152,10 @@ class LinearForm:
             if invert:
                 linear_form.interval.negate()
 
+        # noinspection PyMethodMayBeStatic, PyUnusedLocal
+        def visit_ExpressionSummary(self, _: ExpressionSummary, linear_form, invert=False):
+            linear_form.encounter_interval(IntervalLattice().top())
+
         def visit_BinaryArithmeticOperation(self, expr: BinaryArithmeticOperation, linear_form, invert=False):
             # we have to check if binary operation can be reordered to correspond to valid formats:
             # +/- var + interval
@@ -143,7 +168,7 @@ class LinearForm:
                 if invert:
                     linear_form.interval.negate()
             except ValueError:
-                self.visit(expr.left, linear_form, invert=invert)
+                yield Visit(expr.left, linear_form, invert=invert)
 
             if expr.operator not in [BinaryArithmeticOperation.Operator.Add, BinaryArithmeticOperation.Operator.Sub]:
                 raise InvalidFormError("Unsupported binary arithmetic operator")
@@ -154,21 +179,21 @@ class LinearForm:
                 if (expr.operator == BinaryArithmeticOperation.Operator.Sub) != invert:
                     linear_form.interval.negate()
             except ValueError:
-                self.visit(expr.right, linear_form,
-                           invert=(expr.operator == BinaryArithmeticOperation.Operator.Sub) != invert)
+                yield Visit(expr.right, linear_form,
+                            invert=(expr.operator == BinaryArithmeticOperation.Operator.Sub) != invert)
 
         def visit_UnaryArithmeticOperation(self, expr: UnaryArithmeticOperation, linear_form, invert=False):
             if expr.operator == UnaryArithmeticOperation.Operator.Add:
-                self.visit(expr.expression, linear_form, invert=invert)
+                yield Visit(expr.expression, linear_form, invert=invert)
             elif expr.operator == UnaryArithmeticOperation.Operator.Sub:
-                self.visit(expr.expression, linear_form, invert=not invert)
+                yield Visit(expr.expression, linear_form, invert=not invert)
             else:
                 raise ValueError("Unknown operator")
 
         def visit_VariadicArithmeticOperation(self, expr: VariadicArithmeticOperation, linear_form, invert=False):
             if expr.operator == BinaryArithmeticOperation.Operator.Add:
                 for e in expr.operands:
-                    self.visit(e, linear_form, invert=invert)
+                    yield Visit(e, linear_form, invert=invert)
             else:
                 raise ValueError("Unsupported operator")
 
@@ -182,6 +207,7 @@ class LinearForm:
 
 class VarForm(LinearForm):
     """Holds an expression in linear form with a single variable: ``+/- var + interval``."""
+    __slots__ = ()
 
     def __init__(self, var_sign=None, var=None, interval=None):
         """Initializes this instance with the single variable form of an expression.
@@ -194,7 +220,7 @@ class VarForm(LinearForm):
     @staticmethod
     def from_expression(expr: Expression):
         form = VarForm()
-        LinearForm._visitor.visit(expr, form)
+        form._read_expression(expr)
 
         if len(form.var_summands) > 1:
             raise InvalidFormError("More than a single variable detected!")
@@ -214,3 +240,171 @@ class VarForm(LinearForm):
         self._var_summands.clear()
         if value:  # do only set if not None
             self._var_summands[value] = PLUS
+
+
+class QuasiLinearForm:
+    """Holds an expression in quasi-linear form: ``c1 * var1 + ... + cn * varn + interval``.
+
+    The coefficients ``ci`` are integer constants, only the constant part is an interval. Sub-expressions that are not
+    linear are *intervalised*, i.e. replaced by the interval of values they can take in a given numerical domain.
+
+    See: Antoine Miné. Symbolic Methods to Enhance the Precision of Numerical Abstract Domains. VMCAI 2006.
+    """
+    __slots__ = ('_coefficients', '_interval')
+
+    def __init__(self, coefficients=None, interval=None):
+        self._coefficients = coefficients or {}  # dictionary holding {var: coefficient}, coefficients are never 0
+        self._interval = interval or IntervalLattice(0, 0)
+
+    # memoised forms of the linear (interned) expressions that are still alive, with the integer variables the forms
+    # rely on (variables are not memoised, their form would keep them alive)
+    _linear = WeakKeyDictionary()  # type: Dict[Expression, Tuple[QuasiLinearForm, Set[VariableIdentifier]]]
+
+    @staticmethod
+    def from_expression(expr: Expression, numerical):
+        """Create the quasi-linear form of an expression.
+
+        The form of a linear expression does not depend on the numerical domain, as long as the domain tracks all
+        (integer) variables of the expression. Such forms are computed once per expression and copied afterwards.
+
+        :param expr: the expression to bring into quasi-linear form
+        :param numerical: the numerical domain used to intervalise non-linear sub-expressions
+        """
+        if is_interned(expr) and not isinstance(expr, VariableIdentifier):
+            if expr not in QuasiLinearForm._linear:
+                try:
+                    form = QuasiLinearForm._visitor.visit(expr, None)
+                    variables = {var for var in expr.ids() if var.typ == int}
+                    QuasiLinearForm._linear[expr] = form, variables
+                except InvalidFormError:
+                    QuasiLinearForm._linear[expr] = None
+            linear = QuasiLinearForm._linear[expr]
+            if linear is not None and all(var in numerical.variables for var in linear[1]):
+                form = linear[0]
+                return QuasiLinearForm(dict(form.coefficients), deepcopy(form.interval))
+        return QuasiLinearForm._visitor.visit(expr, numerical)
+
+    @property
+    def coefficients(self):
+        return self._coefficients
+
+    @property
+    def interval(self):
+        return self._interval
+
+    def is_constant(self):
+        """Return `True` if this form does not contain any variable."""
+        return not self.coefficients
+
+    def add(self, other: 'QuasiLinearForm') -> 'QuasiLinearForm':
+        for var, coefficient in other.coefficients.items():
+            coefficient += self.coefficients.get(var, 0)
+            if coefficient:
+                self.coefficients[var] = coefficient
+            else:
+                del self.coefficients[var]
+        self.interval.add(other.interval)
+        return self
+
+    def scale(self, constant: int) -> 'QuasiLinearForm':
+        if constant == 0:
+            self.coefficients.clear()
+            self._interval = IntervalLattice(0, 0)
+        else:
+            for var in self.coefficients:
+                self.coefficients[var] *= constant
+            self.interval.mult(constant)
+        return self
+
+    def negate(self) -> 'QuasiLinearForm':
+        for var in self.coefficients:
+            self.coefficients[var] = -self.coefficients[var]
+        self.interval.negate()
+        return self
+
+    def intervalise(self, numerical) -> IntervalLattice:
+        """Evaluate this form to a single interval, using the bounds of the variables in a numerical domain."""
+        interval = IntervalLattice(self.interval.lower, self.interval.upper)
+        for var, coefficient in self.coefficients.items():
+            lower, upper = numerical.get_bounds(var)
+            interval.add(IntervalLattice(lower, upper).mult(coefficient))
+        return interval
+
+    def __str__(self):
+        summands = [f"{coefficient}*{var}" for var, coefficient in self.coefficients.items()]
+        return " + ".join(summands + [str(self.interval)])
+
+    # noinspection PyPep8Naming
+    class Visitor(ExpressionVisitor):
+        """A visitor to generate the quasi-linear form of an expression in a numerical domain.
+
+        Without numerical domain (``None``), all integer variables are tracked and non-linear expressions are invalid.
+        """
+
+        # noinspection PyMethodMayBeStatic
+        def visit_Literal(self, expr: Literal, numerical):
+            return QuasiLinearForm(interval=IntervalLattice.evaluate(expr))
+
+        # noinspection PyMethodMayBeStatic
+        def visit_VariableIdentifier(self, expr: VariableIdentifier, numerical):
+            if expr.typ == int and (numerical is None or expr in numerical.variables):
+                return QuasiLinearForm({expr: 1})
+            return QuasiLinearForm(interval=IntervalLattice().top())
+
+        # noinspection PyMethodMayBeStatic, PyUnusedLocal
+        def visit_Input(self, _: Input, numerical):
+            return QuasiLinearForm(interval=IntervalLattice().top())
+
+        # noinspection PyMethodMayBeStatic, PyUnusedLocal
+        def visit_Index(self, _: Index, numerical):
+            return QuasiLinearForm(interval=IntervalLattice().top())
+
+        # noinspection PyMethodMayBeStatic, PyUnusedLocal
+        def visit_ExpressionSummary(self, _: ExpressionSummary, numerical):
+            return QuasiLinearForm(interval=IntervalLattice().top())
+
+        def visit_UnaryArithmeticOperation(self, expr: UnaryArithmeticOperation, numerical):
+            form = yield expr.expression
+            if expr.operator == UnaryArithmeticOperation.Operator.Sub:
+                form.negate()
+            return form
+
+        def visit_BinaryArithmeticOperation(self, expr: BinaryArithmeticOperation, numerical):
+            left = yield expr.left
+            right = yield expr.right
+            return self._combine(expr.operator, left, right, numerical)
+
+        def visit_VariadicArithmeticOperation(self, expr: VariadicArithmeticOperation, numerical):
+            forms = []
+            for operand in expr.operands:
+                forms.append((yield operand))
+            return reduce(lambda left, right: self._combine(expr.operator, left, right, numerical), forms)
+
+        @staticmethod
+        def _combine(operator: BinaryArithmeticOperation.Operator, left: 'QuasiLinearForm',
+                     right: 'QuasiLinearForm', numerical):
+            if operator == BinaryArithmeticOperation.Operator.Add:
+                return left.add(right)
+            elif operator == BinaryArithmeticOperation.Operator.Sub:
+                return left.add(right.negate())
+            elif operator == BinaryArithmeticOperation.Operator.Mult:
+                if right.is_constant() and right.interval.is_constant():
+                    return left.scale(right.interval.lower)
+                elif left.is_constant() and left.interval.is_constant():
+                    return right.scale(left.interval.lower)
+                elif numerical is None:
+                    raise InvalidFormError("Non-linear products can only be intervalised in a numerical domain!")
+                else:
+                    # non-linear product: intervalise both factors
+                    return QuasiLinearForm(interval=left.intervalise(numerical).mult(right.intervalise(numerical)))
+            elif operator == BinaryArithmeticOperation.Operator.Div:
+                return QuasiLinearForm(interval=IntervalLattice().top())
+            else:
+                raise InvalidFormError(f"Binary operator '{str(operator)}' is not supported!")
+
+        def generic_visit(self, expr, *args, **kwargs):
+            raise InvalidFormError(
+                f"{type(self)} does not support generic visit of expressions! "
+                f"Define handling for expression {type(expr)} explicitly!")
+
+    _visitor = Visitor()  # static class member shared between all instances
@@ -1,4 +1,6 @@
 from abc import ABCMeta, abstractmethod
+from typing import List
+
 from core.expressions import VariableIdentifier, Expression
 
 
@@ -10,6 +12,18 @@ class NumericalMixin(metaclass=ABCMeta):
     def forget(self, var: VariableIdentifier):
         """Forget all information about a variable."""
 
+    def remove_variables(self, variables: List[VariableIdentifier]):
+        """Project variables out of this domain.
+
+        By default all information about the variables is forgotten. Relational domains may override this to also 
+        shrink their representation.
+
+        :param variables: the variables to project out
+        """
+        for var in variables:
+            self.forget(var)
+        return self
+
     @abstractmethod
     def set_bounds(self, var: VariableIdentifier, lower: int, upper: int):
         """Set the upper and lower bound of a variable.
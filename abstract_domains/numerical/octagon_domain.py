@@ -1,18 +1,18 @@
 from copy import deepcopy
 from enum import Enum
-from functools import reduce
 from math import inf, isinf
-from typing import List, Tuple
+from typing import List, Tuple, Dict
+from weakref import WeakKeyDictionary
 
-from abstract_domains.lattice import BottomMixin
+from abstract_domains.lattice import BottomMixin, KindMixin
 from abstract_domains.numerical.dbm import IntegerCDBM
 from abstract_domains.numerical.interval_domain import IntervalLattice, IntervalDomain
-from abstract_domains.numerical.linear_forms import VarForm, LinearForm, InvalidFormError
+from abstract_domains.numerical.linear_forms import VarForm, InvalidFormError, QuasiLinearForm
 from abstract_domains.numerical.numerical import NumericalMixin
 from abstract_domains.state import State
 from core.expressions import *
-from core.expressions_tools import ExpressionVisitor, ExpressionTransformer, \
-    make_condition_not_free, simplify
+from core.expressions_tools import ExpressionVisitor, ExpressionTransformer, Visit, \
+    make_condition_not_free
 
 # Shorthands
 Sign = UnaryArithmeticOperation.Operator
@@ -47,6 +47,10 @@ class OctagonLattice(BottomMixin, NumericalMixin):
     
     The actual constraint, e.g. at matrix entry (``v1+``, v2+``) is: ``- v1 + v2 <= c`` (**Note the minus before 
     first term**). 
+
+    The variables of an octagon (its *environment*) are not fixed: variables can be added, removed (projected away)
+    and renamed. Variables that are not in the environment are unconstrained. Lattice operations between octagons
+    over different environments first unify the environments (see :meth:`unify_environments`).
     """
 
     def __init__(self, variables: List[VariableIdentifier]):
@@ -55,7 +59,11 @@ class OctagonLattice(BottomMixin, NumericalMixin):
         :param variables: list of program variables
         """
         super().__init__()
-        self._variables = variables
+        self._variables = list(variables)
+        self._build_index()
+        self._dbm = IntegerCDBM(len(variables) * 2)
+
+    def _build_index(self):
         self._var_to_index = {}
         self._index_to_var = {}
         index = 0
@@ -64,7 +72,6 @@ class OctagonLattice(BottomMixin, NumericalMixin):
             self._index_to_var[index] = var
             self._index_to_var[index + 1] = var
             index += 2
-        self._dbm = IntegerCDBM(len(variables) * 2)
 
     @property
     def variables(self):
@@ -74,6 +81,79 @@ class OctagonLattice(BottomMixin, NumericalMixin):
     def dbm(self):
         return self._dbm
 
+    def add_variables(self, variables: List[VariableIdentifier]) -> 'OctagonLattice':
+        """Add variables to the environment of this octagon. The added variables are unconstrained.
+
+        :param variables: variables to add, variables already in the environment are ignored
+        """
+        variables = [var for var in dict.fromkeys(variables) if var not in self._var_to_index]
+        if variables:
+            for var in variables:
+                index = len(self._variables) * 2
+                self._var_to_index[var] = index
+                self._index_to_var[index] = var
+                self._index_to_var[index + 1] = var
+                self._variables.append(var)
+            self.dbm.add_dimensions(len(variables) * 2)
+        return self
+
+    def remove_variables(self, variables: List[VariableIdentifier]) -> 'OctagonLattice':
+        """Remove (project away) variables from the environment of this octagon.
+
+        The octagon is closed first, such that constraints implied through the removed variables are kept.
+
+        :param variables: variables to remove, variables not in the environment are ignored
+        """
+        removed = {var for var in variables if var in self._var_to_index}
+        if removed:
+            self.close()
+            self.permute_variables([var for var in self.variables if var not in removed])
+        return self
+
+    def permute_variables(self, variables: List[VariableIdentifier]) -> 'OctagonLattice':
+        """Reorder the environment of this octagon. Variables not listed are removed **without** closing first.
+
+        :param variables: the variables of the new environment in the new order, each must be in the environment
+        """
+        indices = []
+        for var in variables:
+            index = self._var_to_index[var]
+            indices += [index, index + 1]
+        self.dbm.select_dimensions(indices)
+        self._variables = list(variables)
+        self._build_index()
+        return self
+
+    def rename_variables(self, renaming: Dict[VariableIdentifier, VariableIdentifier]) -> 'OctagonLattice':
+        """Rename variables of this octagon, keeping their constraints.
+
+        :param renaming: mapping from variables in the environment to their new (distinct) names
+        """
+        variables = [renaming.get(var, var) for var in self.variables]
+        if len(set(variables)) != len(variables):
+            raise ValueError("Renaming would merge distinct variables of the octagon!")
+        self._variables = variables
+        self._build_index()
+        return self
+
+    def unify_environments(self, other: 'OctagonLattice') -> 'OctagonLattice':
+        """Bring this octagon and the other octagon to a common environment.
+
+        Variables of the other octagon missing in this octagon are added to this octagon (unconstrained). The other
+        octagon is copied (never modified) only if its environment differs from the resulting environment.
+
+        :param other: the other octagon
+        :return: the other octagon, over the same variables in the same order as this octagon
+        """
+        if self.variables == other.variables:
+            return other
+        self.add_variables(other.variables)
+        if self.variables == other.variables:
+            return other
+        other = deepcopy(other)
+        other.add_variables(self.variables)
+        return other.permute_variables(self.variables)
+
     def __getitem__(self, index_tuple: Tuple[Sign, VariableIdentifier, Sign, VariableIdentifier]):
         """Retrieve the bound `c` at an index given as the quadruple ``(sign1, var1, sign2, var2)``.
         
@@ -81,6 +161,8 @@ class OctagonLattice(BottomMixin, NumericalMixin):
         """
         if len(index_tuple) == 4:
             sign1, var1, sign2, var2 = index_tuple
+            if var1 not in self._var_to_index or var2 not in self._var_to_index:
+                return inf  # variables outside the environment are unconstrained
             return self.dbm[
                 self._var_to_index[var1] + _index_shift(sign1), self._var_to_index[var2] + _index_shift(sign2)
             ]
@@ -91,9 +173,12 @@ class OctagonLattice(BottomMixin, NumericalMixin):
         """Set the bound `c` at an index given as the quadruple ``(sign1, var1, sign2, var2)``.
         
         The actual octagonal constraint of this index is ``(-1) * sign1 * var1 + sign2 * var2 <= c``.
+        Variables outside the environment are added to it first.
         """
         if len(index_tuple) == 4:
             sign1, var1, sign2, var2 = index_tuple
+            if var1 not in self._var_to_index or var2 not in self._var_to_index:
+                self.add_variables([var1, var2])
             i, j = self._var_to_index[var1] + _index_shift(sign1), self._var_to_index[var2] + _index_shift(sign2)
             if i != j:
                 self.dbm[i, j] = value
@@ -122,6 +207,14 @@ class OctagonLattice(BottomMixin, NumericalMixin):
                     for sign2 in signs2:
                         yield (sign1, var1, sign2, var2)
 
+    def _key(self):
+        if self.is_bottom():
+            return KindMixin.Kind.BOTTOM
+        elif self.is_top():
+            return KindMixin.Kind.TOP
+        else:
+            return tuple(self.variables), self.dbm.key()
+
     def __repr__(self):
         if self.is_bottom():
             return "⊥"
@@ -178,20 +271,20 @@ class OctagonLattice(BottomMixin, NumericalMixin):
             [isinf(b) for k, b in self.dbm.items() if k[0] != k[1]])  # check all inf, ignore diagonal for check
 
     def _less_equal(self, other: 'OctagonLattice') -> bool:
-        if self.dbm.size != other.dbm.size:
-            raise ValueError("Cannot compare octagons with unequal sizes!")
-        return all([x <= y for x, y in zip(self.dbm.values(), other.dbm.values())])
+        current = self
+        if self.variables != other.variables:  # compare over a common environment without modifying this octagon
+            current = deepcopy(self)
+            other = current.unify_environments(other)
+        return all([x <= y for x, y in zip(current.dbm.values(), other.dbm.values())])
 
     def _meet(self, other: 'OctagonLattice'):
-        if self.dbm.size != other.dbm.size:
-            raise ValueError("Cannot meet octagons with unequal sizes!")
+        other = self.unify_environments(other)
         # closure is not required for meet
         self.dbm.intersection(other.dbm)
         return self
 
     def _join(self, other: 'OctagonLattice') -> 'OctagonLattice':
-        if self.dbm.size != other.dbm.size:
-            raise ValueError("Cannot join octagons with unequal sizes!")
+        other = self.unify_environments(other)
         # closure is required to get best abstraction of join
         self.close()
         other.close()
@@ -199,10 +292,13 @@ class OctagonLattice(BottomMixin, NumericalMixin):
         return self
 
     def _widening(self, other: 'OctagonLattice'):
+        other = self.unify_environments(other)
         self.dbm.zip(other.dbm, lambda a, b: a if a >= b else inf)
         return self
 
     def forget(self, var: VariableIdentifier):
+        if var not in self._var_to_index:
+            return  # nothing is known about variables outside the environment
         # close first to not lose implicit constraints about other variables
         self.close()
 
@@ -271,7 +367,7 @@ class OctagonLattice(BottomMixin, NumericalMixin):
 
     def to_interval_domain(self):
         """Translate this octagonal store into an interval store."""
-        interval_store = IntervalDomain(self.variables)
+        interval_store = IntervalDomain(list(self.variables))
         for var in self.variables:
             interval = self.get_interval(var)
             if interval.is_bottom():
@@ -317,6 +413,70 @@ class OctagonDomain(OctagonLattice, State):
 
         return self
 
+    def _assume_quasi_linear(self, expr: Expression) -> 'OctagonDomain':
+        """Assume the non-octagonal condition ``expr <= 0`` in place.
+
+        The left side is brought into quasi-linear form ``c1 * x1 + ... + cn * xn + [a,b]``. For every variable
+        ``xk`` (and every pair of variables ``xk``, ``xl`` with coefficients of equal magnitude) the remaining summands
+        are bounded from below using the bounds of this octagon, which yields a unary (binary) octagonal constraint
+        on ``xk`` (``xk``, ``xl``). This is a bounded number of constraint updates without leaving the octagon.
+
+        See: Antoine Miné. The Octagon Abstract Domain. HOSC 2006. Section 4.4.
+        """
+        # closure gives the tightest bounds to linearise against
+        if not self.close():
+            return self
+        form = QuasiLinearForm.from_expression(expr, self)
+        constant = form.interval.lower
+        if constant is None or isinf(constant):
+            return self  # nothing can be derived from an unbounded (or empty) constant part
+
+        # lower bound of every summand ck * xk, summed up separately for finite and infinite lower bounds
+        summands = []
+        for var, coefficient in form.coefficients.items():
+            lower = coefficient * (self.get_lb(var) if coefficient > 0 else self.get_ub(var))
+            summands.append((var, coefficient, lower))
+        finite = sum(lower for _, _, lower in summands if not isinf(lower))
+        infinite = sum(1 for _, _, lower in summands if isinf(lower))
+
+        def remaining_lower(*excluded):
+            """Lower bound of the sum of all summands except the excluded ones."""
+            if infinite - sum(1 for _, _, lower in excluded if isinf(lower)):
+                return -inf
+            return finite - sum(lower for _, _, lower in excluded if not isinf(lower))
+
+        if remaining_lower() + constant > 0:
+            # even the least value of the left side is positive
+            self.bottom()
+            return self
+
+        # unary constraints: ck * xk <= - constant - (lower bound of the other summands)
+        for summand in summands:
+            var, coefficient, _ = summand
+            bound = -constant - remaining_lower(summand)
+            if isinf(bound):
+                continue
+            if coefficient > 0:
+                self.lower_ub(var, bound // coefficient)
+            else:
+                self.raise_lb(var, -(-bound // coefficient))
+
+        # binary constraints: ck * xk + cl * xl <= - constant - (lower bound of the other summands)
+        for k, summand1 in enumerate(summands):
+            var1, coefficient1, _ = summand1
+            for summand2 in summands[k + 1:]:
+                var2, coefficient2, _ = summand2
+                if abs(coefficient1) != abs(coefficient2):
+                    continue
+                bound = -constant - remaining_lower(summand1, summand2)
+                if isinf(bound):
+                    continue
+                sign1 = PLUS if coefficient1 > 0 else MINUS
+                sign2 = PLUS if coefficient2 > 0 else MINUS
+                self.lower_octagonal_constraint(sign1, var1, sign2, var2, bound // abs(coefficient1))
+
+        return self
+
     def exit_if(self) -> 'OctagonDomain':
         return self
 
@@ -493,41 +653,11 @@ class OctagonDomain(OctagonLattice, State):
 
             def __init__(self, conditions, operator: Operator = None):
                 if isinstance(conditions, list):
-                    self._conditions = conditions
+                    self.conditions = conditions
                 else:
-                    self._conditions = [conditions]
-                self._cond_to_octagon = {cond: None for cond in self._conditions}
+                    self.conditions = [conditions]
                 self.operator = operator
 
-            @property
-            def condition_to_octagon(self):
-                return self._cond_to_octagon
-
-            @property
-            def conditions(self):
-                return self._conditions
-
-            @conditions.setter
-            def conditions(self, conditions):
-                self._conditions = conditions
-                self._cond_to_octagon = {cond: None for cond in conditions}
-
-            @property
-            def octagons(self):
-                return self._cond_to_octagon.values()
-
-            def combine_conditions(self):
-                assert len(self.conditions) >= 1
-                assert self.operator or len(self.conditions) <= 1
-
-                def apply(x, y):
-                    if self.operator == OctagonDomain.SmallerEqualConditionTransformer.ConditionSet.Operator.MEET:
-                        return x.meet(y)
-                    else:
-                        return x.join(y)
-
-                return reduce(apply, self.octagons)
-
         def visit_BinaryComparisonOperation(self, cond: BinaryComparisonOperation):
             condition_set = self._to_LtE_operator(cond)
 
@@ -542,6 +672,8 @@ class OctagonDomain(OctagonLattice, State):
                                                                             BinaryArithmeticOperation.Operator.Sub,
                                                                             cond.right), cond.operator,
                                                   Literal(int, '0')))
+                else:
+                    updated_conditions.append(cond)
             condition_set.conditions = updated_conditions
 
             return condition_set
@@ -589,71 +721,87 @@ class OctagonDomain(OctagonLattice, State):
     class AssumeVisitor(ExpressionVisitor):
         """Visits an expression and recursively 'assumes' the condition tree."""
 
+        # memoised condition sets ``e <= 0`` of the (interned) comparisons that are still alive, shared between all
+        # instances
+        _condition_sets = WeakKeyDictionary()  # type: Dict[Expression, 'ConditionSet']
+
+        @staticmethod
+        def condition_set(expr: BinaryComparisonOperation):
+            """The conditions ``e <= 0`` equivalent to a comparison (computed once per interned comparison)."""
+            if not is_interned(expr):
+                return OctagonDomain.SmallerEqualConditionTransformer().visit(expr)
+            condition_set = OctagonDomain.AssumeVisitor._condition_sets.get(expr)
+            if condition_set is None:
+                condition_set = OctagonDomain.SmallerEqualConditionTransformer().visit(expr)
+                OctagonDomain.AssumeVisitor._condition_sets[expr] = condition_set
+            return condition_set
+
         # noinspection PyMethodMayBeStatic
         def visit_UnaryBooleanOperation(self, expr: UnaryBooleanOperation, state):
             raise ValueError("The expression should not contain any unary boolean operations like negation (Neg)!")
 
         def visit_BinaryBooleanOperation(self, expr: BinaryBooleanOperation, state):
             if expr.operator == BinaryBooleanOperation.Operator.And:
-                return self.visit(expr.left, deepcopy(state)).meet(self.visit(expr.right, deepcopy(state)))
+                # a conjunction is assumed sequentially on the same state, this is equivalent to meeting the results
+                state = yield Visit(expr.left, state)
+                return (yield Visit(expr.right, state))
             elif expr.operator == BinaryBooleanOperation.Operator.Or:
-                return self.visit(expr.left, deepcopy(state)).join(self.visit(expr.right, deepcopy(state)))
+                left = yield Visit(expr.left, deepcopy(state))
+                right = yield Visit(expr.right, state)
+                return right.join(left)
             else:
                 raise ValueError()
 
-        # noinspection PyMethodMayBeStatic
         def visit_BinaryComparisonOperation(self, expr: BinaryComparisonOperation, state):
             # we want the following format: e <= 0
             # if not in that format, bring it to this and use a correcting +/-1 and join/meet of multiple inequalities
-            condition_set = OctagonDomain.SmallerEqualConditionTransformer().visit(expr)
-            for cond in condition_set.conditions:
-                state_copy = deepcopy(state)
-                left_side = cond.left
-                try:
-                    form = LinearForm.from_expression(simplify(left_side))
-
-                    # simplify implementation by always having a valid interval part
-                    interval = form.interval or IntervalLattice(0, 0)
-
-                    if not form.var_summands:  # IMPROVEMENT: this check is not handled in paper mine-HOSC06
-                        # [a,b] <= 0
-                        if interval.lower > 0:
-                            state_copy.bottom()
-                    elif len(form.var_summands) == 1:
-                        # +/- x + [a, b] <= 0
-                        var, sign = list(form.var_summands.items())[0]
-
-                        if sign == PLUS:
-                            # +x + [a, b] <= 0
-                            state_copy.lower_ub(var, -interval.lower)
-                        elif sign == MINUS:
-                            # -x + [a, b] <= 0
-                            state_copy.raise_lb(var, interval.lower)
-                        else:
-                            raise ValueError("unknown sign")
-                    elif len(form.var_summands) == 2:
-                        # +/- x +/- y + [a, b] <= 0
-                        items = list(form.var_summands.items())
-                        var1, sign1 = items[0]
-                        var2, sign2 = items[1]
-
-                        state_copy.lower_octagonal_constraint(sign1, var1, sign2, var2, -interval.lower)
-                    else:
-                        raise InvalidFormError(
-                            "Condition with more than two variables cannot be represented as octagonal constraints")
-
-                except InvalidFormError:
-                    # Non-octagonal constraint
-                    interval_domain = state.to_interval_domain()
-                    interval_domain.assume({expr})
-                    new_oct = OctagonDomain(state.variables)
-                    new_oct.from_interval_domain(interval_domain)
-                    state.meet(new_oct)
-
-                # finally store modified octagon copy for later combination
-                condition_set.condition_to_octagon[cond] = state_copy
+            ConditionSet = OctagonDomain.SmallerEqualConditionTransformer.ConditionSet
+            condition_set = self.condition_set(expr)
+            if condition_set.operator == ConditionSet.Operator.JOIN:
+                first, *others = condition_set.conditions
+                # a disjunction needs one copy of the state per additional condition
+                states = [self._assume_smaller_equal(cond, deepcopy(state)) for cond in others]
+                self._assume_smaller_equal(first, state)
+                for other in states:
+                    state.join(other)
+                return state
+            else:
+                for cond in condition_set.conditions:
+                    self._assume_smaller_equal(cond, state)
+                return state
 
-            return condition_set.combine_conditions()
+        # noinspection PyMethodMayBeStatic
+        def _assume_smaller_equal(self, cond: BinaryComparisonOperation, state):
+            """Assume a condition of the form ``e <= 0`` in place."""
+            form = QuasiLinearForm.from_expression(cond.left, state)
+            interval = form.interval
+            if any(abs(coefficient) != 1 for coefficient in form.coefficients.values()) or len(form.coefficients) > 2:
+                # Non-octagonal constraint
+                return state._assume_quasi_linear(cond.left)
+
+            items = [(var, PLUS if coefficient > 0 else MINUS) for var, coefficient in form.coefficients.items()]
+            if interval.is_bottom():
+                state.bottom()
+            elif not items:  # IMPROVEMENT: this check is not handled in paper mine-HOSC06
+                # [a,b] <= 0
+                if interval.lower > 0:
+                    state.bottom()
+            elif isinf(interval.lower):
+                pass  # -inf <= 0 does not constrain any variable
+            elif len(items) == 1:
+                # +/- x + [a, b] <= 0
+                var, sign = items[0]
+                if sign == PLUS:
+                    # +x + [a, b] <= 0
+                    state.lower_ub(var, -interval.lower)
+                else:
+                    # -x + [a, b] <= 0
+                    state.raise_lb(var, interval.lower)
+            else:
+                # +/- x +/- y + [a, b] <= 0
+                (var1, sign1), (var2, sign2) = items
+                state.lower_octagonal_constraint(sign1, var1, sign2, var2, -interval.lower)
+            return state
 
         # noinspection PyMethodOverriding
         def generic_visit(self, expr, state):
@@ -0,0 +1,426 @@
+from copy import deepcopy
+from math import inf
+from typing import List, Dict
+
+from abstract_domains.lattice import BottomMixin, KindMixin
+from abstract_domains.numerical.dbm import DBM
+from abstract_domains.numerical.interval_domain import IntervalLattice, IntervalArrayDomain
+from abstract_domains.numerical.linear_forms import VarForm, InvalidFormError
+from abstract_domains.numerical.numerical import NumericalMixin
+from abstract_domains.numerical.octagon_domain import OctagonDomain, PLUS, MINUS, Sign
+from abstract_domains.state import State
+from core.expressions import *
+from core.expressions_tools import make_condition_not_free
+
+
+class ZoneLattice(BottomMixin, NumericalMixin):
+    """Zone (difference-bound) lattice.
+
+    One lattice element is represented by a square DBM-matrix of size ``n + 1`` for ``n`` variables. Index ``0``
+    stands for the constant zero, the variables follow in the order of the environment. The matrix entry at
+    (``v1``, ``v2``) is the bound `c` of the constraint ``v2 - v1 <= c``.
+
+    ::
+
+             0    v1   v2
+        0    0    u1   u2
+        v1   l1   0    d12
+        v2   l2   d21  0
+
+    Zones only express constraints ``x <= c``, ``-x <= c`` and ``x - y <= c``, but their closure is a plain
+    Floyd-Warshall on a matrix of half the size of the matrix of an octagon. The bound interface (including
+    :meth:`get_octagonal_constraint`) mirrors :class:`abstract_domains.numerical.octagon_domain.OctagonLattice`,
+    constraints that a zone can not express are over-approximated by unary bounds.
+
+    Like octagons, the environment of a zone can grow and shrink and lattice operations unify differing environments.
+    """
+
+    def __init__(self, variables: List[VariableIdentifier]):
+        """Create a zone lattice for the given variables.
+
+        :param variables: list of program variables
+        """
+        super().__init__()
+        self._variables = list(variables)
+        self._build_index()
+        self._dbm = DBM(len(self._variables) + 1)
+
+    def _build_index(self):
+        self._var_to_index = {var: i + 1 for i, var in enumerate(self.variables)}
+
+    @property
+    def variables(self):
+        return self._variables
+
+    @property
+    def dbm(self):
+        return self._dbm
+
+    def add_variables(self, variables: List[VariableIdentifier]) -> 'ZoneLattice':
+        """Add variables to the environment of this zone. The added variables are unconstrained.
+
+        :param variables: variables to add, variables already in the environment are ignored
+        """
+        variables = [var for var in dict.fromkeys(variables) if var not in self._var_to_index]
+        if variables:
+            for var in variables:
+                self._variables.append(var)
+                self._var_to_index[var] = len(self._variables)
+            self.dbm.add_dimensions(len(variables))
+        return self
+
+    def remove_variables(self, variables: List[VariableIdentifier]) -> 'ZoneLattice':
+        """Remove (project away) variables from the environment of this zone.
+
+        The zone is closed first, such that constraints implied through the removed variables are kept.
+
+        :param variables: variables to remove, variables not in the environment are ignored
+        """
+        removed = {var for var in variables if var in self._var_to_index}
+        if removed:
+            self.close()
+            self.permute_variables([var for var in self.variables if var not in removed])
+        return self
+
+    def permute_variables(self, variables: List[VariableIdentifier]) -> 'ZoneLattice':
+        """Reorder the environment of this zone. Variables not listed are removed **without** closing first.
+
+        :param variables: the variables of the new environment in the new order, each must be in the environment
+        """
+        self.dbm.select_dimensions([0] + [self._var_to_index[var] for var in variables])
+        self._variables = list(variables)
+        self._build_index()
+        return self
+
+    def rename_variables(self, renaming: Dict[VariableIdentifier, VariableIdentifier]) -> 'ZoneLattice':
+        """Rename variables of this zone, keeping their constraints.
+
+        :param renaming: mapping from variables in the environment to their new (distinct) names
+        """
+        variables = [renaming.get(var, var) for var in self.variables]
+        if len(set(variables)) != len(variables):
+            raise ValueError("Renaming would merge distinct variables of the zone!")
+        self._variables = variables
+        self._build_index()
+        return self
+
+    def unify_environments(self, other: 'ZoneLattice') -> 'ZoneLattice':
+        """Bring this zone and the other zone to a common environment.
+
+        :param other: the other zone
+        :return: the other zone (copied only if necessary), over the same variables in the same order as this zone
+        """
+        if self.variables == other.variables:
+            return other
+        self.add_variables(other.variables)
+        if self.variables == other.variables:
+            return other
+        other = deepcopy(other)
+        other.add_variables(self.variables)
+        return other.permute_variables(self.variables)
+
+    def _index(self, var: VariableIdentifier):
+        """Index of a variable, variables outside the environment are added to it first."""
+        if var not in self._var_to_index:
+            self.add_variables([var])
+        return self._var_to_index[var]
+
+    def _key(self):
+        if self.is_bottom():
+            return KindMixin.Kind.BOTTOM
+        elif self.is_top():
+            return KindMixin.Kind.TOP
+        else:
+            return tuple(self.variables), self.dbm.key()
+
+    def __repr__(self):
+        if self.is_bottom():
+            return "⊥"
+        elif self.is_top():
+            return "⊤"
+        else:
+            res = []
+            # represent unary constraints first
+            for var in self.variables:
+                lower, upper = self.get_bounds(var)
+                if lower > -inf and upper < inf:
+                    res.append(f"{lower:.0f}≤{var.name}≤{upper:.0f}")
+                elif lower > -inf:
+                    res.append(f"{lower:.0f}≤{var.name}")
+                elif upper < inf:
+                    res.append(f"{var.name}≤{upper:.0f}")
+            # represent binary constraints second
+            for i, var1 in enumerate(self.variables):
+                for j, var2 in enumerate(self.variables):
+                    if i > j:
+                        c = self.dbm[j + 1, i + 1]
+                        if c < inf:
+                            res.append(f"{var1.name}-{var2.name}≤{c:.0f}")
+                        c = self.dbm[i + 1, j + 1]
+                        if c < inf:
+                            res.append(f"-{var1.name}+{var2.name}≤{c:.0f}")
+            return ", ".join(res)
+
+    def close(self):
+        """Closes this zone.
+
+        Closes the underlying DBM, if necessary, otherwise sets this zone to bottom.
+        :return: True, if this zone is consistent <=> this zone is not bottom.
+        """
+        if super().is_bottom():
+            return False
+        consistent = self.dbm.closed or self.dbm.close()
+        if not consistent:
+            self.bottom()
+        return consistent
+
+    def top(self):
+        self._dbm = DBM(len(self.variables) + 1)
+        self.kind = KindMixin.Kind.DEFAULT
+        return self
+
+    def is_top(self) -> bool:
+        return not self.is_bottom() and all(b == inf for (i, j), b in self.dbm.items() if i != j)
+
+    def is_bottom(self) -> bool:
+        # an inconsistent matrix is only detected by closing it
+        return not self.close()
+
+    def _less_equal(self, other: 'ZoneLattice') -> bool:
+        current = self
+        if self.variables != other.variables:  # compare over a common environment without modifying this zone
+            current = deepcopy(self)
+            other = current.unify_environments(other)
+        # the current zone is closed by the bottom check of the lattice
+        return all(x <= y for x, y in zip(current.dbm.values(), other.dbm.values()))
+
+    def _meet(self, other: 'ZoneLattice'):
+        other = self.unify_environments(other)
+        self.dbm.intersection(other.dbm)
+        return self
+
+    def _join(self, other: 'ZoneLattice') -> 'ZoneLattice':
+        other = self.unify_environments(other)
+        # both zones are closed by the bottom checks of the lattice, this gives the best abstraction of join
+        self.dbm.union(other.dbm)
+        return self
+
+    def _widening(self, other: 'ZoneLattice'):
+        other = self.unify_environments(other)
+        self.dbm.zip(other.dbm, lambda a, b: a if a >= b else inf)
+        return self
+
+    def forget(self, var: VariableIdentifier):
+        if var not in self._var_to_index:
+            return  # nothing is known about variables outside the environment
+        # close first to not lose implicit constraints about other variables
+        if self.close():
+            self.dbm.forget(self._var_to_index[var])
+
+    def tighten(self, var1: VariableIdentifier, var2: VariableIdentifier, constant):
+        """Add the constraint ``var2 - var1 <= constant``, either variable may be ``None`` for the constant zero."""
+        if super().is_bottom():
+            return
+        i = self._index(var1) if var1 else 0
+        j = self._index(var2) if var2 else 0
+        if not self.dbm.tighten(i, j, constant):
+            self.bottom()
+
+    def set_bounds(self, var: VariableIdentifier, lower: int, upper: int):
+        self.set_lb(var, lower)
+        self.set_ub(var, upper)
+
+    def get_bounds(self, var: VariableIdentifier):
+        return self.get_lb(var), self.get_ub(var)
+
+    def set_interval(self, var: VariableIdentifier, interval: IntervalLattice):
+        assert not interval.is_bottom(), "We can not use interval that is bottom to determine variable bounds!"
+        self.set_lb(var, interval.lower)
+        self.set_ub(var, interval.upper)
+
+    def get_interval(self, var: VariableIdentifier):
+        return IntervalLattice(self.get_lb(var), self.get_ub(var))
+
+    def set_lb(self, var: VariableIdentifier, constant):
+        self.dbm[self._index(var), 0] = -constant  # encodes 0 - var <= -constant <=> var >= constant
+
+    def raise_lb(self, var: VariableIdentifier, constant):
+        self.tighten(var, None, -constant)
+
+    def get_lb(self, var: VariableIdentifier):
+        if var not in self._var_to_index:
+            return -inf
+        self.close()
+        return -self.dbm[self._var_to_index[var], 0]
+
+    def set_ub(self, var: VariableIdentifier, constant):
+        self.dbm[0, self._index(var)] = constant  # encodes var - 0 <= constant
+
+    def lower_ub(self, var: VariableIdentifier, constant):
+        self.tighten(None, var, constant)
+
+    def get_ub(self, var: VariableIdentifier):
+        if var not in self._var_to_index:
+            return inf
+        self.close()
+        return self.dbm[0, self._var_to_index[var]]
+
+    def get_octagonal_constraint(self, sign1: Sign, var1: VariableIdentifier,
+                                 sign2: Sign, var2: VariableIdentifier):
+        """Bound of the octagonal constraint ``sign1 * var1 + sign2 * var2 <= c``.
+
+        Sums of variables are bounded using the unary bounds only.
+        """
+        if sign1 == sign2:
+            if sign1 == PLUS:
+                return self.get_ub(var1) + self.get_ub(var2)
+            return -self.get_lb(var1) - self.get_lb(var2)
+        elif var1 == var2:
+            return 0
+        elif var1 not in self._var_to_index or var2 not in self._var_to_index:
+            return inf
+        self.close()
+        if sign1 == PLUS:
+            return self.dbm[self._var_to_index[var2], self._var_to_index[var1]]  # var1 - var2 <= c
+        return self.dbm[self._var_to_index[var1], self._var_to_index[var2]]  # var2 - var1 <= c
+
+    def lower_octagonal_constraint(self, sign1: Sign, var1: VariableIdentifier,
+                                   sign2: Sign, var2: VariableIdentifier, constant):
+        """Add the octagonal constraint ``sign1 * var1 + sign2 * var2 <= constant``.
+
+        Sums of variables can not be expressed, they are used to bound each variable by the other's bound instead.
+        """
+        if sign1 == MINUS and sign2 == PLUS:
+            self.tighten(var1, var2, constant)
+        elif sign1 == PLUS and sign2 == MINUS:
+            self.tighten(var2, var1, constant)
+        elif sign1 == PLUS:
+            self.lower_ub(var1, constant - self.get_lb(var2))
+            self.lower_ub(var2, constant - self.get_lb(var1))
+        else:
+            self.raise_lb(var1, self.get_ub(var2) - constant)
+            self.raise_lb(var2, self.get_ub(var1) - constant)
+
+    def to_interval_domain(self):
+        """Translate this zone into an interval store."""
+        interval_store = IntervalArrayDomain(list(self.variables))
+        if not self.close():
+            return interval_store.bottom()
+        for var in self.variables:
+            interval_store.set_bounds(var, *self.get_bounds(var))
+        return interval_store
+
+    def evaluate(self, expr: Expression):
+        return self.to_interval_domain().evaluate(expr)
+
+
+class ZoneDomain(ZoneLattice, State):
+    """Zone domain. Extends the zone lattice with state interface.
+
+    Conditions are handled like in :class:`abstract_domains.numerical.octagon_domain.OctagonDomain`.
+    """
+
+    def __init__(self, variables: List[VariableIdentifier]):
+        """Create a zone state for given variables.
+
+        :param variables: list of program variables
+        """
+        super().__init__(variables)
+
+    def _substitute_variable(self, left: Expression, right: Expression) -> 'ZoneDomain':
+        raise NotImplementedError("Zone domain does not yet support variable substitution.")
+
+    def _assume(self, condition: Expression) -> 'ZoneDomain':
+        not_free_condition = make_condition_not_free(condition)
+
+        res = OctagonDomain.AssumeVisitor().visit(not_free_condition, self)
+        self.replace(res)
+
+        return self
+
+    # linearisation of non-octagonal conditions only relies on the bounds interface shared with octagons
+    _assume_quasi_linear = OctagonDomain._assume_quasi_linear
+
+    def exit_if(self) -> 'ZoneDomain':
+        return self
+
+    def exit_loop(self) -> 'ZoneDomain':
+        return self
+
+    def _output(self, output: Expression) -> 'ZoneDomain':
+        return self
+
+    def _evaluate_literal(self, literal: Expression) -> Set[Expression]:
+        return {literal}
+
+    def enter_if(self) -> 'ZoneDomain':
+        return self
+
+    def enter_loop(self) -> 'ZoneDomain':
+        return self
+
+    def _access_variable(self, variable: VariableIdentifier) -> Set[Expression]:
+        return {variable}
+
+    def _assign_constant(self, x: VariableIdentifier, interval: IntervalLattice):
+        """x = [a,b]"""
+        if interval.is_bottom():
+            self.bottom()
+            return
+        self.forget(x)
+        self.lower_ub(x, interval.upper)
+        self.raise_lb(x, interval.lower)
+
+    def _assign_same_var_plus_constant(self, x: VariableIdentifier, interval: IntervalLattice):
+        """x = x + [a,b]"""
+        if interval.is_bottom():
+            self.bottom()
+            return
+        self.dbm.shift(self._index(x), interval.lower, interval.upper)
+
+    def _assign_other_var_plus_constant(self, x: VariableIdentifier, y: VariableIdentifier, interval: IntervalLattice):
+        """x = y + [a,b]"""
+        if interval.is_bottom():
+            self.bottom()
+            return
+        self.forget(x)
+        self.tighten(y, x, interval.upper)  # x - y <= b
+        self.tighten(x, y, -interval.lower)  # y - x <= -a
+
+    def _assign_variable(self, left: Expression, right: Expression) -> 'ZoneDomain':
+        if isinstance(left, VariableIdentifier):
+            if left.typ == int:
+                try:
+                    form = VarForm.from_expression(right)
+                    interval = form.interval or IntervalLattice(0, 0)
+                    if not form.var:
+                        # x = [a,b]
+                        self._assign_constant(left, interval)
+                    elif form.var_sign == PLUS and form.var == left:
+                        # x = x + [a,b]
+                        self._assign_same_var_plus_constant(left, interval)
+                    elif form.var_sign == PLUS:
+                        # x = y + [a,b]
+                        self._assign_other_var_plus_constant(left, form.var, interval)
+                    else:
+                        # x = - y + [a,b] is not a difference constraint
+                        self._assign_constant(left, self.evaluate(right))
+                except InvalidFormError:
+                    # right is not in single variable linear form, use interval evaluation fallback
+                    self._assign_constant(left, self.evaluate(right))
+            elif left.typ == list:
+                interval = self.evaluate(right)
+                if interval.is_bottom():
+                    # this can happen if right is a empty ListDisplay
+                    interval = IntervalLattice().top()
+                self._assign_constant(left, interval)
+        elif isinstance(left, Index):
+            list_var = left.target
+            interval = self.evaluate(right)
+            # weak update to single interval that represents whole list in the abstract
+            interval = interval.join(self.get_interval(list_var))
+            self.forget(list_var)
+            self.set_interval(list_var, interval)
+        else:
+            raise NotImplementedError(f"Left side of assignment of type {type(left)} is not supported!")
+        return self
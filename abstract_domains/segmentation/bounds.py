@@ -1,5 +1,5 @@
 from abstract_domains.numerical.interval_domain import IntervalLattice
-from abstract_domains.numerical.linear_forms import VarForm, LinearForm, InvalidFormError
+from abstract_domains.numerical.linear_forms import VarForm, InvalidFormError
 from abstract_domains.numerical.octagon_domain import OctagonLattice
 from core.expressions import Expression, VariableIdentifier
 from core.expressions_tools import MINUS, PLUS
@@ -11,6 +11,7 @@ class VarFormOct(VarForm):
     
     For semantic comparision octagonal constraints are used.
     """
+    __slots__ = ()
 
     def __init__(self, var=None, interval=None):
         super().__init__(PLUS, var, interval)
@@ -18,17 +19,13 @@ class VarFormOct(VarForm):
     @staticmethod
     def from_expression(expr: Expression):
         form = VarFormOct()
-        LinearForm._visitor.visit(expr, form)
+        form._read_expression(expr)
 
         if len(form.var_summands) > 1:
             raise InvalidFormError("More than a single variable detected!")
 
         return form
 
-    def __hash__(self):
-        # ensure that two instances with same variable name but different VariableIdentifier instances have same hash
-        return hash(str(self))
-
     @property
     def interval(self):
         if not super().interval.is_constant():
@@ -135,3 +132,43 @@ class VarFormOct(VarForm):
             self.interval = self.interval + form.interval
 
         return self
+
+
+class BoundComparator:
+    """Memoised comparison of bounds against a snapshot of an octagon.
+
+    Every pair of bounds (in canonical form) is compared against the octagon at most once per comparison operator.
+
+    **NOTE**: The octagon must not be modified while the comparator is in use.
+    """
+
+    def __init__(self, octagon: OctagonLattice):
+        self._octagon = octagon
+        self._comparisons = dict()
+
+    @property
+    def octagon(self):
+        return self._octagon
+
+    def _compare(self, operator: str, bound1: VarFormOct, bound2: VarFormOct) -> bool:
+        key = (operator, str(bound1), str(bound2))
+        result = self._comparisons.get(key)
+        if result is None:
+            result = getattr(bound1, operator)(bound2, self.octagon)
+            self._comparisons[key] = result
+        return result
+
+    def eq(self, bound1: VarFormOct, bound2: VarFormOct) -> bool:
+        return self._compare('eq_octagonal', bound1, bound2)
+
+    def lt(self, bound1: VarFormOct, bound2: VarFormOct) -> bool:
+        return self._compare('lt_octagonal', bound1, bound2)
+
+    def le(self, bound1: VarFormOct, bound2: VarFormOct) -> bool:
+        return self._compare('le_octagonal', bound1, bound2)
+
+    def gt(self, bound1: VarFormOct, bound2: VarFormOct) -> bool:
+        return self._compare('gt_octagonal', bound1, bound2)
+
+    def ge(self, bound1: VarFormOct, bound2: VarFormOct) -> bool:
+        return self._compare('ge_octagonal', bound1, bound2)
@@ -1,3 +1,4 @@
+from collections import Counter
 from copy import deepcopy
 from math import inf
 from typing import Type, List, Union
@@ -6,7 +7,7 @@ from abstract_domains.lattice import Lattice
 from abstract_domains.numerical.interval_domain import IntervalLattice
 from abstract_domains.numerical.linear_forms import InvalidFormError
 from abstract_domains.numerical.octagon_domain import OctagonDomain, OctagonLattice
-from abstract_domains.segmentation.bounds import VarFormOct
+from abstract_domains.segmentation.bounds import VarFormOct, BoundComparator
 from core.cfg import Edge
 from core.expressions import Literal, VariableIdentifier, Expression
 from core.statements import ProgramPoint
@@ -39,46 +40,46 @@ class Limit:
         return len(self.bounds)
 
     @_auto_convert_to_limit
-    def eq_octagonal(self, other, octagon: OctagonLattice):
+    def eq_octagonal(self, other, comparator: BoundComparator):
         for b1 in self.bounds:
             for b2 in other.bounds:
-                if b1.eq_octagonal(b2, octagon):
+                if comparator.eq(b1, b2):
                     return True
         return False
 
     @_auto_convert_to_limit
-    def ne_octagonal(self, other, octagon: OctagonLattice):
-        return not self.eq_octagonal(other, octagon)
+    def ne_octagonal(self, other, comparator: BoundComparator):
+        return not self.eq_octagonal(other, comparator)
 
     @_auto_convert_to_limit
-    def lt_octagonal(self, other, octagon: OctagonLattice):
+    def lt_octagonal(self, other, comparator: BoundComparator):
         for b1 in self.bounds:
             for b2 in other.bounds:
-                if b1.lt_octagonal(b2, octagon):
+                if comparator.lt(b1, b2):
                     return True
         return False
 
     @_auto_convert_to_limit
-    def le_octagonal(self, other, octagon: OctagonLattice):
+    def le_octagonal(self, other, comparator: BoundComparator):
         for b1 in self.bounds:
             for b2 in other.bounds:
-                if b1.le_octagonal(b2, octagon):
+                if comparator.le(b1, b2):
                     return True
         return False
 
     @_auto_convert_to_limit
-    def gt_octagonal(self, other, octagon: OctagonLattice):
+    def gt_octagonal(self, other, comparator: BoundComparator):
         for b1 in self.bounds:
             for b2 in other.bounds:
-                if b1.gt_octagonal(b2, octagon):
+                if comparator.gt(b1, b2):
                     return True
         return False
 
     @_auto_convert_to_limit
-    def ge_octagonal(self, other, octagon: OctagonLattice):
+    def ge_octagonal(self, other, comparator: BoundComparator):
         for b1 in self.bounds:
             for b2 in other.bounds:
-                if b1.ge_octagonal(b2, octagon):
+                if comparator.ge(b1, b2):
                     return True
         return False
 
@@ -91,6 +92,7 @@ class SegmentedListLattice(Lattice):
     def __init__(self, len_var, predicate_lattice: Type[Lattice], octagon: OctagonLattice):
         super().__init__()
         self._octagon = octagon
+        self._comparator = None
         self._len_var = len_var
         self._predicate_lattice = predicate_lattice
         self._limits = [
@@ -140,7 +142,16 @@ class SegmentedListLattice(Lattice):
 
     @octagon.setter
     def octagon(self, value):
-        self._octagon = value
+        if value is not self._octagon:
+            self._octagon = value
+            self._comparator = None
+
+    @property
+    def comparator(self):
+        """Memoised bound comparisons against the current octagon."""
+        if self._comparator is None:
+            self._comparator = BoundComparator(self.octagon)
+        return self._comparator
 
     def __len__(self):
         return len(self.predicates)
@@ -160,14 +171,18 @@ class SegmentedListLattice(Lattice):
         s += str(self._limits[-1])
         return f"[{s}]"
 
+    def _key(self):
+        return tuple(frozenset(limit.bounds) for limit in self.limits), tuple(self.predicates), \
+            tuple(self.possibly_empty)
+
     def check_limits(self):
         for i in range(len(self)):
             if self.possibly_empty[i]:
                 assert self.limits[i].le_octagonal(self.limits[
                                                        i + 1],
-                                                   self.octagon), f"Limits not ordered: {self.limits[i]} !<= {self.limits[i+1]}"
+                                                   self.comparator), f"Limits not ordered: {self.limits[i]} !<= {self.limits[i+1]}"
             else:
-                assert self.limits[i].lt_octagonal(self.limits[i + 1], self.octagon)
+                assert self.limits[i].lt_octagonal(self.limits[i + 1], self.comparator)
 
     def add_limit(self, segment_index, limit: Limit, predicate_before=None, predicate_after=None,
                   possibly_empty_before=True,
@@ -229,7 +244,7 @@ class SegmentedListLattice(Lattice):
         greatest_lower_limit = 0
         if index_form.interval.finite():
             while greatest_lower_limit < len(self) and self.limits[greatest_lower_limit + 1].le_octagonal(index_form,
-                                                                                                          self.octagon):
+                                                                                                          self.comparator):
                 greatest_lower_limit += 1
         assert greatest_lower_limit < len(
             self), f"The target index {index_form} is greater than the length!"
@@ -239,7 +254,7 @@ class SegmentedListLattice(Lattice):
         """Finds least upper limit that is greater **or equals** to the index."""
         least_upper_limit = len(self)
         if index_form.interval.finite():
-            while 0 < least_upper_limit and self.limits[least_upper_limit - 1].ge_octagonal(index_form, self.octagon):
+            while 0 < least_upper_limit and self.limits[least_upper_limit - 1].ge_octagonal(index_form, self.comparator):
                 least_upper_limit -= 1
         assert least_upper_limit >= 0, f"The target index {index_form} is smaller equals the lower limit!"
         return least_upper_limit
@@ -290,7 +305,7 @@ class SegmentedListLattice(Lattice):
             lu -= 1
 
         # add the target lower bound/limit
-        if self.limits[gl].eq_octagonal(lower_index_form, self.octagon):
+        if self.limits[gl].eq_octagonal(lower_index_form, self.comparator):
             # add target lower bound to existing limit
             self.limits[gl].bounds.add(lower_index_form)
 
@@ -305,7 +320,7 @@ class SegmentedListLattice(Lattice):
             new_predicate_index = gl + 1
 
         # add the target upper bound/limit, setting predicate in (possibly newly inserted) segment
-        if self.limits[lu].eq_octagonal(upper_index_form, self.octagon):
+        if self.limits[lu].eq_octagonal(upper_index_form, self.comparator):
             # add target upper bound to existing limit
             self.limits[lu].bounds.add(upper_index_form)
         else:
@@ -350,7 +365,7 @@ class SegmentedListLattice(Lattice):
     def get_gl_lu(self, lower_index_form: VarFormOct, upper_index_form: VarFormOct):
         gl = self.greatest_lower_limit(lower_index_form)
         lu = self.least_upper_limit(upper_index_form)
-        lu_inclusive = not self.limits[lu].lt_octagonal(upper_index_form, self.octagon)
+        lu_inclusive = not self.limits[lu].lt_octagonal(upper_index_form, self.comparator)
         if lu_inclusive:
             assert gl <= lu, "Implementation Error: inconsistent greatest_lower_limit, " \
                              "least_upper_limit indices!"
@@ -387,66 +402,59 @@ class SegmentedListLattice(Lattice):
 
     def merge_equal_limits(self):
         for i in reversed(range(0, len(self.limits) - 1)):
-            if self.limits[i].eq_octagonal(self.limits[i + 1], self.octagon):
+            if self.limits[i].eq_octagonal(self.limits[i + 1], self.comparator):
                 self.remove_segment(i)
 
     def _join(self, other: 'SegmentedListLattice') -> 'SegmentedListLattice':
-        other_copy = deepcopy(other)
-        self.unify(other_copy, lambda: self._predicate_lattice().bottom())
-        for i in range(len(self)):
-            self.predicates[i].join(other_copy.predicates[i])
-            self.possibly_empty[i] = max(self.possibly_empty[i], other_copy.possibly_empty[i])
+        limits, predicates, possibly_empty, other_predicates, other_possibly_empty = \
+            self._unified(other, lambda: self._predicate_lattice().bottom())
+        for predicate, other_predicate in zip(predicates, other_predicates):
+            predicate.join(other_predicate)
+        self._limits = limits
+        self._predicates = predicates
+        self._possibly_empty = [max(e1, e2) for e1, e2 in zip(possibly_empty, other_possibly_empty)]
         return self
 
     def _less_equal(self, other: 'SegmentedListLattice') -> bool:
-        other_copy = deepcopy(other)
         # different left/right neutral predicates!
-        self.unify(other_copy, lambda: self._predicate_lattice().bottom(), lambda: self._predicate_lattice().top())
-        return all(p1.less_equal(p2) for p1, p2 in zip(self.predicates, other_copy.predicates))
+        _, predicates, _, other_predicates, _ = \
+            self._unified(other, lambda: self._predicate_lattice().bottom(), lambda: self._predicate_lattice().top())
+        return all(p1.less_equal(p2) for p1, p2 in zip(predicates, other_predicates))
 
     def _widening(self, other: 'SegmentedListLattice'):
-        # print(f"WIDEN {self} \tAND\t {other}")
-        other_copy = deepcopy(other)
-        del other
-
-        j = 1  # exclude first limit
-        while j < len(other_copy):  # exclude last limit
-            other_limit = other_copy.limits[j]
-            found = False
-            for self_limit in self.limits:
-                if other_limit.bounds == self_limit.bounds:
-                    found = True
-                    break
-
-            if not found:
-                other_copy.remove_limit(j)
-                j -= 1  # correction
-
-                # interval = self.octagon.evaluate(right)
-                #
-                # while True:
-                #     seen = False
-                #     for b in self.all_bounds():
-                #         if b.var and b.var == left:  # substitution necessary
-                #             seen = True
-                #             self.set_predicate(interval + b.interval, self._predicate_lattice().top())
-                #             break  # break because bounds may have changed and all_bounds generator is disrupted
-                #     if not seen:
-                #         break
-            j += 1
-
-        # no unify (necessary since new limits may have changed during limit widening) and widen segment-wise
-        self.unify(other_copy, lambda: self._predicate_lattice().bottom())
-        for p1, p2 in zip(self.predicates, other_copy.predicates):
+        # keep only the limits of other that also appear (syntactically) in this segmentation
+        self_bounds = {frozenset(limit.bounds) for limit in self.limits}
+        limits, predicates, possibly_empty = [other.limits[0]], [other.predicates[0]], [other.possibly_empty[0]]
+        for j in range(1, len(other)):  # exclude first and last limit
+            if frozenset(other.limits[j].bounds) in self_bounds:
+                limits.append(other.limits[j])
+                predicates.append(other.predicates[j])
+                possibly_empty.append(other.possibly_empty[j])
+            else:
+                # remove the limit, joining the neighboring segments
+                predicates[-1] = deepcopy(predicates[-1]).join(other.predicates[j])
+                possibly_empty[-1] = possibly_empty[-1] and other.possibly_empty[j]
+        limits.append(other.limits[-1])
+
+        # unify (necessary since new limits may have changed during limit widening) and widen segment-wise
+        limits, predicates, possibly_empty, other_predicates, _ = \
+            self._unified(other, lambda: self._predicate_lattice().bottom(),
+                          other_segments=(limits, predicates, possibly_empty))
+        for p1, p2 in zip(predicates, other_predicates):
             p1.widening(p2)
+        self._limits = limits
+        self._predicates = predicates
+        self._possibly_empty = possibly_empty
         return self
 
     def _meet(self, other: 'SegmentedListLattice'):
-        other_copy = deepcopy(other)
-        self.unify(other_copy, lambda: self._predicate_lattice().top())
-        for i in range(len(self)):
-            self.predicates[i].meet(other_copy.predicates[i])
-            self.possibly_empty[i] = min(self.possibly_empty[i], other_copy.possibly_empty[i])
+        limits, predicates, possibly_empty, other_predicates, other_possibly_empty = \
+            self._unified(other, lambda: self._predicate_lattice().top())
+        for predicate, other_predicate in zip(predicates, other_predicates):
+            predicate.meet(other_predicate)
+        self._limits = limits
+        self._predicates = predicates
+        self._possibly_empty = [min(e1, e2) for e1, e2 in zip(possibly_empty, other_possibly_empty)]
         return self
 
     def top(self):
@@ -465,202 +473,216 @@ class SegmentedListLattice(Lattice):
     def is_bottom(self) -> bool:
         return all([p.is_bottom() for p in self.predicates])
 
+    def _joined_comparator(self, other: 'SegmentedListLattice') -> BoundComparator:
+        """Bound comparator for the join of the octagons of this and the other segmentation."""
+        if self.octagon is other.octagon:
+            return self.comparator
+        return BoundComparator(deepcopy(self.octagon).join(other.octagon))
+
     def unify(self, other: 'SegmentedListLattice', left_neutral_predicate_generator,
               right_neutral_predicate_generator=None):
         """Unifies this segmentation **and** the other segmentation to let them coincide.
         
-        **NOTE**: This potentially also modifies the actual parameter ``other``.
+        **NOTE**: This also modifies the actual parameter ``other``.
         
         Requires compatible extremal limits, i.e. at least one common bound in the lower limits, one common bound in 
         the upper limits (of ``self`` and ``other``).
         """
-        assert self.limits[0].eq_octagonal(other.limits[0],
-                                           self.octagon), "The lower limits should be equal for unification."
-        assert self.limits[-1].eq_octagonal(other.limits[-1],
-                                            self.octagon), "The upper limits should be equal for unification."
-
+        limits, self._predicates, self._possibly_empty, other._predicates, other._possibly_empty = \
+            self._unified(other, left_neutral_predicate_generator, right_neutral_predicate_generator)
+        self._limits = limits
+        other._limits = [Limit(set(limit.bounds)) for limit in limits]
+
+    def _unified(self, other: 'SegmentedListLattice', left_neutral_predicate_generator,
+                 right_neutral_predicate_generator=None, other_segments=None):
+        """Unifies this segmentation and the other segmentation without modifying any of them.
+        
+        Both segmentations are walked once from their lower to their upper limit (like in a merge), building the 
+        unified segmentations in fresh lists.
+        
+        :param other: the other segmentation
+        :param left_neutral_predicate_generator: generates the predicate of segments added to this segmentation
+        :param right_neutral_predicate_generator: generates the predicate of segments added to the other segmentation
+        :param other_segments: limits, predicates and possibly empty flags to use instead of the ones of ``other``
+        :return: the unified limits, the predicates and possibly empty flags of this segmentation and the predicates 
+            and possibly empty flags of the other segmentation
+        """
         if not right_neutral_predicate_generator:
             right_neutral_predicate_generator = left_neutral_predicate_generator
+        if not other_segments:
+            other_segments = (other.limits, other.predicates, other.possibly_empty)
+
+        # compare bounds against the joined octagon during unification
+        comparator = self._joined_comparator(other)
 
-        # prepare the joined octagon used for unification
-        # TODO this is ugly because the joined octagon was already calculated in octagon analysis
-        # TODO (but is difficult to access from here)
-        octagon = deepcopy(self.octagon).join(other.octagon)
+        assert self.limits[0].eq_octagonal(other_segments[0][0],
+                                           comparator), "The lower limits should be equal for unification."
+        assert self.limits[-1].eq_octagonal(other_segments[0][-1],
+                                            comparator), "The upper limits should be equal for unification."
 
-        self._unify(other, left_neutral_predicate_generator, right_neutral_predicate_generator, 0, 0, octagon)
+        left = _UnificationCursor(self.limits, self.predicates, self.possibly_empty, left_neutral_predicate_generator)
+        right = _UnificationCursor(*other_segments, right_neutral_predicate_generator)
+        limits = []
 
-        # TODO check if really not needed (should not if unify does always merge equal limits on the fly
-        # self.merge_equal_limits()
-        # other.merge_equal_limits()
+        def insert_before(seg1: _UnificationCursor, seg2: _UnificationCursor):
+            """Add the current limit of ``seg2`` to ``seg1`` before its current limit."""
+            seg1.split(seg2.possibly_empty_before, seg2.possibly_empty_after)
+            limits.append(seg2.limit)
+            seg2.advance()
 
-    def _unify(self, other: 'SegmentedListLattice', left_neutral_predicate_generator, right_neutral_predicate_generator,
-               self_index: int, other_index: int, octagon: OctagonLattice):
-        # TODO check if this subset_case can be merged into incomparable_case
-        def handle_subset_case(seg1, seg2, i, j, seg1_neutral_predicate_generator, seg2_neutral_predicate_generator):
+        def handle_subset_case(seg1: _UnificationCursor, seg2: _UnificationCursor):
             """Handle the case where ``b1 > b2``, i.e. bounds ``b2`` is a subset of bounds ``b1``.
             
-            Where ``b1`` are bounds of ``seg1`` at current index of ``seg1`` and ``b2`` are bounds of ``seg2`` at 
-            current index of ``seg2``. 
-            
-            This method recursively calls :meth:`unify`.
-            
-            :param seg1: segmentation 1
-            :param seg2: segmentation 2
-            :param i: index of the starting limit of first segmentation
-            :param j: index of the starting limit of second segmentation
-            :param seg1_neutral_predicate_generator: the neutral predicate generator for segmentation ``seg1``
-            :param seg2_neutral_predicate_generator: the neutral predicate generator for segmentation ``seg2``
+            Where ``b1`` are bounds of the current limit of ``seg1`` and ``b2`` are bounds of the current limit of 
+            ``seg2``.
             """
-            b1 = seg1.limits[self_index].bounds
-            b2 = seg2.limits[other_index].bounds
-
-            b1_exclusive = b1 - b2
-            assert b1_exclusive, "Implementation error: There should be at least one bound exclusively in b1"
-            assert not (b1_exclusive & b2), "Implementation error: b1_exclusive contains non-exclusive elements"
-
-            # find bounds in b1_exclusive that do appear in any segmentation bounds from j+1 onwards
-            b1_appearing_later_in_seg2 = b1_exclusive & set(seg2.all_bounds(j + 1))
-
-            if not b1_appearing_later_in_seg2:  # if b1_exclusive bounds do not appear later in segmentation ``seg2``
-                # just forget about b1_exclusive bounds
-                seg1.limits[i].bounds -= b1_exclusive
-                # Note switch of receiver, other-argument
-                # noinspection PyProtectedMember
-                seg1._unify(seg2, seg1_neutral_predicate_generator, seg2_neutral_predicate_generator, i, j, octagon)
-            else:
-                seg1.limits[i].bounds -= b1_exclusive
+            b1_exclusive = seg1.limit.bounds - seg2.limit.bounds
+            seg1.limit.bounds = seg1.limit.bounds - b1_exclusive
+            if seg2.later_bounds(b1_exclusive):  # if b1_exclusive bounds do appear later in ``seg2``
                 # add new segment to seg1 with neutral element
-                seg1.add_limit(i, Limit(deepcopy(b1_exclusive)), predicate_before=seg1_neutral_predicate_generator(),
-                               possibly_empty_before=True, possibly_empty_after=seg1.possibly_empty[i])
-                # noinspection PyProtectedMember
-                seg1._unify(seg2, seg1_neutral_predicate_generator, seg2_neutral_predicate_generator, i, j, octagon)
+                seg1.insert_after(b1_exclusive)
 
-        def handle_incomparable_case(seg1, seg2, i, j):
-            """Handle the case where neither ``b1 < b2`` nor ``b1 > b2``.
-
-            Where ``b1`` are bounds of ``seg1`` at current index of ``seg1`` and ``b2`` are bounds of ``seg2`` at 
-            current index of ``seg2``. 
-
-            This method recursively calls :meth:`unify`.
-
-            :param seg1: segmentation 1
-            :param seg2: segmentation 2
-            :param i: index of the starting limit of first segmentation
-            :param j: index of the starting limit of second segmentation
-            """
-            b1 = seg1.limits[self_index].bounds
-            b2 = seg2.limits[other_index].bounds
-
-            b1_exclusive = b1 - b2
-            b2_exclusive = b2 - b1
-            assert b1_exclusive, "Implementation error: There should be at least one bound exclusively in b1"
-            assert b2_exclusive, "Implementation error: There should be at least one bound exclusively in b2"
-            assert not (b1_exclusive & b2), "Implementation error: b1_exclusive contains non-exclusive elements"
-            assert not (b2_exclusive & b1), "Implementation error: b2_exclusive contains non-exclusive elements"
-
-            # find bounds in b1_exclusive that do appear in any segmentation bounds from j+1 onwards
-            b1_appearing_later_in_seg2 = b1_exclusive & set(seg2.all_bounds(j + 1))
-
-            # find bounds in b2_exclusive that do appear in any segmentation bounds from i+1 onwards
-            b2_appearing_later_in_seg1 = b2_exclusive & set(seg1.all_bounds(i + 1))
+        def handle_incomparable_case(seg1: _UnificationCursor, seg2: _UnificationCursor):
+            """Handle the case where neither ``b1 < b2`` nor ``b1 > b2``."""
+            b1_exclusive = seg1.limit.bounds - seg2.limit.bounds
+            b2_exclusive = seg2.limit.bounds - seg1.limit.bounds
+            b1_appearing_later_in_seg2 = seg2.later_bounds(b1_exclusive)
+            b2_appearing_later_in_seg1 = seg1.later_bounds(b2_exclusive)
 
             # in all 4 cases we remove the respective exclusive bounds
-            seg1.limits[i].bounds -= b1_exclusive
-            seg2.limits[j].bounds -= b2_exclusive
+            seg1.limit.bounds = seg1.limit.bounds - b1_exclusive
+            seg2.limit.bounds = seg2.limit.bounds - b2_exclusive
             if b2_appearing_later_in_seg1:
-                seg2.add_limit(j, Limit(deepcopy(b2_appearing_later_in_seg1)),
-                               predicate_before=right_neutral_predicate_generator(),
-                               possibly_empty_before=True, possibly_empty_after=seg2.possibly_empty[j])
+                seg2.insert_after(b2_appearing_later_in_seg1)
             if b1_appearing_later_in_seg2:
-                seg1.add_limit(i, Limit(deepcopy(b1_appearing_later_in_seg2)),
-                               predicate_before=left_neutral_predicate_generator(),
-                               possibly_empty_before=True, possibly_empty_after=seg1.possibly_empty[i])
-            # noinspection PyProtectedMember
-            seg1._unify(seg2, left_neutral_predicate_generator, right_neutral_predicate_generator, i, j, octagon)
-
-        assert self_index <= len(self) and other_index <= len(other)
-        # print(f"unify {self} \tAND\t {other}")
-        # recursion ending criteria
-        if self_index == len(self) and other_index == len(other):
-            assert self.limits[self_index].eq_octagonal(other.limits[other_index],
-                                                        octagon), "The upper limits should be equal for " \
-                                                                  "unification. "
-            # make syntactically equivalent too
-            self.limits[self_index].bounds &= other.limits[other_index].bounds
-            other.limits[other_index].bounds &= self.limits[self_index].bounds
-            return
-        elif self_index == len(self):
-            while other_index < len(other):
-                self.add_limit(len(self) - 1, deepcopy(other.limits[other_index]),
-                               possibly_empty_before=other.possibly_empty[other_index - 1],
-                               possibly_empty_after=other.possibly_empty[other_index])
-                self_index += 1  # correction
-                other_index += 1
-            self._unify(other, left_neutral_predicate_generator, right_neutral_predicate_generator, self_index,
-                        other_index, octagon)
-            return
-        elif other_index == len(other):
-            while self_index < len(self):
-                other.add_limit(len(other) - 1, deepcopy(self.limits[self_index]),
-                                possibly_empty_before=self.possibly_empty[self_index - 1],
-                                possibly_empty_after=self.possibly_empty[self_index])
-                other_index += 1  # correction
-                self_index += 1
-            self._unify(other, left_neutral_predicate_generator, right_neutral_predicate_generator, self_index,
-                        other_index, octagon)
-            return
-
-        self_limit = self.limits[self_index]
-        other_limit = other.limits[other_index]
-        self_bounds = self.limits[self_index].bounds
-        other_bounds = other.limits[other_index].bounds
-
-        # continue recursion
-        if self_bounds == other_bounds:
-            # same lower bounds -> keep both current lower segments as they are
-            self._unify(other, left_neutral_predicate_generator, right_neutral_predicate_generator, self_index + 1,
-                        other_index + 1, octagon)
-        elif self_bounds & other_bounds:  # at least one bound in common
-            if self_bounds > other_bounds:
-                handle_subset_case(self, other, self_index, other_index, left_neutral_predicate_generator,
-                                   right_neutral_predicate_generator)
-            elif self_bounds < other_bounds:
-                # this call switches the roles of self and other, potentially continues recursion with switched roles
-                # Note: we switch receiver/self
-                handle_subset_case(other, self, other_index, self_index, right_neutral_predicate_generator,
-                                   left_neutral_predicate_generator)
-            else:  # incomparable (remember that set inclusion is no total order!)
-                handle_incomparable_case(self, other, self_index, other_index)
-        else:  # no bound in common
-            # we know that we are not at the lower limit of the segmentations (since this have a common bound always)
-
-            # check if b1 and b2 are orderable, either by octagonal comparision or syntactical check
-            # NOTE: the syntactical check is necessary because octagon does NOT know that list__len >= every bound
-            self_le = self_limit.le_octagonal(other_limit, octagon) or other_index == len(other)
-            other_le = other_limit.le_octagonal(self_limit, octagon) or self_index == len(self)
-            if self_le and other_le:
-                # they are even equal -> merge to one limit
-                self_limit.bounds |= deepcopy(other_limit.bounds)
-                other_limit.bounds |= deepcopy(self_limit.bounds)
-            elif self_le:
-                other.add_limit(other_index - 1, deepcopy(self_limit),
-                                possibly_empty_before=self.possibly_empty[self_index - 1],
-                                possibly_empty_after=self.possibly_empty[self_index])
-            elif other_le:
-                self.add_limit(self_index - 1, deepcopy(other_limit),
-                               possibly_empty_before=other.possibly_empty[other_index - 1],
-                               possibly_empty_after=other.possibly_empty[other_index])
-            else:
-                # merge consecutive segments in both segmentations
-                # (removing both limits b1 and b2 with no bound in common and not orderable)
-                if self_index != len(self):
-                    self.remove_limit(self_index)
-                if other_index != len(other):
-                    other.remove_limit(other_index)
-                self_index -= 1
-                other_index -= 1
-            self._unify(other, left_neutral_predicate_generator,
-                        right_neutral_predicate_generator, self_index, other_index, octagon)
+                seg1.insert_after(b1_appearing_later_in_seg2)
+
+        while True:
+            left_bounds = left.limit.bounds
+            right_bounds = right.limit.bounds
+            if left.at_upper_limit and right.at_upper_limit:
+                assert left.limit.eq_octagonal(right.limit, comparator), "The upper limits should be equal for " \
+                                                                         "unification. "
+                # make syntactically equivalent too
+                left.limit.bounds = left_bounds & right_bounds
+                limits.append(left.limit)
+                left.advance()
+                right.advance()
+                break
+            elif left.at_upper_limit:
+                insert_before(left, right)
+            elif right.at_upper_limit:
+                insert_before(right, left)
+            elif left_bounds == right_bounds:
+                # same bounds -> keep both current segments as they are
+                limits.append(left.limit)
+                left.advance()
+                right.advance()
+            elif left_bounds & right_bounds:  # at least one bound in common
+                if left_bounds > right_bounds:
+                    handle_subset_case(left, right)
+                elif left_bounds < right_bounds:
+                    handle_subset_case(right, left)
+                else:  # incomparable (remember that set inclusion is no total order!)
+                    handle_incomparable_case(left, right)
+            else:  # no bound in common
+                # we know that we are not at the lower limit of the segmentations (since this have a common bound
+                # always) nor at the upper limit of any segmentation
+                left_le = left.limit.le_octagonal(right.limit, comparator)
+                right_le = right.limit.le_octagonal(left.limit, comparator)
+                if left_le and right_le:
+                    # they are even equal -> merge to one limit
+                    left.limit.bounds = left_bounds | right_bounds
+                    right.limit.bounds = left_bounds | right_bounds
+                elif left_le:
+                    insert_before(right, left)
+                elif right_le:
+                    insert_before(left, right)
+                else:
+                    # merge consecutive segments in both segmentations
+                    # (removing both limits b1 and b2 with no bound in common and not orderable)
+                    left.remove()
+                    right.remove()
+
+        return limits, left.predicates, left.possibly_empty, right.predicates, right.possibly_empty
+
+
+class _UnificationCursor:
+    """Walks the limits of a segmentation (from the lower to the upper limit) during unification.
+    
+    The limits, predicates and possibly empty flags of the segmentation are only read, the segments of the unified 
+    segmentation are collected in fresh lists.
+    """
+
+    def __init__(self, limits: List[Limit], predicates, possibly_empty, neutral_predicate_generator):
+        self._limits = limits
+        self._predicates = predicates
+        self._possibly_empty = possibly_empty
+        self._neutral_predicate_generator = neutral_predicate_generator
+        self._next = 1  # index of the next limit to read
+        self._inserted = []  # stack of limits inserted after the current limit (top is the next limit)
+        # number of occurrences of bounds after the current limit
+        self._later = Counter(b for limit in limits[1:] for b in limit.bounds)
+
+        self.limit = Limit(set(limits[0].bounds))
+        self.predicate_before = None  # predicate of the segment before the current limit
+        self.possibly_empty_before = None  # possibly empty flag of the segment before the current limit
+
+        self.predicates = []
+        self.possibly_empty = []
+
+    @property
+    def at_upper_limit(self):
+        return not self._inserted and self._next == len(self._limits)
+
+    @property
+    def possibly_empty_after(self):
+        """Possibly empty flag of the segment after the current limit."""
+        if self._inserted:
+            return self._inserted[-1][2]
+        return self._possibly_empty[self._next - 1]
+
+    def later_bounds(self, bounds: set):
+        """The bounds (among ``bounds``) appearing in any limit after the current limit."""
+        return {b for b in bounds if self._later[b] > 0}
+
+    def _read_next(self):
+        if self._inserted:
+            self.limit, self.predicate_before, self.possibly_empty_before = self._inserted.pop()
+        else:
+            self.limit = Limit(set(self._limits[self._next].bounds))
+            self.predicate_before = self._predicates[self._next - 1]
+            self.possibly_empty_before = self._possibly_empty[self._next - 1]
+            self._next += 1
+        self._later.subtract(self.limit.bounds)
+
+    def advance(self):
+        """Keep the current limit (and the segment before it) and move to the next limit."""
+        if self.predicate_before is not None:
+            self.predicates.append(self.predicate_before)
+            self.possibly_empty.append(self.possibly_empty_before)
+        if not self.at_upper_limit:
+            self._read_next()
+
+    def remove(self):
+        """Remove the current limit (unless it is the upper limit) and join the neighboring segments."""
+        if not self.at_upper_limit:
+            predicate, possibly_empty = self.predicate_before, self.possibly_empty_before
+            self._read_next()
+            self.predicate_before = deepcopy(predicate).join(self.predicate_before)
+            self.possibly_empty_before = possibly_empty and self.possibly_empty_before
+
+    def split(self, possibly_empty_before, possibly_empty_after):
+        """Keep a limit before the current limit, splitting the segment before the current limit."""
+        self.predicates.append(self.predicate_before)
+        self.possibly_empty.append(possibly_empty_before)
+        self.predicate_before = deepcopy(self.predicate_before)
+        self.possibly_empty_before = possibly_empty_after
+
+    def insert_after(self, bounds: set):
+        """Insert a limit after the current limit, separated by a possibly empty segment with neutral predicate."""
+        self._inserted.append((Limit(set(bounds)), self._neutral_predicate_generator(), True))
+        self._later.update(bounds)
 
 
 class SegmentedList(SegmentedListLattice):
@@ -669,11 +691,37 @@ class SegmentedList(SegmentedListLattice):
         super().__init__(len_var, predicate_lattice, octagon=OctagonDomain(variables).top())
         self._variables = variables
         self._octagon_analysis_result = octagon_analysis_result
+        # location of the octagon in the octagon analysis result (None for the initial octagon)
+        self._location = None
+        self._joined_comparators = dict()
+
+    def __deepcopy__(self, memo):
+        memo = memo if memo is not None else {}
+
+        result = type(self).__new__(type(self))
+        memo[id(self)] = result
+        for k, v in self.__dict__.items():
+            if k in ("_octagon_analysis_result", "_octagon", "_comparator", "_joined_comparators"):
+                # the analysis result and the octagons retrieved from it are never modified, hence shared
+                setattr(result, k, v)
+            else:
+                # noinspection PyArgumentList
+                setattr(result, k, deepcopy(v, memo))
+        return result
 
     @property
     def variables(self):
         return self._variables
 
+    def _joined_comparator(self, other: 'SegmentedList') -> BoundComparator:
+        if self.octagon is other.octagon or self._location is None or other._location is None:
+            return super()._joined_comparator(other)
+        # reuse the joins of the octagon analysis result (cached by the locations of both octagons)
+        if other._location not in self._joined_comparators:
+            octagon = self.octagon_analysis_result.join_results(self._location, other._location)
+            self._joined_comparators[other._location] = BoundComparator(octagon)
+        return self._joined_comparators[other._location]
+
     @property
     def octagon_analysis_result(self):
         return self._octagon_analysis_result
@@ -683,8 +731,10 @@ class SegmentedList(SegmentedListLattice):
             if left.typ == int:
                 try:
                     form = VarFormOct.from_expression(right)
-                    for bound in self.all_bounds():
-                        bound.substitute_variable(left, form)
+                    # NOTE bounds may be shared with other segmentations, hence substitute in fresh copies
+                    for limit in self.limits:
+                        limit.bounds = {deepcopy(b).substitute_variable(left, form) if b.var and b.var == left else b
+                                        for b in limit.bounds}
                     self.merge_equal_limits()
                 except InvalidFormError:
                     # right is not in single variable linear form, use fallback: evaluate right side of
@@ -710,4 +760,7 @@ class SegmentedList(SegmentedListLattice):
         return self
 
     def next(self, pp: ProgramPoint, edge_kind: Edge.Kind = None):
+        if (pp, edge_kind) != self._location:
+            self._location = (pp, edge_kind)
+            self._joined_comparators = dict()
         self.octagon = self.octagon_analysis_result.get_result_after(pp, edge_kind)
@@ -23,6 +23,9 @@ class Stack(BoundedLattice, metaclass=ABCMeta):
     .. warning::
         Lattice operations modify the current stack.
 
+    Copies of a stack share their elements until they are modified (copy-on-write):
+    elements that may be modified must be retrieved with ``frame()``.
+
     .. document private methods
     .. automethod:: Stack._less_equal
     .. automethod:: Stack._meet
@@ -35,15 +38,42 @@ class Stack(BoundedLattice, metaclass=ABCMeta):
         """
         super().__init__()
         self._stack = [initial_element]
+        self._owned = [True]    # whether each element is owned by this stack (or shared with copies of the stack)
+
+    def __deepcopy__(self, memo):
+        # the elements are shared with the copy, they are copied by the first stack modifying them
+        result = type(self).__new__(type(self))
+        memo[id(self)] = result
+        for name, value in self.__dict__.items():
+            if name not in ('_stack', '_owned'):
+                result.__dict__[name] = deepcopy(value, memo)
+        result._stack = list(self._stack)
+        result._owned = [False] * len(self._stack)
+        self._owned[:] = result._owned  # in place, the list might be shared with a replaced stack
+        return result
 
     @property
     def stack(self):
-        """Current stack of lattice elements."""
+        """Current stack of lattice elements (not to be modified, cf. ``frame()``)."""
         return self._stack
 
+    def frame(self, index: int = -1) -> Lattice:
+        """Retrieve a stack element to be modified, copying it first if it is shared with a copy of the stack.
+
+        :param index: index of the stack element, by default the top of the stack
+        :return: stack element owned by this stack
+        """
+        if not self._owned[index]:
+            self._stack[index] = deepcopy(self._stack[index])
+            self._owned[index] = True
+        return self._stack[index]
+
     def __repr__(self):
         return " | ".join(map(repr, self.stack))
 
+    def _key(self):
+        return tuple(self.stack)
+
     @abstractmethod
     def push(self):
         """Push an element on the current stack."""
@@ -64,8 +94,8 @@ class Stack(BoundedLattice, metaclass=ABCMeta):
         """The meet is performed point-wise for each stack element."""
         if len(self.stack) != len(other.stack):
             raise Exception("Stacks must be equally long")
-        for i, item in enumerate(self.stack):
-            item.meet(other.stack[i])
+        for i in range(len(self.stack)):
+            self.frame(i).meet(other.stack[i])
         return self
 
     @copy_docstring(BoundedLattice._join)
@@ -73,8 +103,8 @@ class Stack(BoundedLattice, metaclass=ABCMeta):
         """The join is performed point-wise for each stack element."""
         if len(self.stack) != len(other.stack):
             raise Exception("Stacks must be equally long")
-        for i, item in enumerate(self.stack):
-            item.join(other.stack[i])
+        for i in range(len(self.stack)):
+            self.frame(i).join(other.stack[i])
         return self
 
     @copy_docstring(BoundedLattice._widening)
@@ -82,8 +112,8 @@ class Stack(BoundedLattice, metaclass=ABCMeta):
         """The widening is performed point-wise for each stack element."""
         if len(self.stack) != len(other.stack):
             raise Exception("Stacks must be equally long")
-        for i, item in enumerate(self.stack):
-            item.widening(other.stack[i])
+        for i in range(len(self.stack)):
+            self.frame(i).widening(other.stack[i])
         return self
 
 
@@ -104,27 +134,33 @@ class ScopeStack(Stack, State):
         :param initial_element: initial element
         """
         super().__init__(initial_element)
-        self._postponed_pushpop = []  # postponed stack pushs/pops that are later executed in ``_assume()``
+        self._postponed_pops = 0  # number of postponed stack pops that are later executed in ``_assume()``
 
     def __repr__(self):
         # change default stack representation to only show top level frame
         return ("... | " if len(self.stack) > 1 else "") + repr(self.stack[-1])
 
+    def _key(self):
+        # consistent with the representation, only the top level frame is compared
+        return len(self.stack) > 1, self.stack[-1]
+
     def push(self):
         if self.is_bottom():
             return self
-        self.stack.append(deepcopy(self.stack[-1]).descend())
+        self._stack.append(deepcopy(self.stack[-1]).descend())
+        self._owned.append(True)
         return self
 
     def pop(self):
         if self.is_bottom():
             return self
-        popped = self.stack.pop()
-        self.stack[-1].combine(popped)
+        popped = self._stack.pop()
+        self._owned.pop()
+        self.frame().combine(popped)
         return self
 
     def _access_variable(self, variable: VariableIdentifier) -> Set[Expression]:
-        self.stack[-1].access_variable(variable)
+        self.frame().access_variable(variable)
         return {variable}
 
     def _assign_variable(self, left: Expression, right: Expression) -> 'ScopeStack':
@@ -133,19 +169,19 @@ class ScopeStack(Stack, State):
     def _assume(self, condition: Expression) -> 'ScopeStack':
         # only update used variable in conditional edge via assume call to store
         # if we are on a loop/if exit edge!!
-        if self._postponed_pushpop:
-            self.stack[-1].assume({condition})
+        if self._postponed_pops:
+            self.frame().assume({condition})
 
         # make good for postponed push/pop, since that was postponed until assume has been applied to top frame
         # (the engine implements a different order of calls to exit_if/exit_loop and assume than we want)
-        for pushpop in self._postponed_pushpop:
-            pushpop()
-        self._postponed_pushpop.clear()
+        for _ in range(self._postponed_pops):
+            self._postponed_exit_if()
+        self._postponed_pops = 0
 
         return self
 
     def _evaluate_literal(self, literal: Expression) -> Set[Expression]:
-        self.stack[-1].evaluate_literal(literal)
+        self.frame().evaluate_literal(literal)
         return {literal}
 
     def _postponed_exit_if(self):
@@ -167,21 +203,21 @@ class ScopeStack(Stack, State):
         return self
 
     def exit_if(self):
-        self._postponed_pushpop.append(self._postponed_exit_if)
+        self._postponed_pops += 1
         return self
 
     def _output(self, output: Expression) -> 'ScopeStack':
         if self.is_bottom():
             return self
-        self.stack[-1].output({output})
+        self.frame().output({output})
         return self
 
     def _substitute_variable(self, left: Expression, right: Expression) -> 'ScopeStack':
         if isinstance(left, (VariableIdentifier, Index)):
-            self.stack[-1].substitute_variable({left}, {right})
+            self.frame().substitute_variable({left}, {right})
         else:
             raise NotImplementedError("Variable substitution for {} is not implemented!".format(left))
         return self
 
     def next(self, pp: ProgramPoint, edge_kind: Edge.Kind = None):
-        self.stack[-1].next(pp, edge_kind)
+        self.frame().next(pp, edge_kind)
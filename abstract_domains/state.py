@@ -76,7 +76,11 @@ class State(Lattice, metaclass=ABCMeta):
         :return: current state modified by the variable assignment
 
         """
-        self.big_join([deepcopy(self)._assign_variable(lhs, rhs) for lhs in left for rhs in right])
+        if len(left) == 1 and len(right) == 1:  # single transfer, in place
+            (lhs,), (rhs,) = left, right
+            self._assign_variable(lhs, rhs)
+        else:
+            self.big_join([deepcopy(self)._assign_variable(lhs, rhs) for lhs in left for rhs in right])
         self.result = set()  # assignments have no result, only side-effects
         return self
 
@@ -96,7 +100,11 @@ class State(Lattice, metaclass=ABCMeta):
         :return: current state modified to satisfy the assumption
 
         """
-        self.big_join([deepcopy(self)._assume(expr) for expr in condition])
+        if len(condition) == 1:  # single transfer, in place
+            (expr,) = condition
+            self._assume(expr)
+        else:
+            self.big_join([deepcopy(self)._assume(expr) for expr in condition])
         return self
 
     @abstractmethod
@@ -176,7 +184,11 @@ class State(Lattice, metaclass=ABCMeta):
         :return: current state modified by the output
 
         """
-        self.big_join([deepcopy(self)._output(expr) for expr in output])
+        if len(output) == 1:  # single transfer, in place
+            (expr,) = output
+            self._output(expr)
+        else:
+            self.big_join([deepcopy(self)._output(expr) for expr in output])
         self.result = set()  # outputs have no result, only side-effects
         return self
 
@@ -198,7 +210,12 @@ class State(Lattice, metaclass=ABCMeta):
         :return: current state modified by the variable substitution
 
         """
-        self.big_join([deepcopy(self)._substitute_variable(lhs, rhs, *args, **kwargs) for lhs in left for rhs in right])
+        if len(left) == 1 and len(right) == 1:  # single transfer, in place
+            (lhs,), (rhs,) = left, right
+            self._substitute_variable(lhs, rhs, *args, **kwargs)
+        else:
+            self.big_join([deepcopy(self)._substitute_variable(lhs, rhs, *args, **kwargs)
+                           for lhs in left for rhs in right])
         self.result = set()  # assignments have no result, only side-effects
         return self
 
@@ -6,7 +6,8 @@ Lifting of a lattice to a set of program variables.
 """
 
 
-from typing import List, Type, Dict, Callable
+from copy import deepcopy
+from typing import List, Type, Dict, Callable, Sequence, Hashable
 
 from abstract_domains.lattice import Lattice
 from core.expressions import VariableIdentifier
@@ -52,6 +53,9 @@ class Store(Lattice):
     def __repr__(self):
         return ", ".join("{}→{}".format(variable, value) for variable, value in self.store.items())
 
+    def _key(self):
+        return tuple(self.store.items())
+
     @copy_docstring(Lattice.bottom)
     def bottom(self) -> 'Store':
         for var in self.store:
@@ -98,3 +102,245 @@ class Store(Lattice):
         for var in self.store:
             self.store[var].widening(other.store[var])
         return self
+
+
+class FiniteLattice:
+    """Tabulation of a finite lattice whose elements are encoded by small integers.
+
+    Each lattice element is encoded by its index in the given sequence of elements. Unary and binary operations are
+    tabulated once into translation tables over these codes, so that they can be applied to a whole array of codes at
+    once (cf. ``PackedStore``). The tables are computed using the lattice operations of the lattice elements.
+    """
+    def __init__(self, elements: Sequence[Hashable], lattice: Callable[[Hashable], Lattice],
+                 element: Callable[[Lattice], Hashable]):
+        """Tabulate the lattice operations of a finite lattice.
+
+        :param elements: elements of the finite lattice (at most 16)
+        :param lattice: function creating the lattice element corresponding to an element
+        :param element: function retrieving the element corresponding to a lattice element
+        """
+        if len(elements) > 16:
+            raise ValueError("Finite lattices with more than 16 elements cannot be tabulated!")
+        self._elements = tuple(elements)
+        self._lattice = lattice
+        self._element = element
+        self._codes = {e: code for code, e in enumerate(self._elements)}
+        self._symbols = tuple(repr(lattice(e)) for e in self._elements)
+        self._bottom = self.code(element(lattice(self._elements[0]).bottom()))
+        self._top = self.code(element(lattice(self._elements[0]).top()))
+        self._less_equal = self.binary(lambda x, y: x.less_equal(y), encode=False)
+        self._join = self.binary(lambda x, y: x.join(y))
+        self._meet = self.binary(lambda x, y: x.meet(y))
+        self._widening = self.binary(lambda x, y: x.widening(y))
+
+    @property
+    def size(self):
+        """Number of elements of the lattice."""
+        return len(self._elements)
+
+    @property
+    def symbols(self):
+        """String representation of each element (indexed by code)."""
+        return self._symbols
+
+    @property
+    def bottom(self):
+        """Code of the bottom element."""
+        return self._bottom
+
+    @property
+    def top(self):
+        """Code of the top element."""
+        return self._top
+
+    @property
+    def less_equal(self):
+        """Table of the partial order (``1`` if the first element is less than or equal to the second)."""
+        return self._less_equal
+
+    @property
+    def join(self):
+        """Table of the least upper bound."""
+        return self._join
+
+    @property
+    def meet(self):
+        """Table of the greatest lower bound."""
+        return self._meet
+
+    @property
+    def widening(self):
+        """Table of the widening."""
+        return self._widening
+
+    def code(self, element: Hashable) -> int:
+        """Code of an element."""
+        return self._codes[element]
+
+    def element(self, code: int) -> Hashable:
+        """Element of a code."""
+        return self._elements[code]
+
+    def unary(self, operation: Callable[[Lattice], Lattice]) -> bytes:
+        """Tabulate a unary operation.
+
+        :param operation: operation on lattice elements (possibly modifying its argument)
+        :return: translation table mapping the code of each element to the code of the result of the operation
+        """
+        table = bytearray(256)
+        for code, e in enumerate(self._elements):
+            table[code] = self.code(self._element(operation(self._lattice(e))))
+        return bytes(table)
+
+    def binary(self, operation: Callable[[Lattice, Lattice], Lattice], encode: bool = True) -> bytes:
+        """Tabulate a binary operation.
+
+        :param operation: operation on lattice elements (possibly modifying its arguments)
+        :param encode: whether the result of the operation is a lattice element (or a truth value otherwise)
+        :return: translation table mapping ``code1 * size + code2`` to the code of the result of the operation
+        """
+        table = bytearray(256)
+        for code1, e1 in enumerate(self._elements):
+            for code2, e2 in enumerate(self._elements):
+                result = operation(self._lattice(e1), self._lattice(e2))
+                table[code1 * self.size + code2] = self.code(self._element(result)) if encode else int(result)
+        return bytes(table)
+
+    def apply(self, table: bytes, codes: bytearray) -> bytearray:
+        """Apply a tabulated unary operation to an array of codes.
+
+        :param table: tabulated unary operation
+        :param codes: array of codes
+        :return: array of the codes of the results
+        """
+        return codes.translate(table)
+
+    def apply2(self, table: bytes, codes1: bytearray, codes2: bytearray) -> bytearray:
+        """Apply a tabulated binary operation point-wise to two arrays of codes.
+
+        The two arrays are combined into an array of ``code1 * size + code2`` by integer arithmetic (which cannot
+        carry from one byte to the next for lattices of at most 16 elements) before being translated.
+
+        :param table: tabulated binary operation
+        :param codes1: array of the codes of the first arguments
+        :param codes2: array of the codes of the second arguments
+        :return: array of the codes of the results
+        """
+        pairs = int.from_bytes(codes1, 'little') * self.size + int.from_bytes(codes2, 'little')
+        return bytearray(pairs.to_bytes(len(codes1), 'little').translate(table))
+
+
+class PackedStore(Lattice):
+    """Mutable element of a store ``Var -> L`` for a finite lattice ``L``, packed into an array of codes.
+
+    Lattice operations are performed on the whole array at once, using the tabulated operations of the lattice.
+
+    .. warning::
+        Lattice operations modify the current store.
+
+    .. document private methods
+    .. automethod:: PackedStore._less_equal
+    .. automethod:: PackedStore._meet
+    .. automethod:: PackedStore._join
+    """
+    def __init__(self, variables: List[VariableIdentifier], lattice: FiniteLattice):
+        """Create a mapping Var -> L from each variable in Var to the bottom element of L.
+
+        :param variables: list of program variables
+        :param lattice: tabulated finite lattice
+        """
+        super().__init__()
+        self._variables = variables
+        self._lattice = lattice
+        self._index = {var: i for i, var in enumerate(variables)}
+        self._codes = bytearray([lattice.bottom]) * len(variables)
+
+    _shared = ('_variables', '_lattice', '_index')    # attributes shared between all copies
+
+    def __deepcopy__(self, memo):
+        # the variables and the lattice tables are shared between all copies
+        result = type(self).__new__(type(self))
+        memo[id(self)] = result
+        for name, value in self.__dict__.items():
+            result.__dict__[name] = value if name in self._shared else deepcopy(value, memo)
+        return result
+
+    @property
+    def variables(self):
+        """Variables of the current store."""
+        return self._variables
+
+    @property
+    def lattice(self):
+        return self._lattice
+
+    @property
+    def codes(self):
+        """Current array of the codes of the lattice elements of the variables."""
+        return self._codes
+
+    @codes.setter
+    def codes(self, codes: bytearray):
+        self._codes = codes
+
+    def __contains__(self, variable: VariableIdentifier):
+        return variable in self._index
+
+    def __getitem__(self, variable: VariableIdentifier):
+        return self.lattice.element(self.codes[self._index[variable]])
+
+    def __setitem__(self, variable: VariableIdentifier, element):
+        self.codes[self._index[variable]] = self.lattice.code(element)
+
+    def items(self):
+        """Pairs of each variable and its lattice element."""
+        return [(var, self.lattice.element(code)) for var, code in zip(self.variables, self.codes)]
+
+    def __repr__(self):
+        symbols = self.lattice.symbols
+        return ", ".join("{}→{}".format(variable, symbols[code]) for variable, code in zip(self.variables, self.codes))
+
+    def _key(self):
+        return tuple(self.variables), bytes(self.codes)
+
+    @copy_docstring(Lattice.bottom)
+    def bottom(self) -> 'PackedStore':
+        self.codes = bytearray([self.lattice.bottom]) * len(self.variables)
+        return self
+
+    @copy_docstring(Lattice.top)
+    def top(self) -> 'PackedStore':
+        self.codes = bytearray([self.lattice.top]) * len(self.variables)
+        return self
+
+    @copy_docstring(Lattice.is_bottom)
+    def is_bottom(self) -> bool:
+        """The current store is bottom if `any` of its variables map to a bottom element."""
+        return self.lattice.bottom in self.codes
+
+    @copy_docstring(Lattice.is_top)
+    def is_top(self) -> bool:
+        """The current store is top if `all` of its variables map to a top element."""
+        return self.codes.count(self.lattice.top) == len(self.codes)
+
+    @copy_docstring(Lattice._less_equal)
+    def _less_equal(self, other: 'PackedStore') -> bool:
+        """The comparison is performed point-wise for each variable."""
+        return 0 not in self.lattice.apply2(self.lattice.less_equal, self.codes, other.codes)
+
+    @copy_docstring(Lattice._meet)
+    def _meet(self, other: 'PackedStore'):
+        """The meet is performed point-wise for each variable."""
+        self.codes = self.lattice.apply2(self.lattice.meet, self.codes, other.codes)
+        return self
+
+    @copy_docstring(Lattice._join)
+    def _join(self, other: 'PackedStore') -> 'PackedStore':
+        """The join is performed point-wise for each variable."""
+        self.codes = self.lattice.apply2(self.lattice.join, self.codes, other.codes)
+        return self
+
+    @copy_docstring(Lattice._widening)
+    def _widening(self, other: 'PackedStore'):
+        self.codes = self.lattice.apply2(self.lattice.widening, self.codes, other.codes)
+        return self
@@ -0,0 +1,158 @@
+from typing import Dict, Tuple, List, Iterator
+
+
+class BDD:
+    """Manager of reduced ordered binary decision diagrams over a fixed number of variables.
+
+    Nodes are represented by integers: ``FALSE`` and ``TRUE`` are the terminal nodes, every other node is a triple
+    ``(level, low, high)`` stored (exactly once) in the unique table. Variables are identified by their level, i.e. their
+    position in the variable ordering. All operations are built on the if-then-else operation and are cached.
+    """
+    FALSE = 0
+    TRUE = 1
+
+    def __init__(self, size: int):
+        """Create a manager for decision diagrams over ``size`` variables.
+
+        :param size: number of variables
+        """
+        self._size = size
+        self._nodes = [(size, None, None), (size, None, None)]  # terminals are below all variables
+        self._unique = dict()  # type: Dict[Tuple[int, int, int], int]
+        self._ite_cache = dict()  # type: Dict[Tuple[int, int, int], int]
+        self._restrict_cache = dict()  # type: Dict[Tuple[int, int, bool], int]
+        self._count_cache = dict()  # type: Dict[int, int]
+
+    @property
+    def size(self):
+        return self._size
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def level(self, u: int) -> int:
+        return self._nodes[u][0]
+
+    def low(self, u: int) -> int:
+        return self._nodes[u][1]
+
+    def high(self, u: int) -> int:
+        return self._nodes[u][2]
+
+    def node(self, level: int, low: int, high: int) -> int:
+        """Get the (unique) node testing the variable at ``level`` with the given children."""
+        if low == high:
+            return low
+        key = (level, low, high)
+        u = self._unique.get(key)
+        if u is None:
+            u = len(self._nodes)
+            self._nodes.append(key)
+            self._unique[key] = u
+        return u
+
+    def var(self, level: int) -> int:
+        """Decision diagram that is true iff the variable at ``level`` is true."""
+        return self.node(level, BDD.FALSE, BDD.TRUE)
+
+    def ite(self, f: int, g: int, h: int) -> int:
+        """If-then-else: decision diagram of ``(f and g) or (not f and h)``."""
+        if f == BDD.TRUE:
+            return g
+        if f == BDD.FALSE:
+            return h
+        if g == h:
+            return g
+        if g == BDD.TRUE and h == BDD.FALSE:
+            return f
+        key = (f, g, h)
+        result = self._ite_cache.get(key)
+        if result is None:
+            level = min(self.level(f), self.level(g), self.level(h))
+            f0, f1 = self._cofactors(f, level)
+            g0, g1 = self._cofactors(g, level)
+            h0, h1 = self._cofactors(h, level)
+            result = self.node(level, self.ite(f0, g0, h0), self.ite(f1, g1, h1))
+            self._ite_cache[key] = result
+        return result
+
+    def _cofactors(self, u: int, level: int) -> Tuple[int, int]:
+        if self.level(u) == level:
+            return self.low(u), self.high(u)
+        return u, u
+
+    def neg(self, f: int) -> int:
+        return self.ite(f, BDD.FALSE, BDD.TRUE)
+
+    def conj(self, f: int, g: int) -> int:
+        return self.ite(f, g, BDD.FALSE)
+
+    def disj(self, f: int, g: int) -> int:
+        return self.ite(f, BDD.TRUE, g)
+
+    def implies(self, f: int, g: int) -> bool:
+        """Check whether every model of ``f`` is a model of ``g``."""
+        return self.ite(f, g, BDD.TRUE) == BDD.TRUE
+
+    def restrict(self, f: int, level: int, value: bool) -> int:
+        """Decision diagram of ``f`` with the variable at ``level`` fixed to ``value``."""
+        if self.level(f) > level:
+            return f
+        key = (f, level, value)
+        result = self._restrict_cache.get(key)
+        if result is None:
+            if self.level(f) == level:
+                result = self.high(f) if value else self.low(f)
+            else:
+                result = self.node(self.level(f), self.restrict(self.low(f), level, value),
+                                   self.restrict(self.high(f), level, value))
+            self._restrict_cache[key] = result
+        return result
+
+    def exists(self, f: int, level: int) -> int:
+        """Existential quantification of the variable at ``level``."""
+        return self.disj(self.restrict(f, level, False), self.restrict(f, level, True))
+
+    def compose(self, f: int, level: int, g: int) -> int:
+        """Substitute the variable at ``level`` by the decision diagram ``g`` in ``f``."""
+        return self.ite(g, self.restrict(f, level, True), self.restrict(f, level, False))
+
+    def count(self, f: int) -> int:
+        """Number of models of ``f`` (over all variables of this manager)."""
+        return self._count(f) << self.level(f)
+
+    def _count(self, u: int) -> int:
+        """Number of models of ``u`` over the variables from the level of ``u`` onwards."""
+        if u == BDD.FALSE:
+            return 0
+        if u == BDD.TRUE:
+            return 1
+        result = self._count_cache.get(u)
+        if result is None:
+            level = self.level(u)
+            low, high = self.low(u), self.high(u)
+            result = (self._count(low) << (self.level(low) - level - 1)) + \
+                     (self._count(high) << (self.level(high) - level - 1))
+            self._count_cache[u] = result
+        return result
+
+    def models(self, f: int) -> Iterator[List[bool]]:
+        """Generate all models of ``f`` as lists of truth values (indexed by level)."""
+        if f == BDD.FALSE:
+            return
+        values = [False] * self.size
+
+        def assign(u: int, level: int):
+            if level == self.size:
+                yield list(values)
+                return
+            for value in (True, False):
+                values[level] = value
+                if self.level(u) == level:
+                    child = self.high(u) if value else self.low(u)
+                    if child != BDD.FALSE:
+                        yield from assign(child, level + 1)
+                else:
+                    yield from assign(u, level + 1)
+
+        yield from assign(f, 0)
@@ -1,14 +1,137 @@
 from typing import List, Set, Tuple, FrozenSet
-from itertools import chain, combinations, product
+from itertools import product
 from copy import deepcopy
 
-from abstract_domains.lattice import BoundedLattice
+from abstract_domains.lattice import BoundedLattice, CachedHashMixin
 from abstract_domains.state import State
+from abstract_domains.traces.bdd import BDD
 from core.expressions import Expression, VariableIdentifier, UnaryBooleanOperation, Literal, BinaryBooleanOperation, \
     Input
 
 
-class BoolTracesState(BoundedLattice, State):
+# Hyper Trace Sets
+# With ``hyper=True``, a traces state represents the set of sets of traces that the analysis obtains starting from every
+# subset of the initial traces. Instead of enumerating all these subsets, the set of sets is represented by an antichain
+# of its maximal elements. Each element is a pair ``(keys, relation)``: ``keys`` is a set of initial traces, and
+# ``relation`` relates each of them to the traces it leads to. The element stands for all the sets of traces that the
+# subsets of ``keys`` lead to (i.e., the images of the subsets of ``keys`` through ``relation``).
+
+
+def maximal(elements) -> FrozenSet[Tuple[FrozenSet, FrozenSet]]:
+    """Reduce a collection of hyper trace set elements to an antichain of its maximal elements.
+
+    :param elements: collection of pairs of a set of initial traces and a relation to the corresponding traces
+    :return: antichain of the maximal elements
+    """
+    result = []
+    for keys, relation in sorted(set(elements), key=lambda e: (len(e[0]), len(e[1])), reverse=True):
+        if not any(keys.issubset(k) and relation.issubset(r) for k, r in result):
+            result.append((keys, relation))
+    return frozenset(result)
+
+
+def image(relation: FrozenSet) -> FrozenSet:
+    """Set of traces related to some initial trace.
+
+    :param relation: relation between initial traces and traces
+    :return: image of the relation
+    """
+    return frozenset(trace for _, trace in relation)
+
+
+def restrict(relation: FrozenSet, keys: FrozenSet) -> FrozenSet:
+    """Restriction of a relation to a set of initial traces.
+
+    :param relation: relation between initial traces and traces
+    :param keys: set of initial traces
+    :return: restricted relation
+    """
+    return frozenset((key, trace) for key, trace in relation if key in keys)
+
+
+def map_sets(elements, transform) -> FrozenSet[Tuple[FrozenSet, FrozenSet]]:
+    """Apply a transformer of sets of traces to every element of an antichain.
+
+    The transformer must work trace by trace; it is applied once to every distinct trace.
+
+    :param elements: antichain of pairs of a set of initial traces and a relation to the corresponding traces
+    :param transform: transformer of sets of traces
+    :return: antichain of the transformed elements
+    """
+    images = dict()
+    for _, relation in elements:
+        for trace in image(relation):
+            if trace not in images:
+                images[trace] = transform(frozenset({trace}))
+    return maximal(
+        (keys, frozenset((key, t) for key, trace in relation for t in images[trace])) for keys, relation in elements
+    )
+
+
+def join_sets(elements1, elements2) -> FrozenSet[Tuple[FrozenSet, FrozenSet]]:
+    """Join of two antichains: the sets of traces obtained from the same initial traces are merged.
+
+    :param elements1: antichain of pairs of a set of initial traces and a relation to the corresponding traces
+    :param elements2: antichain of pairs of a set of initial traces and a relation to the corresponding traces
+    :return: antichain of the joined elements
+    """
+    joined = list(elements1) + list(elements2)
+    for keys1, relation1 in elements1:
+        for keys2, relation2 in elements2:
+            keys = keys1.intersection(keys2)
+            joined.append((keys, restrict(relation1, keys).union(restrict(relation2, keys))))
+    return maximal(joined)
+
+
+def meet_sets(elements1, elements2) -> FrozenSet[Tuple[FrozenSet, FrozenSet]]:
+    """Meet of two antichains: the sets of traces obtained from the same initial traces are intersected.
+
+    :param elements1: antichain of pairs of a set of initial traces and a relation to the corresponding traces
+    :param elements2: antichain of pairs of a set of initial traces and a relation to the corresponding traces
+    :return: antichain of the met elements
+    """
+    return maximal(
+        (keys1.intersection(keys2), relation1.intersection(relation2))
+        for keys1, relation1 in elements1 for keys2, relation2 in elements2
+    )
+
+
+def less_equal_sets(elements1, elements2) -> bool:
+    """Inclusion between antichains: each element must be below some element of the other antichain.
+
+    :param elements1: antichain of pairs of a set of initial traces and a relation to the corresponding traces
+    :param elements2: antichain of pairs of a set of initial traces and a relation to the corresponding traces
+    :return: whether the first antichain is included in the second
+    """
+    return all(
+        any(keys1.issubset(keys2) and relation1.issubset(relation2) for keys2, relation2 in elements2)
+        for keys1, relation1 in elements1
+    )
+
+
+def split_unique(elements, evaluate, identifiers) -> FrozenSet[Tuple[FrozenSet, FrozenSet]]:
+    """Split every element of an antichain into its maximal parts in which each identifier has a unique value.
+
+    :param elements: antichain of pairs of a set of initial traces and a relation to the corresponding traces
+    :param evaluate: function evaluating an identifier in a trace
+    :param identifiers: identifiers that must have a unique value
+    :return: antichain of the maximal parts
+    """
+    result = []
+    for keys, relation in elements:
+        values = dict()  # value of the identifiers in each trace
+        for trace in image(relation):
+            values[trace] = tuple(evaluate(trace, identifier) for identifier in identifiers)
+        related = dict()  # values reached from each initial trace
+        for key, trace in relation:
+            related.setdefault(key, set()).add(values[trace])
+        for value in set(values.values()) or {None}:
+            part = frozenset(key for key in keys if related.get(key, set()).issubset({value}))
+            result.append((part, restrict(relation, part)))
+    return maximal(result)
+
+
+class BoolTracesState(CachedHashMixin, BoundedLattice, State):
     class BoolTrace:
         def __init__(self, values: Tuple):
             self._trace = [values]
@@ -23,11 +146,11 @@ class BoolTracesState(BoundedLattice, State):
 
         def __eq__(self, other: 'BoolTracesState.BoolTrace'):
             if isinstance(other, self.__class__):
-                return repr(self) == repr(other)
+                return self.trace == other.trace
             return False
 
         def __hash__(self):
-            return hash(repr(self))
+            return hash(tuple(self.trace))
 
         def __ne__(self, other: 'BoolTracesState.BoolTrace'):
             return not (self == other)
@@ -94,15 +217,8 @@ class BoolTracesState(BoundedLattice, State):
         self._traces = frozenset(BoolTracesState.BoolTrace(t) for t in product(*[('T', 'F') for _ in variables]))
         # e.g., {[('T', 'T')], [('T', 'F')], [('F', 'T')], [('F', 'F')]}
         self._hyper = hyper
-        t = len(self._traces)
-        sets = frozenset(
-            frozenset(t) for t in chain.from_iterable(combinations(self._traces, r) for r in range(t + 1))
-        )
-        self._sets = dict()
-        i = 1
-        for s in sets:
-            self._sets[i] = s
-            i = i + 1
+        # antichain of the maximal sets of traces (cf. Hyper Trace Sets)
+        self._sets = frozenset({(self._traces, frozenset((trace, trace) for trace in self._traces))})
         self._in = set()
 
     @property
@@ -152,7 +268,7 @@ class BoolTracesState(BoundedLattice, State):
             return ", ".join(str(x) for x in self.variables)
 
         if self.hyper:
-            sets = list(self.sets.values())
+            sets = [image(relation) for _, relation in self.sets]
             List.sort(sets, key=lambda x: len(x), reverse=True)
             s1 = frozenset()
             s2 = frozenset()
@@ -170,20 +286,21 @@ class BoolTracesState(BoundedLattice, State):
         else:
             return ", ".join(str(trace) for trace in self.traces)
 
+    def _key(self):
+        if self.hyper:
+            return self.kind, self.sets, frozenset(self._in)
+        return self.kind, self.traces
+
     def _less_equal(self, other: 'BoolTracesState') -> bool:
         if self.hyper:
-            subset = True
-            for key in self.sets:
-                subset = subset and self.sets[key].issubset(other.sets[key])
-            return subset
+            return less_equal_sets(self.sets, other.sets)
         else:
             return self.traces.issubset(other.traces)
 
     def _join(self, other: 'BoolTracesState') -> 'BoolTracesState':
         if self.hyper:
             self._in = self._in.union(other._in)
-            for key in self.sets:
-                self.sets[key] = self.sets[key].union(other.sets[key])
+            self.sets = join_sets(self.sets, other.sets)
         else:
             self.traces = self.traces.union(other.traces)
         return self
@@ -194,8 +311,7 @@ class BoolTracesState(BoundedLattice, State):
     def _meet(self, other: 'BoolTracesState'):
         if self.hyper:
             self._in = self._in.intersection(other._in)
-            for key in self.sets:
-                self.sets[key] = self.sets[key].intersection(other.sets[key])
+            self.sets = meet_sets(self.sets, other.sets)
         else:
             self.traces = self.traces.intersection(other.traces)
         return self
@@ -229,8 +345,7 @@ class BoolTracesState(BoundedLattice, State):
 
     def _assume(self, condition: Expression) -> 'BoolTracesState':
         if self.hyper:
-            for key in self.sets:
-                self.sets[key] = self._assume_aux(self.sets[key], condition)
+            self.sets = map_sets(self.sets, lambda traces: self._assume_aux(traces, condition))
         else:
             self.traces = self._assume_aux(self.traces, condition)
         return self
@@ -252,19 +367,18 @@ class BoolTracesState(BoundedLattice, State):
 
     def _output(self, output: Expression) -> 'BoolTracesState':
         if self.hyper:  # nothing to be done otherwise
-            for key in self.sets:  # for all sets of traces...
-                unique = True
-                for identifier in output.ids():  # for each output...
-                    unique = unique and self._variety(self.sets[key], identifier) == 1
-                if not unique:
-                    self.sets[key] = frozenset()
+            # keep the maximal sets of traces in which each output has a unique value
+            def evaluate(trace, identifier):
+                return trace.evaluate(self.variables, identifier)
+
+            self.sets = split_unique(self.sets, evaluate, list(output.ids()))
         return self
 
     def _substitute_variable_aux(self, traces: FrozenSet[BoolTrace], left, right) -> FrozenSet[BoolTrace]:
         if isinstance(left, VariableIdentifier):
             idx = self.variables.index(left)
             if isinstance(right, Input):
-                self._in.add(left)
+                self._in = self._in.union({left})
                 result = set()
                 for trace in traces:
                     result.add(deepcopy(trace))
@@ -286,8 +400,7 @@ class BoolTracesState(BoundedLattice, State):
 
     def _substitute_variable(self, left: Expression, right: Expression) -> 'BoolTracesState':
         if self.hyper:
-            for key in self.sets:
-                self.sets[key] = self._substitute_variable_aux(self.sets[key], left, right)
+            self.sets = map_sets(self.sets, lambda traces: self._substitute_variable_aux(traces, left, right))
         else:
             self.traces = self._substitute_variable_aux(self.traces, left, right)
         return self
@@ -299,89 +412,114 @@ class BoolTracesState(BoundedLattice, State):
         return len(values)
 
 
-class TvlTracesState(BoundedLattice, State):
-    class TvlTrace:
-        def __init__(self, values: Tuple):
-            self._trace = [values]
-
-        @property
-        def trace(self):
-            return self._trace
-
-        @trace.setter
-        def trace(self, trace):
-            self._trace = trace
-
-        def __eq__(self, other: 'TvlTracesState.TvlTrace'):
-            if isinstance(other, self.__class__):
-                return repr(self) == repr(other)
-            return False
-
-        def __hash__(self):
-            return hash(repr(self))
-
-        def __ne__(self, other: 'TvlTracesState.TvlTrace'):
-            return not (self == other)
+class TvlTracesState(CachedHashMixin, BoundedLattice, State):
+    class TvlEncoding:
+        """Encoding of three-valued traces as integers.
 
-        def __repr__(self):
-            return "".join("({})".format("".join(value for value in state)) for state in self.trace)
+        A valuation is encoded by two bitmasks with one bit per variable: the low mask holds the variables that are
+        true (``'T'``), the high mask the variables that are unknown (``'?'``); the variables that are false (``'F'``)
+        are in neither. A trace, i.e., a sequence of valuations, is encoded by shifting the previous valuations up and
+        placing the most recent valuation in the lowest bits, below a sentinel bit marking the length of the trace.
+        """
 
-        def evaluate(self, variables: List[VariableIdentifier], exp: Expression) -> str:
+        def __init__(self, variables: List[VariableIdentifier]):
+            self._width = len(variables)
+            self._bits = {variable: 1 << i for i, variable in enumerate(variables)}   # e.g., {x: 0b01, y: 0b10}
+            self._head = (1 << 2 * self._width) - 1
+
+        def encode(self, values: Tuple) -> int:
+            """Encode a valuation as a trace of length one.
+
+            :param values: tuple of ``'T'``, ``'?'``, or ``'F'`` for each variable
+            :return: encoded trace
+            """
+            head = 0
+            for i, value in enumerate(values):
+                if value == 'T':
+                    head |= 1 << i
+                elif value == '?':
+                    head |= 1 << (self._width + i)
+            return (1 << 2 * self._width) | head
+
+        def decode(self, trace: int) -> str:
+            """String representation of a trace, most recent valuation first.
+
+            :param trace: encoded trace
+            :return: string representing the trace
+            """
+            result = []
+            while True:
+                truth = trace & self._head
+                unknown = truth >> self._width
+                result.append("({})".format("".join(
+                    'T' if truth & (1 << i) else ('?' if unknown & (1 << i) else 'F') for i in range(self._width)
+                )))
+                trace >>= 2 * self._width
+                if trace <= 1:
+                    return "".join(result)
+
+        def _evaluate(self, trace: int, exp: Expression) -> Tuple[bool, bool]:
+            """Evaluate an expression to a pair of bits: whether it is true, and whether it is unknown."""
             if isinstance(exp, Literal):
-                if exp.val == 'True':
-                    return 'T'
-                elif exp.val == 'False':
-                    return 'F'
-                else:
-                    return '?'
+                return exp.val == 'True', exp.val not in ('True', 'False')
             elif isinstance(exp, VariableIdentifier):
-                idx = variables.index(exp)
-                return self.trace[0][idx]
+                bit = self._bits[exp]
+                return bool(trace & bit), bool((trace >> self._width) & bit)
             elif isinstance(exp, UnaryBooleanOperation):
-                neg = self.evaluate(variables, exp.expression)
-                if neg == 'T':
-                    return 'F'
-                elif neg == 'F':
-                    return 'T'
-                else:
-                    return '?'
+                truth, unknown = self._evaluate(trace, exp.expression)
+                return not (truth or unknown), unknown
             elif isinstance(exp, BinaryBooleanOperation):
-                left = self.evaluate(variables, exp.left)
-                right = self.evaluate(variables, exp.right)
+                left_truth, left_unknown = self._evaluate(trace, exp.left)
+                right_truth, right_unknown = self._evaluate(trace, exp.right)
                 if exp.operator is BinaryBooleanOperation.Operator.And:
-                    if left == 'T' and right == 'T':
-                        return 'T'
-                    elif left == '?' or right == '?':
-                        return '?'
-                    else:
-                        return 'F'
+                    truth = left_truth and right_truth
                 elif exp.operator is BinaryBooleanOperation.Operator.Or:
-                    if left == 'T' or right == 'T':
-                        return 'T'
-                    elif left == '?' or right == '?':
-                        return '?'
-                    else:
-                        return 'F'
+                    truth = left_truth or right_truth
                 else:
                     raise NotImplementedError("Expression evaluation for {} is not implemented!".format(exp))
+                return truth, not truth and (left_unknown or right_unknown)
             else:
                 raise NotImplementedError("Expression evaluation for {} is not implemented!".format(exp))
 
-        def test(self, idx: int, value: str) -> bool:
-            return self.trace[0][idx] == value
-
-        def replace(self, idx: int, value: str) -> 'TvlTracesState.TvlTrace':
-            head = list(self.trace[0])
-            head[idx] = value
-            self.trace = [tuple(head)] + self.trace
-            return self
-
-        def variety(self, variables: List[VariableIdentifier], inputs: List[VariableIdentifier]) -> List[str]:
-            value = list()
-            for var in inputs:
-                idx = variables.index(var)
-                value.append(self.trace[0][idx])
-            return value
+        def evaluate(self, trace: int, exp: Expression) -> str:
+            truth, unknown = self._evaluate(trace, exp)
+            return 'T' if truth else ('?' if unknown else 'F')
+
+        def test(self, trace: int, variable: VariableIdentifier, value: str) -> bool:
+            bit = self._bits[variable]
+            if value == 'T':
+                return bool(trace & bit)
+            elif value == '?':
+                return bool((trace >> self._width) & bit)
+            return not ((trace | (trace >> self._width)) & bit)
+
+        def replace(self, trace: int, variable: VariableIdentifier, value: str) -> int:
+            """Extend a trace with a copy of its most recent valuation in which a variable has a new value.
+
+            :param trace: encoded trace
+            :param variable: variable to be replaced
+            :param value: new value of the variable
+            :return: encoded extended trace
+            """
+            bit = self._bits[variable]
+            head = trace & self._head & ~(bit | (bit << self._width))
+            if value == 'T':
+                head |= bit
+            elif value == '?':
+                head |= bit << self._width
+            return (trace << 2 * self._width) | head
+
+        def mask(self, variables) -> int:
+            """Bitmask selecting the values of some variables in the most recent valuation of a trace.
+
+            :param variables: variables to be selected
+            :return: bitmask
+            """
+            mask = 0
+            for variable in variables:
+                bit = self._bits[variable]
+                mask |= bit | (bit << self._width)
+            return mask
 
     def __init__(self, variables: List[VariableIdentifier], hyper: bool = False):
         """Live/Dead variable analysis state representation.
@@ -390,23 +528,29 @@ class TvlTracesState(BoundedLattice, State):
         """
         super().__init__()
         self._variables = variables     # e.g., ['x', 'y']
-        self._traces = frozenset(TvlTracesState.TvlTrace(t) for t in product(*[('T', '?', 'F') for _ in variables]))
+        self._encoding = TvlTracesState.TvlEncoding(variables)
+        self._traces = frozenset(self._encoding.encode(t) for t in product(*[('T', '?', 'F') for _ in variables]))
         self._hyper = hyper
-        t = len(self._traces)
-        sets = frozenset(
-            frozenset(t) for t in chain.from_iterable(combinations(self._traces, r) for r in range(t + 1))
-        )
-        self._sets = dict()
-        i = 1
-        for s in sets:
-            self._sets[i] = s
-            i = i + 1
+        # antichain of the maximal sets of traces (cf. Hyper Trace Sets)
+        self._sets = frozenset({(self._traces, frozenset((trace, trace) for trace in self._traces))})
         self._in = set()
 
+    def __deepcopy__(self, memo):
+        # traces are immutable integers, only the set of inputs needs to be copied
+        result = type(self).__new__(type(self))
+        memo[id(self)] = result
+        result.__dict__.update(self.__dict__)
+        result._in = set(self._in)
+        return result
+
     @property
     def variables(self):
         return self._variables
 
+    @property
+    def encoding(self):
+        return self._encoding
+
     @property
     def traces(self):
         return self._traces
@@ -434,15 +578,13 @@ class TvlTracesState(BoundedLattice, State):
         """
 
         def trace_repr(s):
-            return ", ".join(str(trace) for trace in s)
+            return ", ".join(self.encoding.decode(trace) for trace in s)
 
         def variety(s):
             if self._in and s:
                 varieties = [(x, self._variety(s, x)) for x in self._in]
-                values = set()
-                for trace in s:
-                    values.add(tuple(trace.variety(self.variables, self._in)))
-                count = len(values)
+                mask = self.encoding.mask(self._in)
+                count = len({trace & mask for trace in s})
                 return " variety: " + " ".join(str(x) + "=" + str(v) for (x, v) in varieties) + " count: " + str(count)
             else:
                 return ""
@@ -451,7 +593,7 @@ class TvlTracesState(BoundedLattice, State):
             return ", ".join(str(x) for x in self.variables)
 
         if self.hyper:
-            sets = list(self.sets.values())
+            sets = [image(relation) for _, relation in self.sets]
             List.sort(sets, key=lambda x: len(x), reverse=True)
             s1 = frozenset()
             s2 = frozenset()
@@ -470,22 +612,23 @@ class TvlTracesState(BoundedLattice, State):
             trd = trace_repr(s3) + variety(s3)
             return var_repr() + " {" + fst + "}\n{" + snd + "}\n{" + trd + "}"
         else:
-            return ", ".join(str(trace) for trace in self.traces)
+            return ", ".join(self.encoding.decode(trace) for trace in self.traces)
+
+    def _key(self):
+        if self.hyper:
+            return self.kind, self.sets, frozenset(self._in)
+        return self.kind, self.traces
 
     def _less_equal(self, other: 'TvlTracesState') -> bool:
         if self.hyper:
-            subset = True
-            for key in self.sets:
-                subset = subset and self.sets[key].issubset(other.sets[key])
-            return subset
+            return less_equal_sets(self.sets, other.sets)
         else:
             return self.traces.issubset(other.traces)
 
     def _join(self, other: 'TvlTracesState') -> 'TvlTracesState':
         if self.hyper:
             self._in = self._in.union(other._in)
-            for key in self.sets:
-                self.sets[key] = self.sets[key].union(other.sets[key])
+            self.sets = join_sets(self.sets, other.sets)
         else:
             self.traces = self.traces.union(other.traces)
         return self
@@ -496,8 +639,7 @@ class TvlTracesState(BoundedLattice, State):
     def _meet(self, other: 'TvlTracesState'):
         if self.hyper:
             self._in = self._in.intersection(other._in)
-            for key in self.sets:
-                self.sets[key] = self.sets[key].intersection(other.sets[key])
+            self.sets = meet_sets(self.sets, other.sets)
         else:
             self.traces = self.traces.intersection(other.traces)
         return self
@@ -508,22 +650,13 @@ class TvlTracesState(BoundedLattice, State):
     def _assign_variable(self, left: Expression, right: Expression) -> 'TvlTracesState':
         raise NotImplementedError("Variable assignment is not implemented!")
 
-    def _assume_aux(self, traces: FrozenSet[TvlTrace], condition: Expression) -> FrozenSet[TvlTrace]:
+    def _assume_aux(self, traces: FrozenSet[int], condition: Expression) -> FrozenSet[int]:
         if isinstance(condition, VariableIdentifier):
-            idx = self.variables.index(condition)
-            result = set()
-            for trace in traces:
-                if trace.test(idx, 'T'):
-                    result.add(deepcopy(trace))
-            return frozenset(result)
+            return frozenset(trace for trace in traces if self.encoding.test(trace, condition, 'T'))
         elif isinstance(condition, UnaryBooleanOperation):
             if isinstance(condition.expression, VariableIdentifier):
-                idx = self.variables.index(condition.expression)
-                result = set()
-                for trace in traces:
-                    if trace.test(idx, 'F') or trace.test(idx, '?'):
-                        result.add(deepcopy(trace))
-                return frozenset(result)
+                variable = condition.expression
+                return frozenset(trace for trace in traces if not self.encoding.test(trace, variable, 'T'))
             else:
                 raise NotImplementedError("Assume for {} is not implemented!".format(condition))
         else:
@@ -531,8 +664,7 @@ class TvlTracesState(BoundedLattice, State):
 
     def _assume(self, condition: Expression) -> 'TvlTracesState':
         if self.hyper:
-            for key in self.sets:
-                self.sets[key] = self._assume_aux(self.sets[key], condition)
+            self.sets = map_sets(self.sets, lambda traces: self._assume_aux(traces, condition))
         else:
             self.traces = self._assume_aux(self.traces, condition)
         return self
@@ -554,53 +686,180 @@ class TvlTracesState(BoundedLattice, State):
 
     def _output(self, output: Expression) -> 'TvlTracesState':
         if self.hyper:  # nothing to be done otherwise
-            for key in self.sets:  # for all sets of traces...
-                unique = True
-                for identifier in output.ids():  # for each output...
-                    unique = unique and self._variety(self.sets[key], identifier) == 1
-                if not unique:
-                    self.sets[key] = frozenset()
+            # keep the maximal sets of traces in which each output has a unique value
+            self.sets = split_unique(self.sets, self.encoding.evaluate, list(output.ids()))
         return self
 
-    def _substitute_variable_aux(self, traces: FrozenSet[TvlTrace], left, right) -> FrozenSet[TvlTrace]:
+    def _substitute_variable_aux(self, traces: FrozenSet[int], left, right) -> FrozenSet[int]:
         if isinstance(left, VariableIdentifier):
-            idx = self.variables.index(left)
             if isinstance(right, Input):
-                self._in.add(left)
-                result = set()
-                for trace in traces:
-                    result.add(deepcopy(trace))
-                    # result.add(deepcopy(trace).replace(idx, 'T'))
-                    # result.add(deepcopy(trace).replace(idx, 'F'))
-                return frozenset(result)
+                self._in = self._in.union({left})
+                return traces
             else:
                 result = set()
                 for trace in traces:
-                    tt = deepcopy(trace).replace(idx, 'T')
-                    if trace.test(idx, tt.evaluate(self.variables, right)):
-                        result.add(tt)
-                    uu = deepcopy(trace).replace(idx, '?')
-                    if trace.test(idx, uu.evaluate(self.variables, right)):
-                        result.add(uu)
-                    ff = deepcopy(trace).replace(idx, 'F')
-                    if trace.test(idx, ff.evaluate(self.variables, right)):
-                        result.add(ff)
+                    for value in ('T', '?', 'F'):
+                        replaced = self.encoding.replace(trace, left, value)
+                        if self.encoding.test(trace, left, self.encoding.evaluate(replaced, right)):
+                            result.add(replaced)
                 return frozenset(result)
         else:
             raise NotImplementedError("Variable substitution for {} is not implemented!".format(left))
 
     def _substitute_variable(self, left: Expression, right: Expression) -> 'TvlTracesState':
         if self.hyper:
-            for key in self.sets:
-                self.sets[key] = self._substitute_variable_aux(self.sets[key], left, right)
+            self.sets = map_sets(self.sets, lambda traces: self._substitute_variable_aux(traces, left, right))
         else:
             self.traces = self._substitute_variable_aux(self.traces, left, right)
         return self
 
-    def _variety(self, traces: FrozenSet[TvlTrace], identifier: Expression) -> int:
-        values = set()
-        for trace in traces:
-            values.add(trace.evaluate(self.variables, identifier))
-        if 'T' in values:
-            pass
-        return len(values)
+    def _variety(self, traces: FrozenSet[int], identifier: Expression) -> int:
+        return len({self.encoding.evaluate(trace, identifier) for trace in traces})
+
+
+class BddTracesState(CachedHashMixin, BoundedLattice, State):
+    def __init__(self, variables: List[VariableIdentifier]):
+        """Boolean traces analysis state representation, with the set of valuations represented by a binary decision 
+        diagram.
+
+        In contrast to ``BoolTracesState``, only the current valuation of each trace is represented.
+
+        :param variables: list of program variables
+        """
+        super().__init__()
+        self._variables = variables
+        self._levels = {variable: level for level, variable in enumerate(variables)}
+        self._bdd = BDD(len(variables))
+        self._traces = BDD.TRUE     # all valuations
+        self._in = set()
+
+    def __deepcopy__(self, memo):
+        # the decision diagram manager (and its caches) are shared between all copies
+        result = type(self).__new__(type(self))
+        memo[id(self)] = result
+        result.__dict__.update(self.__dict__)
+        result._in = set(self._in)
+        return result
+
+    @property
+    def variables(self):
+        return self._variables
+
+    @property
+    def bdd(self):
+        return self._bdd
+
+    @property
+    def traces(self):
+        return self._traces
+
+    @traces.setter
+    def traces(self, traces):
+        self._traces = traces
+
+    def __repr__(self):
+        """Unambiguous string representing the current state.
+
+        :return: unambiguous representation string
+        """
+        traces = ", ".join("({})".format("".join('T' if value else 'F' for value in model))
+                           for model in self.bdd.models(self.traces))
+        if self._in and self.traces != BDD.FALSE:
+            varieties = [(x, self._variety(self.traces, x)) for x in self._in]
+            count = self._input_variety(self.traces)
+            return traces + " variety: " + " ".join(str(x) + "=" + str(v) for (x, v) in varieties) + \
+                " count: " + str(count)
+        return traces
+
+    def _key(self):
+        # decision diagrams are canonical (for the same manager)
+        return self.kind, self.bdd, self.traces, frozenset(self._in)
+
+    def _less_equal(self, other: 'BddTracesState') -> bool:
+        return self.bdd.implies(self.traces, other.traces)
+
+    def _join(self, other: 'BddTracesState') -> 'BddTracesState':
+        self._in = self._in.union(other._in)
+        self.traces = self.bdd.disj(self.traces, other.traces)
+        return self
+
+    def _widening(self, other: 'BddTracesState'):
+        return self._join(other)
+
+    def _meet(self, other: 'BddTracesState'):
+        self._in = self._in.intersection(other._in)
+        self.traces = self.bdd.conj(self.traces, other.traces)
+        return self
+
+    def _evaluate(self, exp: Expression) -> int:
+        """Decision diagram representing the valuations in which an expression is true."""
+        if isinstance(exp, Literal):
+            return BDD.TRUE if exp.val == 'True' else BDD.FALSE
+        elif isinstance(exp, VariableIdentifier):
+            return self.bdd.var(self._levels[exp])
+        elif isinstance(exp, UnaryBooleanOperation):
+            return self.bdd.neg(self._evaluate(exp.expression))
+        elif isinstance(exp, BinaryBooleanOperation):
+            left = self._evaluate(exp.left)
+            right = self._evaluate(exp.right)
+            if exp.operator is BinaryBooleanOperation.Operator.And:
+                return self.bdd.conj(left, right)
+            elif exp.operator is BinaryBooleanOperation.Operator.Or:
+                return self.bdd.disj(left, right)
+            else:
+                raise NotImplementedError("Expression evaluation for {} is not implemented!".format(exp))
+        else:
+            raise NotImplementedError("Expression evaluation for {} is not implemented!".format(exp))
+
+    def _access_variable(self, variable: VariableIdentifier) -> Set[Expression]:
+        return {variable}
+
+    def _assign_variable(self, left: Expression, right: Expression) -> 'BddTracesState':
+        raise NotImplementedError("Variable assignment is not implemented!")
+
+    def _assume(self, condition: Expression) -> 'BddTracesState':
+        self.traces = self.bdd.conj(self.traces, self._evaluate(condition))
+        return self
+
+    def _evaluate_literal(self, literal: Expression) -> Set[Expression]:
+        return {literal}
+
+    def enter_loop(self):
+        return self  # nothing to be done
+
+    def exit_loop(self):
+        return self  # nothing to be done
+
+    def enter_if(self):
+        return self  # nothing to be done
+
+    def exit_if(self):
+        return self  # nothing to be done
+
+    def _output(self, output: Expression) -> 'BddTracesState':
+        return self  # nothing to be done
+
+    def _substitute_variable(self, left: Expression, right: Expression) -> 'BddTracesState':
+        if isinstance(left, VariableIdentifier):
+            if isinstance(right, Input):
+                self._in = self._in.union({left})
+            else:
+                self.traces = self.bdd.compose(self.traces, self._levels[left], self._evaluate(right))
+        else:
+            raise NotImplementedError("Variable substitution for {} is not implemented!".format(left))
+        return self
+
+    def _variety(self, traces: int, identifier: Expression) -> int:
+        """Number of distinct values of an expression in a set of valuations."""
+        value = self._evaluate(identifier)
+        true = self.bdd.conj(traces, value) != BDD.FALSE
+        false = self.bdd.conj(traces, self.bdd.neg(value)) != BDD.FALSE
+        return true + false
+
+    def _input_variety(self, traces: int) -> int:
+        """Number of distinct valuations of the input variables in a set of valuations (by model counting)."""
+        others = [level for variable, level in self._levels.items() if variable not in self._in]
+        projection = traces
+        for level in others:
+            projection = self.bdd.exists(projection, level)
+        return self.bdd.count(projection) >> len(others)
@@ -5,17 +5,49 @@ from typing import List, Set, Sequence
 
 from abstract_domains.stack import ScopeDescendCombineMixin, ScopeStack
 from abstract_domains.state import State
-from abstract_domains.store import Store
+from abstract_domains.store import FiniteLattice, PackedStore
 from abstract_domains.usage.used import UsedLattice, Used
 from abstract_domains.usage.used_liststart import UsedListStartLattice
 from abstract_domains.usage.used_segmentation import UsedSegmentationStore
 from core.expressions import Expression, VariableIdentifier, ListDisplay, Literal, Index
 from core.expressions_tools import walk
+from core.special_expressions import ExpressionSummary
 
 
-class UsedStore(ScopeDescendCombineMixin, Store, State):
+class UsedStore(ScopeDescendCombineMixin, PackedStore, State):
+    _shared = PackedStore._shared + ('_order',)
+
     def __init__(self, variables: List[VariableIdentifier]):
-        super().__init__(variables, {int: lambda _: UsedLattice(), list: lambda _: UsedListStartLattice()})
+        """Map each program variable to its usage.
+
+        The usage of the integer variables is packed into an array (cf. ``PackedStore``),
+        the usage of the list variables is tracked by ``UsedListStartLattice`` elements.
+
+        :param variables: list of program variables
+        """
+        super().__init__([var for var in variables if var.typ != list], UsedStore.LATTICE)
+        self._order = variables
+        self._lists = {var: UsedListStartLattice() for var in variables if var.typ == list}
+
+    def __repr__(self):
+        symbols = self.lattice.symbols
+        return ", ".join("{}→{}".format(variable, self._lists[variable] if variable in self._lists else
+                                        symbols[self.codes[self._index[variable]]]) for variable in self._order)
+
+    def _key(self):
+        return tuple(self._order), bytes(self.codes), tuple(self._lists.items())
+
+    def bottom(self) -> 'UsedStore':
+        super().bottom()
+        for lat in self._lists.values():
+            lat.bottom()
+        return self
+
+    def top(self) -> 'UsedStore':
+        super().top()
+        for lat in self._lists.values():
+            lat.top()
+        return self
 
     def is_bottom(self) -> bool:
         """Test whether the usage store is bottom, i.e. if *all* values in the store are bottom.
@@ -25,60 +57,116 @@ class UsedStore(ScopeDescendCombineMixin, Store, State):
 
         :return: whether the usage store is bottom
         """
-        return all(element.is_bottom() for element in self.store.values())
+        return self.codes.count(self.lattice.bottom) == len(self.codes) and \
+            all(lat.is_bottom() for lat in self._lists.values())
+
+    def is_top(self) -> bool:
+        return super().is_top() and all(lat.is_top() for lat in self._lists.values())
+
+    def _less_equal(self, other: 'UsedStore') -> bool:
+        return super()._less_equal(other) and all(lat.less_equal(other._lists[var]) for var, lat in self._lists.items())
+
+    def _meet(self, other: 'UsedStore'):
+        super()._meet(other)
+        for var, lat in self._lists.items():
+            lat.meet(other._lists[var])
+        return self
+
+    def _join(self, other: 'UsedStore') -> 'UsedStore':
+        super()._join(other)
+        for var, lat in self._lists.items():
+            lat.join(other._lists[var])
+        return self
+
+    def _widening(self, other: 'UsedStore'):
+        super()._widening(other)
+        for var, lat in self._lists.items():
+            lat.widening(other._lists[var])
+        return self
 
     def descend(self) -> 'UsedStore':
-        for var in self.store.values():
-            var.descend()
+        self.codes = self.lattice.apply(UsedStore.DESCEND, self.codes)
+        for lat in self._lists.values():
+            lat.descend()
         return self
 
     def combine(self, other: 'UsedStore') -> 'UsedStore':
-        for var, used in self.store.items():
-            used.combine(other.store[var])
+        self.codes = self.lattice.apply2(UsedStore.COMBINE, self.codes, other.codes)
+        for var, lat in self._lists.items():
+            lat.combine(other._lists[var])
         return self
 
+    def _mark_used(self, variable: VariableIdentifier):
+        """Mark a variable as used (the usage of list variables is only changed through their elements).
+
+        :param variable: used variable
+        """
+        if variable in self:
+            self[variable] = Used.U
+
+    def _mark_summary_used(self, summary: ExpressionSummary):
+        """Mark all variables read by a summary as used (all elements of the list variables, since any of them may
+        contribute to the summarised expressions).
+
+        :param summary: used summary
+        """
+        for identifier in summary.ids():
+            if identifier in self._lists:
+                self._lists[identifier].suo[Used.U] = inf
+                self._lists[identifier].closure()
+            else:
+                self._mark_used(identifier)
+
     def _derive_list_display_usage_from_used_liststart(self, liststart, list_display):
         for index, e in enumerate(list_display.items):
             if liststart.used_at(index) in [Used.U, Used.S]:
                 for identifier in e.ids():
-                    self.store[identifier].used = Used.U
+                    self._mark_used(identifier)
 
     def _use(self, left: VariableIdentifier, right: Expression):
         if issubclass(left.typ, Number):
-            if self.store[left].used in [Used.U, Used.S]:
+            if self[left] in [Used.U, Used.S]:
                 for e in walk(right):
                     if isinstance(e, VariableIdentifier):
-                        self.store[e].used = Used.U
+                        self._mark_used(e)
+                    elif isinstance(e, ExpressionSummary):
+                        self._mark_summary_used(e)
                     elif isinstance(e, Index):
                         if isinstance(e.index, Literal):
-                            self.store[e.target].set_used_at(e.index.val)
+                            self._lists[e.target].set_used_at(e.index.val)
                         else:
                             raise NotImplementedError()
         elif issubclass(left.typ, Sequence):
             if isinstance(right, VariableIdentifier):
-                self.store[right].replace(deepcopy(self.store[left]))
-                self.store[right].change_S_to_U()
+                self._lists[right].replace(deepcopy(self._lists[left]))
+                self._lists[right].change_S_to_U()
             elif isinstance(right, ListDisplay):
-                self._derive_list_display_usage_from_used_liststart(self.store[left], right)
+                self._derive_list_display_usage_from_used_liststart(self._lists[left], right)
+            elif isinstance(right, ExpressionSummary):
+                if self._lists[left].suo[Used.U] > 0 or self._lists[left].suo[Used.S] > 0:
+                    self._mark_summary_used(right)
         else:
-            raise NotImplementedError(f"Method _use not implemented for {self.store[left].typ}!")
+            raise NotImplementedError(f"Method _use not implemented for {left.typ}!")
         return self
 
     def _kill(self, left: VariableIdentifier, right: Expression):
         if issubclass(left.typ, Number):
-            if self.store[left].used in [Used.U, Used.S]:
-                if left in [v for v, u in self.store.items() if v in right.ids()]:
-                    self.store[left].used = Used.U  # x is still used since it is used in assigned expression
+            if self[left] in [Used.U, Used.S]:
+                if left in right.ids():
+                    self[left] = Used.U  # x is still used since it is used in assigned expression
                 else:
-                    self.store[left].used = Used.O  # x is overwritten
+                    self[left] = Used.O  # x is overwritten
         elif issubclass(left.typ, Sequence):
             if isinstance(right, VariableIdentifier):
                 if right != left:  # if no self-assignemnt
-                    self.store[left].change_SU_to_O()
+                    self._lists[left].change_SU_to_O()
             elif isinstance(right, ListDisplay):
-                self.store[left].change_SU_to_O()
+                self._lists[left].change_SU_to_O()
+            elif isinstance(right, ExpressionSummary):
+                if left not in right.ids():  # the list may still be used in the summarised expressions
+                    self._lists[left].change_SU_to_O()
         else:
-            raise NotImplementedError(f"Method _kill not implemented for {self.store[left].typ}!")
+            raise NotImplementedError(f"Method _kill not implemented for {left.typ}!")
         return self
 
     def _access_variable(self, variable: VariableIdentifier) -> Set[Expression]:
@@ -89,21 +177,19 @@ class UsedStore(ScopeDescendCombineMixin, Store, State):
 
     def _assume(self, condition: Expression) -> 'UsedStore':
         # update to U if exists a variable y in state that is either U or O (note that S is not enough)
-        used_vars = len(
-            set([lat.used for lat in self.store.values() if isinstance(lat, UsedLattice)]).intersection(
-                [Used.U, Used.O])
-        ) > 0
+        used_vars = self.lattice.code(Used.U) in self.codes or self.lattice.code(Used.O) in self.codes
         used_lists = any(
-            [lat.suo[Used.U] > 0 or lat.suo[Used.O] > 0 for lat in self.store.values() if
-             isinstance(lat, UsedListStartLattice)]
+            [lat.suo[Used.U] > 0 or lat.suo[Used.O] > 0 for lat in self._lists.values()]
         )
         if used_vars or used_lists:
             for e in walk(condition):
                 if isinstance(e, VariableIdentifier):
-                    self.store[e].used = Used.U
+                    self._mark_used(e)
+                elif isinstance(e, ExpressionSummary):
+                    self._mark_summary_used(e)
                 elif isinstance(e, Index):
                     if isinstance(e.index, Literal):
-                        self.store[e.target].set_used_at(e.index.val)
+                        self._lists[e.target].set_used_at(e.index.val)
                     else:
                         raise NotImplementedError()
 
@@ -127,10 +213,10 @@ class UsedStore(ScopeDescendCombineMixin, Store, State):
     def _output(self, output: Expression) -> 'UsedStore':
         for variable in output.ids():
             if issubclass(variable.typ, Number):
-                self.store[variable].used = Used.U
+                self[variable] = Used.U
             elif issubclass(variable.typ, Sequence):
-                self.store[variable].suo[Used.U] = inf
-                self.store[variable].closure()
+                self._lists[variable].suo[Used.U] = inf
+                self._lists[variable].closure()
             else:
                 raise NotImplementedError(f"Type {variable.typ} not yet supported!")
         return self  # nothing to be done
@@ -143,6 +229,11 @@ class UsedStore(ScopeDescendCombineMixin, Store, State):
         return self
 
 
+UsedStore.LATTICE = FiniteLattice([Used.N, Used.O, Used.S, Used.U], UsedLattice, lambda lattice: lattice.used)
+UsedStore.DESCEND = UsedStore.LATTICE.unary(lambda lattice: lattice.descend())
+UsedStore.COMBINE = UsedStore.LATTICE.binary(lambda lattice, other: lattice.combine(other))
+
+
 class UsedDomain(ScopeStack):
     def __init__(self, variables: List[VariableIdentifier]):
         """Usage-analysis state representation.
@@ -166,7 +257,7 @@ class UsedSegmentationDomain(ScopeStack):
         if isinstance(left, (VariableIdentifier, Index)):
             for i in range(len(self.stack)):
                 # in all frame except the last one we only subsitute integer variables (no usage updates!)
-                self.stack[i].substitute_variable({left}, {right}, only_substitute=i < len(self.stack) - 1)
+                self.frame(i).substitute_variable({left}, {right}, only_substitute=i < len(self.stack) - 1)
         else:
             raise NotImplementedError("Variable substitution for {} is not implemented!".format(left))
         return self
@@ -88,6 +88,9 @@ class UsedLattice(ScopeDescendCombineMixin, Lattice):
     def __repr__(self):
         return repr(self.used)
 
+    def _key(self):
+        return self.used
+
     def bottom(self):
         self.used = N
         return self
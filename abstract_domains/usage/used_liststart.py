@@ -61,6 +61,9 @@ class UsedListStartLattice(BottomMixin):
                 non_zero_uppers.append(f"{repr(el)}@0:{self.suo[el]}")
         return f"({', '.join(non_zero_uppers)})"
 
+    def _key(self):
+        return tuple(self.suo.values())
+
     def top(self):
         self._suo = OrderedDict([
             (S, 0),
@@ -13,6 +13,7 @@ from abstract_domains.usage.used import U, S, O, UsedLattice, Used
 from core.cfg import Edge
 from core.expressions import VariableIdentifier, Expression, Index, ListDisplay, ListInput
 from core.expressions_tools import walk
+from core.special_expressions import ExpressionSummary
 from core.statements import ProgramPoint
 from engine.result import AnalysisResult
 
@@ -22,17 +23,6 @@ class UsedSegmentedList(ScopeDescendCombineMixin, SegmentedList):
                  octagon_analysis_result: AnalysisResult):
         super().__init__(variables, len_var, lambda: UsedLattice().bottom(), octagon_analysis_result)
 
-    def __deepcopy__(self, memo):
-        memo = memo if memo is not None else {}
-
-        result = type(self)(self._variables, self._len_var, self._octagon_analysis_result)
-        memo[id(self)] = result
-        for k, v in self.__dict__.items():
-            if k != "_octagon_analysis_result":
-                # noinspection PyArgumentList
-                setattr(result, k, deepcopy(v, memo))
-        return result
-
     def descend(self) -> 'UsedSegmentedList':
         for i in range(len(self.predicates)):
             self.predicates[i].used = UsedLattice.DESCEND[self.predicates[i].used]
@@ -64,6 +54,15 @@ class UsedSegmentedList(ScopeDescendCombineMixin, SegmentedList):
             if self.predicates[i].used in [S, U]:
                 self.predicates[i].used = O
 
+    def is_used(self) -> bool:
+        """Test whether some element of the list is used (U- or S-annotated)."""
+        return any(predicate.used in [S, U] for predicate in self.predicates)
+
+    def set_used(self):
+        """Mark all elements of the list as used (U-annotated)."""
+        for predicate in self.predicates:
+            predicate.used = U
+
 
 class UsedSegmentationStore(ScopeDescendCombineMixin, Store, State):
     def __init__(self, int_vars, list_vars, list_len_vars, list_to_len_var, octagon_analysis_result):
@@ -93,10 +92,20 @@ class UsedSegmentationStore(ScopeDescendCombineMixin, Store, State):
             lat.combine(other.store[var])
         return self
 
+    def _set_summary_used(self, summary: ExpressionSummary):
+        # any element of the lists read by a summary may contribute to the summarised expressions
+        for identifier in summary.ids():
+            if issubclass(identifier.typ, Number):
+                self.store[identifier].used = U
+            elif identifier.typ == list:
+                self.store[identifier].set_used()
+
     def _set_expr_used(self, expr: Expression):
         for e in walk(expr):
             if isinstance(e, VariableIdentifier) and issubclass(e.typ, Number):
                 self.store[e].used = U
+            elif isinstance(e, ExpressionSummary):
+                self._set_summary_used(e)
             elif isinstance(e, Index):
                 if e.target.typ == list:
                     self.store[e.target].set_predicate(e.index, UsedLattice(U))
@@ -127,6 +136,9 @@ class UsedSegmentationStore(ScopeDescendCombineMixin, Store, State):
                                 self.store[identifier].used = U
                 elif isinstance(right, ListInput):
                     pass
+                elif isinstance(right, ExpressionSummary):
+                    if segmentation.is_used():
+                        self._set_summary_used(right)
                 else:
                     raise NotImplementedError(f"Method _use not implemented for right side of type {right.typ}!")
             else:
@@ -165,6 +177,9 @@ class UsedSegmentationStore(ScopeDescendCombineMixin, Store, State):
                     self.store[left].change_SU_to_O()
                 elif isinstance(right, ListInput):
                     self.store[left].change_SU_to_O()
+                elif isinstance(right, ExpressionSummary):
+                    if left not in right.ids():  # the list may still be used in the summarised expressions
+                        self.store[left].change_SU_to_O()
                 else:
                     raise NotImplementedError(f"Method _kill not implemented for right side of type {right.typ}!")
             else:
@@ -183,6 +198,9 @@ class UsedSegmentationStore(ScopeDescendCombineMixin, Store, State):
                     else:
                         raise NotImplementedError(
                             f"Indexed variable is not of any Sequence type, but {e.target.typ}!")
+                elif isinstance(e, ExpressionSummary) and left.target in e.ids():
+                    # any index of the list may be used in the summarised expressions
+                    pred_indices_used_right |= set(range(len(segmentation)))
 
             # find possible indices updates in the list on the left
             gl, lu, lu_inclusive = segmentation.get_gl_lu_at_expr(left.index)
@@ -208,6 +226,8 @@ class UsedSegmentationStore(ScopeDescendCombineMixin, Store, State):
             for e in walk(condition):
                 if isinstance(e, VariableIdentifier):
                     self.store[e].used = Used.U
+                elif isinstance(e, ExpressionSummary):
+                    self._set_summary_used(e)
                 elif isinstance(e, Index):
                     self.store[e.target].set_predicate(e.index, UsedLattice(Used.U))
         return self
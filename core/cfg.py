@@ -5,6 +5,8 @@ from typing import Dict, List, Set, Tuple, Generator, Union
 
 
 class Node(metaclass=ABCMeta):
+    __slots__ = ('_identifier', '_stmts')
+
     def __init__(self, identifier: int, stmts: List[Statement]):
         """Node of a control flow graph.
 
@@ -50,6 +52,8 @@ class Node(metaclass=ABCMeta):
 
 
 class Basic(Node):
+    __slots__ = ()
+
     def __init__(self, identifier: int, stmts: List[Statement] = None):
         """Basic node of a control flow graph.
         
@@ -63,6 +67,8 @@ class Basic(Node):
 
 
 class Loop(Node):
+    __slots__ = ()
+
     def __init__(self, identifier: int, stmts: List[Statement] = None):
         """Loop head node of a control flow graph.
 
@@ -84,6 +90,8 @@ class Edge(metaclass=ABCMeta):
         LOOP_IN = 1  # loop entry edge
         IF_IN = 2  # if entry edge
 
+    __slots__ = ('_source', '_target', '_kind')
+
     def __init__(self, source: Node, target: Node, kind: Kind = Kind.DEFAULT):
         """Edge of a control flow graph.
         
@@ -128,6 +136,8 @@ class Edge(metaclass=ABCMeta):
 
 
 class Unconditional(Edge):
+    __slots__ = ()
+
     def __init__(self, source: Union[Node, None], target: Union[Node, None], kind=Edge.Kind.DEFAULT):
         """Unconditional edge of a control flow graph.
 
@@ -142,6 +152,8 @@ class Unconditional(Edge):
 
 
 class Conditional(Edge):
+    __slots__ = ('_condition',)
+
     def __init__(self, source: Union[Node, None], condition: Statement, target: Union[Node, None],
                  kind=Edge.Kind.DEFAULT):
         """Conditional edge of a control flow graph.
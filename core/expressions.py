@@ -1,14 +1,135 @@
 from abc import ABCMeta, abstractmethod
 from enum import IntEnum
-from typing import Set, Sequence
+from functools import wraps
+from typing import Set, Sequence, Dict, Tuple
+from weakref import WeakValueDictionary
 
 """
 Expressions.
 https://docs.python.org/3.4/reference/expressions.html
 """
 
+"""
+Hash-Consing
+
+Expressions are immutable once built, except for the ones holding lists (list displays and variadic operations) and
+the ones containing such expressions. Constructing any other expression returns the unique (interned) instance
+structurally equal to it. Interned expressions cache their hash value, their string representation and their set of
+identifiers on the node and compare equal to themselves by identity, before falling back to the structural comparison.
+"""
+
+CACHED = frozenset({'_interned', '_hash', '_str', '_ids'})     # attributes that are caches rather than fields
+_INTERNED = WeakValueDictionary()   # type: Dict[Tuple, Expression]
+
+
+def iter_all_fields(expr: 'Expression'):
+    """Yield a tuple of ``(fieldname, value)`` for each field of an expression (but none of its cached attributes)."""
+    for name in expr._fields:
+        yield name, getattr(expr, name)
+    if hasattr(expr, '__dict__'):     # expression classes defined without slots
+        yield from expr.__dict__.items()
+
+
+def _key(expr: 'Expression'):
+    """Interning key of an expression, or ``None`` if the expression cannot be interned."""
+    key = [type(expr)]
+    for _, field in iter_all_fields(expr):
+        if isinstance(field, list) or isinstance(field, Expression) and not field._interned:
+            return None
+        key.append(field)
+    return tuple(key)
+
+
+def intern(expr: 'Expression') -> 'Expression':
+    """Get the interned expression structurally equal to the given expression.
+
+    :param expr: expression to be interned
+    :return: the unique interned instance equal to the expression (the expression itself if it cannot be interned)
+    """
+    key = _key(expr)
+    if key is None:
+        return expr
+    interned = _INTERNED.get(key)
+    if interned is None:
+        expr._interned = True
+        _INTERNED[key] = interned = expr
+    return interned
+
+
+def is_interned(expr: 'Expression') -> bool:
+    """Whether an expression is interned (and hence immutable and suitable as key of memoised results)."""
+    return expr._interned
+
+
+def _copy(expr: 'Expression', fields) -> 'Expression':
+    """New (not yet interned) expression of the same class as the given expression with the given fields."""
+    result = object.__new__(type(expr))
+    for name, field in fields:
+        setattr(result, name, field)
+    result._interned = False
+    result._hash = result._str = result._ids = None
+    return result
+
+
+def rebuild(expr: 'Expression', fields: dict) -> 'Expression':
+    """Copy of an expression with some of its fields replaced.
+
+    :param expr: expression to be copied
+    :param fields: new values of the replaced fields
+    :return: the (interned if possible) copy of the expression
+    """
+    return intern(_copy(expr, ((name, fields.get(name, field)) for name, field in iter_all_fields(expr))))
+
+
+def _identity_first(eq):
+    @wraps(eq)
+    def __eq__(self, other):
+        return self is other or eq(self, other)
+
+    return __eq__
+
+
+def _cached(attribute: str, method):
+    @wraps(method)
+    def cached(self):
+        value = getattr(self, attribute)
+        if value is None:
+            value = method(self)
+            if self._interned:
+                setattr(self, attribute, value)
+        return value
+
+    return cached
+
+
+class ExpressionMeta(ABCMeta):
+    """Metaclass of expressions, implementing hash-consing.
+
+    Expression classes declare their fields as ``__slots__``. The names of all fields of a class (but none of the
+    cached attributes) are collected in ``_fields``.
+    """
+
+    def __new__(mcs, name, bases, namespace, **kwargs):
+        for attribute, method in (('_hash', '__hash__'), ('_str', '__str__')):
+            function = namespace.get(method)
+            if function and not getattr(function, '__isabstractmethod__', False):
+                namespace[method] = _cached(attribute, function)
+        function = namespace.get('__eq__')
+        if function and not getattr(function, '__isabstractmethod__', False):
+            namespace['__eq__'] = _identity_first(function)
+        cls = super().__new__(mcs, name, bases, namespace, **kwargs)
+        slots = (slot for base in reversed(cls.__mro__) for slot in base.__dict__.get('__slots__', ()))
+        cls._fields = tuple(slot for slot in slots if slot not in CACHED and slot != '__weakref__')
+        return cls
+
+    def __call__(cls, *args, **kwargs):
+        return intern(super().__call__(*args, **kwargs))
+
+
+class Expression(metaclass=ExpressionMeta):
+    __slots__ = ('_typ', '_interned', '_hash', '_str', '_ids', '__weakref__')
+    _child_fields = ()  # names of the fields holding the child expressions (or lists of child expressions)
 
-class Expression(metaclass=ABCMeta):
     def __init__(self, typ):
         """Expression representation.
         https://docs.python.org/3.4/reference/expressions.html
@@ -16,6 +137,8 @@ class Expression(metaclass=ABCMeta):
         :param typ: type of the expression 
         """
         self._typ = typ
+        self._interned = False
+        self._hash = self._str = self._ids = None
 
     @property
     def typ(self):
@@ -49,16 +172,42 @@ class Expression(metaclass=ABCMeta):
         :return: string representing the expression
         """
 
+    def __copy__(self):
+        if self._interned:
+            return self
+        return _copy(self, iter_all_fields(self))
+
+    def __deepcopy__(self, memo):
+        if self._interned:
+            return self     # interned expressions are immutable and can be shared
+        from copy import deepcopy
+        result = memo[id(self)] = _copy(self, ())
+        for name, field in iter_all_fields(self):
+            setattr(result, name, deepcopy(field, memo))
+        return result
+
     def ids(self) -> Set['Expression']:
         """Identifiers that appear in the expression.
         
         :return: set of identifiers that appear in the expression
         """
-        from core.expressions_tools import walk
-        ids = set()
-        for e in walk(self):
-            if isinstance(e, VariableIdentifier):
-                ids.add(e)
+        ids = self._ids
+        if ids is None:
+            from core.expressions_tools import iter_child_exprs
+            found = set()
+            todo = [self]
+            while todo:     # without recursion, reusing the identifiers cached on the subexpressions
+                expr = todo.pop()
+                cached = expr._ids
+                if cached is not None:
+                    found.update(cached)
+                elif isinstance(expr, VariableIdentifier):
+                    found.add(expr)
+                else:
+                    todo.extend(iter_child_exprs(expr))
+            ids = frozenset(found)
+            if self._interned:
+                self._ids = ids
         return ids
 
 
@@ -69,6 +218,8 @@ https://docs.python.org/3.4/reference/expressions.html#atoms
 
 
 class Literal(Expression):
+    __slots__ = ('_val',)
+
     def __init__(self, typ, val: str):
         """Literal expression representation.
         https://docs.python.org/3.4/reference/expressions.html#literals
@@ -97,6 +248,8 @@ class Literal(Expression):
 
 
 class Input(Expression):
+    __slots__ = ()
+
     def __init__(self, typ):
         """Input expression representation.
 
@@ -115,6 +268,8 @@ class Input(Expression):
 
 
 class ListInput(Expression):
+    __slots__ = ()
+
     def __init__(self, typ):
         """List input expression representation.
 
@@ -133,6 +288,8 @@ class ListInput(Expression):
 
 
 class Identifier(Expression):
+    __slots__ = ('_name',)
+
     def __init__(self, typ, name: str):
         """Identifier expression representation.
         https://docs.python.org/3.4/reference/expressions.html#atom-identifiers
@@ -158,6 +315,8 @@ class Identifier(Expression):
 
 
 class VariableIdentifier(Identifier):
+    __slots__ = ()
+
     def __init__(self, typ, name: str):
         """Variable identifier expression representation.
         
@@ -173,6 +332,9 @@ class ListDisplay(Expression):
     https://docs.python.org/3/reference/expressions.html#list-displays
     """
 
+    __slots__ = ('_items',)
+    _child_fields = ('_items',)
+
     def __init__(self, typ=type(list), items: Sequence = None):
         """List display representation
         
@@ -208,6 +370,9 @@ class AttributeReference(Expression):
     https://docs.python.org/3.4/reference/expressions.html#attribute-references
     """
 
+    __slots__ = ('_primary', '_attribute')
+    _child_fields = ('_primary', '_attribute')
+
     def __init__(self, typ, primary: Expression, attribute: Identifier):
         """Attribute reference expression representation.
         
@@ -241,6 +406,9 @@ class Slice(Expression):
     """Slice (list/dictionary access) representation.
     """
 
+    __slots__ = ('_target', '_lower', '_step', '_upper')
+    _child_fields = ('_target', '_lower', '_step', '_upper')
+
     def __init__(self, typ, target: Expression, lower: Expression, step: Expression, upper: Expression):
         """Slice (list/dictionary access) representation.
 
@@ -290,6 +458,9 @@ class Index(Expression):
     """Index (list/dictionary access) representation.
     """
 
+    __slots__ = ('_target', '_index')
+    _child_fields = ('_target', '_index')
+
     def __init__(self, typ, target: Expression, index: Expression):
         """Index  (list/dictionary access) representation.
 
@@ -325,8 +496,8 @@ Generic Operation Expressions
 """
 
 
-class Operation(Expression, metaclass=ABCMeta):
-    pass
+class Operation(Expression, metaclass=ExpressionMeta):
+    __slots__ = ()
 
 
 """
@@ -345,6 +516,9 @@ class UnaryOperation(Operation):
             :return: string representing the operator
             """
 
+    __slots__ = ('_operator', '_expression')
+    _child_fields = ('_expression',)
+
     def __init__(self, typ, operator: Operator, expression: Expression):
         """Unary operation expression representation.
         
@@ -400,6 +574,8 @@ class UnaryArithmeticOperation(UnaryOperation):
             elif self.value == -1:
                 return "-"
 
+    __slots__ = ()
+
     def __init__(self, typ, operator: Operator, expression: Expression):
         """Unary arithmetic operation expression representation.
         
@@ -424,6 +600,8 @@ class UnaryBooleanOperation(UnaryOperation):
             if self.value == 1:
                 return "not"
 
+    __slots__ = ()
+
     def __init__(self, typ, operator: Operator, expression: Expression):
         """Unary boolean operation expression representation.
         
@@ -450,6 +628,9 @@ class BinaryOperation(Operation):
             :return: string representing the operator
             """
 
+    __slots__ = ('_left', '_operator', '_right')
+    _child_fields = ('_left', '_right')
+
     def __init__(self, typ, left: Expression, operator: Operator, right: Expression):
         """Binary operation expression representation.
         
@@ -514,6 +695,8 @@ class BinaryArithmeticOperation(BinaryOperation):
             elif self.value == 4:
                 return "/"
 
+    __slots__ = ()
+
     def __init__(self, typ, left: Expression, operator: Operator, right: Expression):
         """Binary arithmetic operation expression representation.
         
@@ -540,6 +723,8 @@ class BinaryBooleanOperation(BinaryOperation):
         def __str__(self):
             return self.name.lower()
 
+    __slots__ = ()
+
     def __init__(self, typ, left: Expression, operator: Operator, right: Expression):
         """Binary boolean operation expression representation.
 
@@ -612,6 +797,8 @@ class BinaryComparisonOperation(BinaryOperation):
         Operator.NotIn: Operator.In
     }
 
+    __slots__ = ()
+
     def __init__(self, typ, left: Expression, operator: Operator, right: Expression):
         """Binary comparison operation expression representation.
 
@@ -1,18 +1,22 @@
 from copy import deepcopy
 from functools import reduce
+from inspect import isgeneratorfunction
 
-from core.expressions import Expression, UnaryBooleanOperation, BinaryBooleanOperation, BinaryComparisonOperation, \
-    BinaryArithmeticOperation, Literal, UnaryArithmeticOperation
+from typing import Dict, List, Tuple
+from weakref import WeakKeyDictionary
+
+from core.expressions import is_interned, rebuild, Expression, UnaryBooleanOperation, BinaryBooleanOperation, \
+    BinaryComparisonOperation, BinaryArithmeticOperation, Literal, UnaryArithmeticOperation, VariableIdentifier
 from core.special_expressions import VariadicArithmeticOperation
 
 
 def iter_fields(expr: Expression):
     """
-    Yield a tuple of ``(fieldname, value)`` for each field in ``expr._fields``
-    that is present on *expr*.
+    Yield a tuple of ``(fieldname, value)`` for each field in ``expr._child_fields``,
+    i.e., for each field that may hold child expressions.
     """
-    for name, field in expr.__dict__.items():
-        yield name, field
+    for name in expr._child_fields:
+        yield name, getattr(expr, name)
 
 
 def iter_child_exprs(expr: Expression):
@@ -20,7 +24,8 @@ def iter_child_exprs(expr: Expression):
     Yield all direct child expressions of *expr*, that is, all fields that are expressions
     and all items of fields that are lists of expressions.
     """
-    for _, field in iter_fields(expr):
+    for name in expr._child_fields:
+        field = getattr(expr, name)
         if isinstance(field, Expression):
             yield field
         elif isinstance(field, list):
@@ -43,7 +48,38 @@ def walk(expr: Expression):
         yield expr
 
 
-class ExpressionVisitor:
+class Visit:
+    """Request of a visitor function to visit a child expression with other arguments than its own.
+
+    See :class:`ExpressionVisitor` for visitor functions that are generators.
+    """
+    __slots__ = ('expr', 'args', 'kwargs')
+
+    def __init__(self, expr: Expression, *args, **kwargs):
+        self.expr = expr
+        self.args = args
+        self.kwargs = kwargs
+
+
+class VisitorMeta(type):
+    """Metaclass of expression visitors, building the dispatch table of a visitor class once at class creation."""
+
+    def __init__(cls, name, bases, namespace, **kwargs):
+        super().__init__(name, bases, namespace, **kwargs)
+        functions = dict()
+        for attribute in dir(cls):
+            if attribute.startswith('visit_'):
+                function = getattr(cls, attribute)
+                functions[attribute[len('visit_'):]] = (function, isgeneratorfunction(function))
+        # the generic visit of the visitor classes below is a generator, unless it is overridden
+        owner = next(base for base in cls.__mro__ if 'generic_visit' in base.__dict__)
+        generic = owner.__dict__.get('_generic_visit', owner.__dict__['generic_visit'])
+        cls._functions = functions  # type: Dict[str, Tuple[callable, bool]]
+        cls._generic = (generic, isgeneratorfunction(generic))
+        cls._dispatch = dict()  # type: Dict[type, Tuple[callable, bool]]
+
+
+class ExpressionVisitor(metaclass=VisitorMeta):
     """
     An expression visitor base class that walks the expression tree and calls a
     visitor function for every expression found.  This function may return a value
@@ -57,6 +93,19 @@ class ExpressionVisitor:
     be `visit_TryFinally`.  This behavior can be changed by overriding
     the `visit` method.  If no visitor function exists for a node
     (return value `None`) the `generic_visit` visitor is used instead.
+    The visitor functions of a visitor class are looked up once per class of nodes.
+
+    A visitor function that calls `visit` on the children of a node recurses into the expression tree. Alternatively,
+    a visitor function can be a generator that yields the children to be visited and receives their results, e.g.::
+
+       def visit_BinaryArithmeticOperation(self, expr, *args, **kwargs):
+           left = yield expr.left
+           right = yield expr.right
+           return left + right
+
+    A child is visited with the same arguments as its parent, unless it is yielded as :class:`Visit` with other
+    arguments. Generators are run on an explicit stack instead of the call stack, so (arbitrarily) deep expressions do
+    not hit the recursion limit. The `generic_visit` visitor is such a generator.
 
     Don't use the `NodeVisitor` if you want to apply changes to expression during
     traversing.  For this a special visitor exists (`ExpressionTransformer`) that
@@ -67,20 +116,57 @@ class ExpressionVisitor:
 
     def visit(self, expr, *args, **kwargs):
         """Visit an expression."""
-        method = 'visit_' + expr.__class__.__name__
-        visitor = getattr(self, method, self.generic_visit)
-        return visitor(expr, *args, **kwargs)
+        function, generator = self._dispatch.get(type(expr)) or self._function(type(expr))
+        if generator:
+            return self._run(function(self, expr, *args, **kwargs), args, kwargs)
+        return function(self, expr, *args, **kwargs)
+
+    @classmethod
+    def _function(cls, typ: type):
+        """Look up (and remember) the visitor function for expressions of the given class."""
+        function = cls._dispatch[typ] = cls._functions.get(typ.__name__, cls._generic)
+        return function
+
+    def _run(self, generator, args, kwargs):
+        """Run a generator visitor function, visiting the children it yields on an explicit stack."""
+        stack = [(generator, args, kwargs)]
+        result, error = None, None
+        while stack:
+            generator, args, kwargs = stack[-1]
+            try:
+                child = generator.throw(error) if error else generator.send(result)
+            except StopIteration as stop:
+                stack.pop()
+                result, error = stop.value, None
+                continue
+            except Exception as e:
+                stack.pop()
+                if not stack:
+                    raise
+                result, error = None, e
+                continue
+            if isinstance(child, Visit):
+                child, args, kwargs = child.expr, child.args, child.kwargs
+            function, generator = self._dispatch.get(type(child)) or self._function(type(child))
+            try:
+                result = function(self, child, *args, **kwargs)
+            except Exception as e:
+                result, error = None, e
+                continue
+            if generator:
+                stack.append((result, args, kwargs))
+                result = None
+        return result
 
     def generic_visit(self, expr, *args, **kwargs):
         """Called if no explicit visitor function exists for an expression."""
+        return self._run(self._generic_visit(expr, *args, **kwargs), args, kwargs)
+
+    # noinspection PyUnusedLocal
+    def _generic_visit(self, expr, *args, **kwargs):
         last_result = None
-        for name, field in iter_fields(expr):
-            if isinstance(field, Expression):
-                last_result = self.visit(field, *args, **kwargs)
-            elif isinstance(field, list):
-                for item in field:
-                    if isinstance(item, Expression):
-                        last_result = self.visit(item, *args, **kwargs)
+        for child in iter_child_exprs(expr):
+            last_result = yield child
         return last_result
 
     def run(self, expr, *args, **kwargs):
@@ -122,12 +208,14 @@ class ExpressionTransformer(ExpressionVisitor):
                ), node)
 
     Keep in mind that if the expression you're operating on has child nodes you must either transform the child 
-    expressions yourself by calling :meth:`visit` on child nodes or call the :meth:`generic_visit` method for the 
-    current expression. 
+    expressions yourself by calling :meth:`visit` on child nodes (or yielding them) or call the :meth:`generic_visit`
+    method for the current expression. 
 
     For expressions that were part of a collection of expressions, the visitor may also return a list of expressions 
     rather than just a single expression. 
 
+    Expressions are never modified in place: an expression whose children are replaced is rebuilt.
+
     Usually you use the transformer like this::
 
        node = YourTransformer().visit(node)
@@ -136,26 +224,31 @@ class ExpressionTransformer(ExpressionVisitor):
     """
 
     def generic_visit(self, expr, *args, **kwargs):
+        return self._run(self._generic_visit(expr, *args, **kwargs), args, kwargs)
+
+    # noinspection PyUnusedLocal
+    def _generic_visit(self, expr, *args, **kwargs):
+        changes = dict()
         for field, old_value in iter_fields(expr):
             if isinstance(old_value, list):
                 new_values = []
                 for value in old_value:
                     if isinstance(value, Expression):
-                        value = self.visit(value, *args, **kwargs)
+                        value = yield value
                         if value is None:
                             continue
                         elif not isinstance(value, Expression):
                             new_values.extend(value)
                             continue
                     new_values.append(value)
-                old_value[:] = new_values
+                if len(new_values) != len(old_value) or any(n is not o for n, o in zip(new_values, old_value)):
+                    changes[field] = new_values
             elif isinstance(old_value, Expression):
-                new_node = self.visit(old_value, *args, **kwargs)
-                if new_node is None:
-                    delattr(expr, field)
-                else:
-                    setattr(expr, field, new_node)
-        return expr
+                new_node = yield old_value
+                if new_node is not old_value:
+                    changes[field] = new_node
+        # expressions are shared (see hash-consing in core.expressions), changed ones are rebuilt rather than mutated
+        return rebuild(expr, changes) if changes else expr
 
 
 Sign = UnaryArithmeticOperation.Operator
@@ -163,105 +256,186 @@ PLUS = Sign.Add
 MINUS = Sign.Sub
 
 
-# noinspection PyPep8Naming
-class Simplifier(ExpressionVisitor):
+class NotPolynomialError(ValueError):
+    pass
+
+
+class Polynomial:
+    """Canonical normal form of an (integer) arithmetic expression: a sparse polynomial with integer coefficients.
+
+    A polynomial maps monomials to their (never zero) coefficients. A monomial is a tuple of pairs of a variable and
+    its (positive) exponent, sorted by variable name. The empty monomial ``()`` is the monomial of the constant term.
+    Structurally different expressions with the same polynomial are equal, e.g. ``-(c - 3) * (3 + 4)`` and
+    ``21 - 7 * c``. Polynomials are immutable.
+    """
+
+    def __init__(self, terms: Dict[Tuple, int] = None):
+        self._terms = terms or {}
+
     @staticmethod
-    def _ensure_expr(constant):
-        if isinstance(constant, int):
-            const_expr = Literal(int, str(abs(constant)))
-            if constant < 0:
-                const_expr = UnaryArithmeticOperation(int, MINUS, const_expr)
-            return const_expr
-        else:
-            return constant
+    def _frozen(terms: Dict[Tuple, int]) -> 'Polynomial':
+        """Polynomial of accumulated terms (taking ownership of the mapping), without the zero coefficients."""
+        for monomial in [monomial for monomial, coefficient in terms.items() if not coefficient]:
+            del terms[monomial]
+        return Polynomial(terms)
 
-    def generic_visit(self, expr, *args, **kwargs):
-        return expr
+    @staticmethod
+    def _accumulate(terms: Dict[Tuple, int], monomial: Tuple, coefficient: int):
+        terms[monomial] = terms.get(monomial, 0) + coefficient
 
-    # noinspection PyMethodMayBeStatic
-    def visit_Literal(self, expr: Literal):
-        if expr.typ == int:
-            return int(expr.val)
-        else:
-            return expr
+    @staticmethod
+    def constant(constant: int) -> 'Polynomial':
+        return Polynomial({(): constant} if constant else None)
 
-    def visit_UnaryArithmeticOperation(self, expr: UnaryArithmeticOperation, *args, **kwargs):
-        if expr.operator == MINUS:
-            res = self.visit(expr.expression, *args, **kwargs)
-            if isinstance(res, int):
-                return -res
+    @staticmethod
+    def variable(variable: VariableIdentifier) -> 'Polynomial':
+        return Polynomial({((variable, 1),): 1})
 
-        return expr
+    @staticmethod
+    def from_expression(expr: Expression) -> 'Polynomial':
+        """Normal form of an arithmetic expression, in time linear in the size of the expression if it is linear.
+
+        :raises NotPolynomialError: if the expression is not a polynomial (e.g., contains a division or an input)
+        """
+        terms = dict()
+        Polynomial._visitor.visit(expr, terms, 1)
+        return Polynomial._frozen(terms)
+
+    @property
+    def terms(self):
+        """Mapping from the monomials of the polynomial to their coefficients."""
+        return self._terms
+
+    def is_constant(self) -> bool:
+        return all(not monomial for monomial in self.terms)
+
+    def degree(self) -> int:
+        return max((sum(exponent for _, exponent in monomial) for monomial in self.terms), default=0)
+
+    def __eq__(self, other: 'Polynomial'):
+        return isinstance(other, Polynomial) and self.terms == other.terms
+
+    def __hash__(self):
+        return hash(frozenset(self.terms.items()))
+
+    def __add__(self, other: 'Polynomial') -> 'Polynomial':
+        terms = dict(self.terms)
+        for monomial, coefficient in other.terms.items():
+            coefficient += terms.get(monomial, 0)
+            if coefficient:
+                terms[monomial] = coefficient
+            else:
+                del terms[monomial]
+        return Polynomial(terms)
 
-    def _collect_constants(self, operator, operands, *args, **kwargs):
-        if operator == BinaryArithmeticOperation.Operator.Add:
-            constant = 0
-            variable_operands = []
-            for operand in operands:
-                res = self.visit(operand, *args, **kwargs)
-                if isinstance(res, int):
-                    constant += int(res)
-                else:
-                    variable_operands.append(res)
-
-            return variable_operands, constant
-        elif operator == BinaryArithmeticOperation.Operator.Sub:
-            constant = 0
-            variable_operands = []
-            for i, operand in enumerate(operands):
-                res = self.visit(operand, *args, **kwargs)
-                if isinstance(res, int):
-                    if i == 0:
-                        constant += int(res)
-                    else:
-                        constant -= int(res)
-                else:
-                    variable_operands.append(res)
-
-                return variable_operands, constant
-        elif operator == BinaryArithmeticOperation.Operator.Mult:
-            constant = 1
-            variable_operands = []
-            for operand in operands:
-                res = self.visit(operand, *args, **kwargs)
-                if isinstance(res, int):
-                    constant *= int(res)
-                else:
-                    variable_operands.append(res)
+    def __neg__(self) -> 'Polynomial':
+        return Polynomial({monomial: -coefficient for monomial, coefficient in self.terms.items()})
 
-            return variable_operands, constant
-        else:
-            return None
+    def __sub__(self, other: 'Polynomial') -> 'Polynomial':
+        return self + (-other)
 
-    def visit_VariadicArithmeticOperation(self, expr: VariadicArithmeticOperation, *args, **kwargs):
-        res = self._collect_constants(expr.operator, expr.operands, *args, **kwargs)
-        if res:
-            variable_operands, constant = res
-            if not variable_operands:
-                return constant
+    def __mul__(self, other: 'Polynomial') -> 'Polynomial':
+        terms = dict()
+        for monomial1, coefficient1 in self.terms.items():
+            for monomial2, coefficient2 in other.terms.items():
+                Polynomial._accumulate(terms, Polynomial._multiply(monomial1, monomial2), coefficient1 * coefficient2)
+        return Polynomial._frozen(terms)
+
+    @staticmethod
+    def _multiply(monomial1: Tuple, monomial2: Tuple) -> Tuple:
+        exponents = dict(monomial1)
+        for variable, exponent in monomial2:
+            exponents[variable] = exponents.get(variable, 0) + exponent
+        return tuple(sorted(exponents.items(), key=lambda item: item[0].name))
+
+    def _sorted_terms(self):
+        """Terms ordered by their variables (names and exponents), with the constant term last."""
+        return sorted(self.terms.items(), key=lambda term: (not term[0], [(v.name, e) for v, e in term[0]]))
+
+    def to_expression(self, typ=int) -> Expression:
+        """Canonical expression of the polynomial: a sum of products of a coefficient and variables."""
+        summands = []
+        for monomial, coefficient in self._sorted_terms():
+            factors = [variable for variable, exponent in monomial for _ in range(exponent)]
+            if not factors or abs(coefficient) != 1:
+                factors.insert(0, Literal(typ, str(abs(coefficient))))
+            factor = VariadicArithmeticOperation(typ, BinaryArithmeticOperation.Operator.Mult, factors) \
+                if len(factors) > 1 else factors[0]
+            summands.append(UnaryArithmeticOperation(typ, MINUS, factor) if coefficient < 0 else factor)
+        if not summands:
+            return Literal(typ, '0')
+        elif len(summands) == 1:
+            return summands[0]
+        return VariadicArithmeticOperation(typ, BinaryArithmeticOperation.Operator.Add, summands)
+
+    def __str__(self):
+        return str(self.to_expression())
+
+    # noinspection PyPep8Naming
+    class Visitor(ExpressionVisitor):
+        """A visitor adding the normal form of an arithmetic expression, scaled by a coefficient, to the terms of a
+        polynomial under construction (a mutable mapping from monomials to coefficients)."""
+
+        # noinspection PyMethodMayBeStatic
+        def visit_Literal(self, expr: Literal, terms: Dict[Tuple, int], coefficient: int):
+            if expr.typ != int:
+                raise NotPolynomialError(f"Literal type {expr.typ} is not supported!")
+            Polynomial._accumulate(terms, (), coefficient * int(expr.val))
+
+        # noinspection PyMethodMayBeStatic
+        def visit_VariableIdentifier(self, expr: VariableIdentifier, terms: Dict[Tuple, int], coefficient: int):
+            Polynomial._accumulate(terms, ((expr, 1),), coefficient)
+
+        def visit_UnaryArithmeticOperation(self, expr: UnaryArithmeticOperation, terms: Dict[Tuple, int],
+                                           coefficient: int):
+            yield Visit(expr.expression, terms, -coefficient if expr.operator == MINUS else coefficient)
+
+        def visit_BinaryArithmeticOperation(self, expr: BinaryArithmeticOperation, terms: Dict[Tuple, int],
+                                            coefficient: int):
+            yield from self._combine(expr.operator, [expr.left, expr.right], terms, coefficient)
+
+        def visit_VariadicArithmeticOperation(self, expr: VariadicArithmeticOperation, terms: Dict[Tuple, int],
+                                              coefficient: int):
+            yield from self._combine(expr.operator, expr.operands, terms, coefficient)
+
+        @staticmethod
+        def _combine(operator: BinaryArithmeticOperation.Operator, operands: List[Expression],
+                     terms: Dict[Tuple, int], coefficient: int):
+            """Visit the operands of a (left-associative) operation, adding their sums directly to the terms."""
+            if operator == BinaryArithmeticOperation.Operator.Add:
+                for operand in operands:
+                    yield Visit(operand, terms, coefficient)
+            elif operator == BinaryArithmeticOperation.Operator.Sub:
+                yield Visit(operands[0], terms, coefficient)
+                for operand in operands[1:]:
+                    yield Visit(operand, terms, -coefficient)
+            elif operator == BinaryArithmeticOperation.Operator.Mult:
+                # products are not linear: multiply the normal forms of the factors
+                product = Polynomial.constant(coefficient)
+                for operand in operands:
+                    factor = dict()
+                    yield Visit(operand, factor, 1)
+                    product = product * Polynomial._frozen(factor)
+                for monomial, product_coefficient in product.terms.items():
+                    Polynomial._accumulate(terms, monomial, product_coefficient)
             else:
-                return VariadicArithmeticOperation(expr.typ, expr.operator,
-                                                   variable_operands + [self._ensure_expr(constant)])
-        else:
-            return expr
+                raise NotPolynomialError(f"Binary operator '{str(operator)}' is not supported!")
 
-    def visit_BinaryArithmeticOperation(self, expr: BinaryArithmeticOperation, *args, **kwargs):
-        res = self._collect_constants(expr.operator, [expr.left, expr.right], *args, **kwargs)
-        if res:
-            variable_operands, constant = res
-            return VariadicArithmeticOperation(expr.typ, expr.operator,
-                                               variable_operands + [self._ensure_expr(constant)])
-        else:
-            return expr
+        def generic_visit(self, expr, *args, **kwargs):
+            raise NotPolynomialError(f"Expression {expr} of type {type(expr)} is not a polynomial!")
 
-    def finalize_result(self, result):
-        return self._ensure_expr(result)
+    _visitor = Visitor()  # static class member shared between all instances
 
 
 def simplify(expr: Expression):
-    expr = expand(expr)
-    expr = Simplifier().run(expr)
-    return expr
+    """Simplify an arithmetic expression to the canonical expression of its normal form (see :class:`Polynomial`).
+
+    Expressions that are not polynomials are returned unchanged.
+    """
+    try:
+        return Polynomial.from_expression(expr).to_expression(expr.typ)
+    except NotPolynomialError:
+        return expr
 
 
 # noinspection PyPep8Naming
@@ -274,28 +448,28 @@ class NotFreeConditionTransformer(ExpressionTransformer):
 
     def visit_UnaryBooleanOperation(self, expr: UnaryBooleanOperation, invert=False):
         if expr.operator == UnaryBooleanOperation.Operator.Neg:
-            return self.visit(expr.expression, invert=not invert)  # double inversion cancels itself
+            return (yield Visit(expr.expression, invert=not invert))  # double inversion cancels itself
         else:
             raise NotImplementedError()
 
     def visit_BinaryBooleanOperation(self, expr: BinaryBooleanOperation, invert=False):
         if invert:
             if expr.operator == BinaryBooleanOperation.Operator.And:
-                return BinaryBooleanOperation(expr.typ, self.visit(expr.left, invert=True),
+                return BinaryBooleanOperation(expr.typ, (yield Visit(expr.left, invert=True)),
                                               BinaryBooleanOperation.Operator.Or,
-                                              self.visit(expr.right, invert=True))
+                                              (yield Visit(expr.right, invert=True)))
             elif expr.operator == BinaryBooleanOperation.Operator.Or:
-                return BinaryBooleanOperation(expr.typ, self.visit(expr.left, invert=True),
+                return BinaryBooleanOperation(expr.typ, (yield Visit(expr.left, invert=True)),
                                               BinaryBooleanOperation.Operator.And,
-                                              self.visit(expr.right, invert=True))
+                                              (yield Visit(expr.right, invert=True)))
             elif expr.operator == BinaryBooleanOperation.Operator.Xor:
                 # use not(a xor b) == (a and b) or (not(a) and not(b))
-                cond_both = BinaryBooleanOperation(expr.typ, self.visit(deepcopy(expr.left), invert=False),
+                cond_both = BinaryBooleanOperation(expr.typ, (yield Visit(deepcopy(expr.left), invert=False)),
                                                    BinaryBooleanOperation.Operator.And,
-                                                   self.visit(deepcopy(expr.right), invert=False))
-                cond_none = BinaryBooleanOperation(expr.typ, self.visit(deepcopy(expr.left), invert=True),
+                                                   (yield Visit(deepcopy(expr.right), invert=False)))
+                cond_none = BinaryBooleanOperation(expr.typ, (yield Visit(deepcopy(expr.left), invert=True)),
                                                    BinaryBooleanOperation.Operator.And,
-                                                   self.visit(deepcopy(expr.right), invert=True))
+                                                   (yield Visit(deepcopy(expr.right), invert=True)))
                 return BinaryBooleanOperation(expr.typ, cond_both,
                                               BinaryBooleanOperation.Operator.Or,
                                               cond_none)
@@ -303,28 +477,41 @@ class NotFreeConditionTransformer(ExpressionTransformer):
             # get rid of xor also if not inverted!
             if expr.operator == BinaryBooleanOperation.Operator.Xor:
                 # use a xor b == (a or b) and not(a and b) == (a or b) and (not(a) or not(b))
-                cond_one = BinaryBooleanOperation(expr.typ, self.visit(deepcopy(expr.left), invert=False),
+                cond_one = BinaryBooleanOperation(expr.typ, (yield Visit(deepcopy(expr.left), invert=False)),
                                                   BinaryBooleanOperation.Operator.Or,
-                                                  self.visit(deepcopy(expr.right), invert=False))
+                                                  (yield Visit(deepcopy(expr.right), invert=False)))
                 cond_not_both = BinaryBooleanOperation(expr.typ,
-                                                       self.visit(deepcopy(expr.left), invert=True),
+                                                       (yield Visit(deepcopy(expr.left), invert=True)),
                                                        BinaryBooleanOperation.Operator.Or,
-                                                       self.visit(deepcopy(expr.right), invert=True))
+                                                       (yield Visit(deepcopy(expr.right), invert=True)))
                 return BinaryBooleanOperation(expr.typ, cond_one, BinaryBooleanOperation.Operator.And,
                                               cond_not_both)
             else:
-                return BinaryBooleanOperation(expr.typ, self.visit(expr.left),
+                return BinaryBooleanOperation(expr.typ, (yield Visit(expr.left)),
                                               expr.operator,
-                                              self.visit(expr.right))
+                                              (yield Visit(expr.right)))
 
     def visit_BinaryComparisonOperation(self, expr: BinaryComparisonOperation, invert=False):
-        return BinaryComparisonOperation(expr.typ, self.visit(expr.left),
+        return BinaryComparisonOperation(expr.typ, (yield Visit(expr.left)),
                                          expr.operator.reverse_operator() if invert else expr.operator,
-                                         self.visit(expr.right))
+                                         (yield Visit(expr.right)))
+
+
+# not-free forms of the interned conditions that are still alive, ``None`` for the conditions that are already
+# not-free (a value referring to its key would keep the key alive)
+_not_free_conditions = WeakKeyDictionary()  # type: Dict[Expression, Expression]
 
 
 def make_condition_not_free(expr: Expression):
-    return NotFreeConditionTransformer().visit(expr)
+    """Not-free form of a condition, memoised for interned conditions (e.g., the conditions of the CFG edges)."""
+    if not is_interned(expr):
+        return NotFreeConditionTransformer().visit(expr)
+    if expr in _not_free_conditions:
+        result = _not_free_conditions[expr]
+        return expr if result is None else result
+    result = NotFreeConditionTransformer().visit(expr)
+    _not_free_conditions[expr] = None if result is expr else result
+    return result
 
 
 # noinspection PyPep8Naming
@@ -349,8 +536,8 @@ class Expander(ExpressionVisitor):
             return reduce(lambda x, y: x == y, operators, operator)
 
         if expr.operator == BinaryArithmeticOperation.Operator.Add:
-            l = self.visit(expr.left, invert=invert)
-            r = self.visit(expr.right, invert=invert)
+            l = yield Visit(expr.left, invert=invert)
+            r = yield Visit(expr.right, invert=invert)
             if equal_operators(BinaryArithmeticOperation.Operator.Add, l, r):
                 return VariadicArithmeticOperation(expr.typ, BinaryArithmeticOperation.Operator.Add,
                                                    l.operands + r.operands)
@@ -358,8 +545,8 @@ class Expander(ExpressionVisitor):
                 # we can not combine the two sides into single variadic operator
                 return VariadicArithmeticOperation(expr.typ, BinaryArithmeticOperation.Operator.Add, [expr])
         elif expr.operator == BinaryArithmeticOperation.Operator.Sub:
-            l = self.visit(expr.left, invert=invert)
-            r = self.visit(expr.right, invert=not invert)
+            l = yield Visit(expr.left, invert=invert)
+            r = yield Visit(expr.right, invert=not invert)
             if equal_operators(BinaryArithmeticOperation.Operator.Add, l, r):
                 return VariadicArithmeticOperation(expr.typ, BinaryArithmeticOperation.Operator.Add,
                                                    l.operands + r.operands)
@@ -367,8 +554,8 @@ class Expander(ExpressionVisitor):
                 # we can not combine the two sides into single variadic operator
                 return VariadicArithmeticOperation(expr.typ, BinaryArithmeticOperation.Operator.Add, [expr])
         elif expr.operator == BinaryArithmeticOperation.Operator.Mult:
-            l = self.visit(expr.left)
-            r = self.visit(expr.right)
+            l = yield Visit(expr.left)
+            r = yield Visit(expr.right)
             if equal_operators(expr.operator, l, r):
                 l.operands += r.operands
                 return l
@@ -392,8 +579,7 @@ class Expander(ExpressionVisitor):
             raise NotImplementedError("Division not yet supported")
 
     def visit_UnaryArithmeticOperation(self, expr: UnaryArithmeticOperation, invert=False):
-        return self.visit(expr.expression,
-                          invert=(expr.operator == MINUS) != invert)
+        return (yield Visit(expr.expression, invert=(expr.operator == MINUS) != invert))
 
 
 # noinspection PyPep8Naming
@@ -404,7 +590,7 @@ class ExpanderCleanup(ExpressionTransformer):
     """
 
     def visit_VariadicArithmeticOperation(self, expr: VariadicArithmeticOperation, *args, **kwargs):
-        self.generic_visit(expr, *args, **kwargs)  # transform children first
+        expr = self.generic_visit(expr, *args, **kwargs)  # transform children first
         if len(expr.operands) == 1:
             return expr.operands[0]
         else:
@@ -4,6 +4,9 @@ from core.expressions import Expression, BinaryArithmeticOperation, Operation
 
 
 class VariadicArithmeticOperation(Operation):
+    __slots__ = ('_operator', '_operands')
+    _child_fields = ('_operands',)
+
     def __init__(self, typ, operator: BinaryArithmeticOperation.Operator,
                  operands: Union[List[Expression], type(None)] = None):
         """Variadic arithmetic operation.
@@ -40,3 +43,36 @@ class VariadicArithmeticOperation(Operation):
         string_list = [f"({str(operand)})" if isinstance(operand, Operation) else str(operand) for operand in
                        self.operands]
         return str(f" {str(self.operator)} ").join(string_list)
+
+
+class ExpressionSummary(Expression):
+    """Summary of a set of expressions that is too large to be represented explicitly.
+
+    The summary stands for any value of its type that may be computed from the summarised expressions:
+    numerical domains evaluate it to top, while its sub-expressions still account for the variables it reads.
+    """
+
+    __slots__ = ('_expressions',)
+    _child_fields = ('_expressions',)
+
+    def __init__(self, typ, expressions: List[Expression] = None):
+        """Summary of a set of expressions.
+
+        :param typ: type of the summarised expressions
+        :param expressions: (sub-)expressions read by the summarised expressions
+        """
+        super().__init__(typ)
+        self._expressions = expressions or []
+
+    @property
+    def expressions(self):
+        return self._expressions
+
+    def __eq__(self, other):
+        return (self.typ, self.expressions) == (other.typ, other.expressions)
+
+    def __hash__(self):
+        return hash((self.typ, str(self.expressions)))
+
+    def __str__(self):
+        return "summary({})".format(", ".join(str(expr) for expr in self.expressions))
@@ -1,10 +1,24 @@
 from abc import ABCMeta, abstractmethod
-from typing import List, Sequence
+from typing import List, Sequence, Dict, Tuple, FrozenSet
 
-from core.expressions import Literal, VariableIdentifier
+from core.expressions import Expression, Literal, VariableIdentifier
 
 
 class ProgramPoint:
+    __slots__ = ('_line', '_column', '_hash', '_str')
+    _interned = dict()  # type: Dict[Tuple[int, int], ProgramPoint]
+
+    def __new__(cls, line: int, column: int):
+        """Program points are interned: there is a unique program point per line and column."""
+        key = (line, column)
+        pp = ProgramPoint._interned.get(key)
+        if pp is None:
+            pp = super().__new__(cls)
+            pp._hash = hash(key)
+            pp._str = None
+            ProgramPoint._interned[key] = pp
+        return pp
+
     def __init__(self, line: int, column: int):
         """Program point representation.
         
@@ -23,10 +37,16 @@ class ProgramPoint:
         return self._column
 
     def __eq__(self, other: 'ProgramPoint'):
-        return (self.line, self.column) == (other.line, other.column)
+        return self is other or (self.line, self.column) == (other.line, other.column)
 
     def __hash__(self):
-        return hash((self.line, self.column))
+        return self._hash
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
 
     def __ne__(self, other: 'ProgramPoint'):
         return not (self == other)
@@ -39,7 +59,9 @@ class ProgramPoint:
 
         :return: string representing the program point
         """
-        return "[line:{0.line}, column:{0.column}]".format(self)
+        if self._str is None:
+            self._str = "[line:{0.line}, column:{0.column}]".format(self)
+        return self._str
 
 
 """
@@ -49,17 +71,29 @@ https://docs.python.org/3.4/reference/simple_stmts.html
 
 
 class Statement(metaclass=ABCMeta):
+    __slots__ = ('_pp', '_expressions')
+
     def __init__(self, pp: ProgramPoint):
         """Statement representation.
         
         :param pp: program point associated with the statement  
         """
         self._pp = pp
+        self._expressions = None
 
     @property
     def pp(self):
         return self._pp
 
+    @property
+    def expressions(self) -> FrozenSet[Expression]:
+        """Expressions the statement evaluates to, if they do not depend on the state (``None`` otherwise)."""
+        return self._expressions
+
+    @expressions.setter
+    def expressions(self, expressions: FrozenSet[Expression]):
+        self._expressions = expressions
+
     def __repr__(self):
         return str(self)
 
@@ -78,6 +112,8 @@ https://docs.python.org/3.4/reference/simple_stmts.html#expression-statements
 
 
 class LiteralEvaluation(Statement):
+    __slots__ = ('_literal',)
+
     def __init__(self, pp: ProgramPoint, literal: Literal):
         """Literal evaluation representation.
 
@@ -96,6 +132,8 @@ class LiteralEvaluation(Statement):
 
 
 class VariableAccess(Statement):
+    __slots__ = ('_var',)
+
     def __init__(self, pp: ProgramPoint, var: VariableIdentifier):
         """Variable access representation.
 
@@ -114,6 +152,8 @@ class VariableAccess(Statement):
 
 
 class Call(Statement):
+    __slots__ = ('_name', '_arguments', '_typ')
+
     def __init__(self, pp: ProgramPoint, name: str, arguments: List[Statement], typ):
         """Call statement representation.
         
@@ -144,6 +184,8 @@ class Call(Statement):
 
 
 class AttributeAccess(Statement):
+    __slots__ = ('_receiver', '_name', '_typ')
+
     def __init__(self, pp: ProgramPoint, receiver: Statement, name: str, typ):
         """Attribute access statement representation.
 
@@ -179,6 +221,8 @@ class Assignment(Statement):
     https://docs.python.org/3.4/reference/simple_stmts.html#assignment-statements
     """
 
+    __slots__ = ('_left', '_right')
+
     def __init__(self, pp: ProgramPoint, left: Statement, right: Statement):
         """Assignment statement representation.
 
@@ -208,6 +252,8 @@ class ListDisplayStmt(Statement):
     https://docs.python.org/3/reference/expressions.html#list-displays
     """
 
+    __slots__ = ('_items',)
+
     def __init__(self, pp: ProgramPoint, items: Sequence[Statement]):
         """List display statement representation.
 
@@ -229,6 +275,8 @@ class SliceStmt(Statement):
     """Slice statement (list/dictionary access) representation.
     """
 
+    __slots__ = ('_target', '_lower', '_step', '_upper')
+
     def __init__(self, pp: ProgramPoint, target: Statement, lower: Statement, step: Statement, upper: Statement):
         """Slice statement (list/dictionary access) representation.
 
@@ -271,6 +319,8 @@ class IndexStmt(Statement):
     """Index statement (list/dictionary access) representation.
     """
 
+    __slots__ = ('_target', '_index')
+
     def __init__(self, pp: ProgramPoint, target: Statement, index: Statement):
         """Index statement (list/dictionary access) representation.
 
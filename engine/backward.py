@@ -1,11 +1,12 @@
 from abstract_domains.state import State
 from collections import deque
 from copy import deepcopy
-from core.cfg import Basic, Loop, Conditional, ControlFlowGraph, Edge
+from core.cfg import Basic, Loop, Conditional, ControlFlowGraph, Edge, Node
 from engine.interpreter import Interpreter
 from engine.result import AnalysisResult
 from semantics.backward import BackwardSemantics
 from queue import Queue
+from typing import List
 
 
 class BackwardInterpreter(Interpreter):
@@ -21,6 +22,45 @@ class BackwardInterpreter(Interpreter):
     def semantics(self):
         return self._semantics
 
+    def propagate(self, edge: Edge, successor: State) -> State:
+        """Propagate a state backward along an edge.
+
+        :param edge: edge to propagate along
+        :param successor: entry state of the target of the edge (modified)
+        :return: state at the exit of the source of the edge
+        """
+        # handle non-default edges
+        if edge.kind == Edge.Kind.IF_IN:
+            successor = successor.exit_if()
+        elif edge.kind == Edge.Kind.IF_OUT:
+            successor = successor.enter_if()
+        elif edge.kind == Edge.Kind.LOOP_IN:
+            successor = successor.exit_loop()
+        elif edge.kind == Edge.Kind.LOOP_OUT:
+            successor = successor.enter_loop()
+        # handle conditional edges
+        if isinstance(edge, Conditional):
+            successor.next(edge.condition.pp, edge.kind)
+            successor = self.semantics.semantics(edge.condition, successor).filter()
+        return successor
+
+    def execute(self, node: Node, exit: State) -> List[State]:
+        """Execute the statements of a node backward.
+
+        :param node: node to execute
+        :param exit: exit state of the node (not modified)
+        :return: list of states before and after each statement of the node
+        """
+        states = deque([exit])
+        if isinstance(node, Basic):
+            successor = exit
+            for stmt in reversed(node.stmts):
+                successor = deepcopy(successor)
+                successor.next(stmt.pp)
+                successor = self.semantics.semantics(stmt, successor)
+                states.appendleft(successor)
+        return list(states)
+
     def analyze(self, initial: State) -> AnalysisResult:
 
         # prepare the worklist and iteration counts
@@ -35,7 +75,7 @@ class BackwardInterpreter(Interpreter):
 
             # retrieve the previous exit state of the node
             if current in self.result.nodes:
-                previous = deepcopy(self.result.get_node_result(current)[-1])
+                previous = deepcopy(self.result.get_node_exit(current))
             else:
                 previous = None
 
@@ -47,41 +87,17 @@ class BackwardInterpreter(Interpreter):
                 edges = self.cfg.out_edges(current)
                 for edge in edges:
                     if edge.target in self.result.nodes:
-                        successor = deepcopy(self.result.get_node_result(edge.target)[0])
+                        successor = deepcopy(self.result.get_node_entry(edge.target))
                     else:
                         successor = deepcopy(initial).bottom()
-                    # handle non-default edges
-                    if edge.kind == Edge.Kind.IF_IN:
-                        successor = successor.exit_if()
-                    elif edge.kind == Edge.Kind.IF_OUT:
-                        successor = successor.enter_if()
-                    elif edge.kind == Edge.Kind.LOOP_IN:
-                        successor = successor.exit_loop()
-                    elif edge.kind == Edge.Kind.LOOP_OUT:
-                        successor = successor.enter_loop()
-                    # handle conditional edges
-                    if isinstance(edge, Conditional):
-                        successor.next(edge.condition.pp, edge.kind)
-                        successor = self.semantics.semantics(edge.condition, successor).filter()
-                    entry = entry.join(successor)
+                    entry = entry.join(self.propagate(edge, successor))
                 # widening
                 if isinstance(current, Loop) and self.widening < iteration:
                     entry = deepcopy(previous).widening(entry)
 
             # check for termination and execute block
             if previous is None or not entry.less_equal(previous):
-                states = deque([entry])
-                if isinstance(current, Basic):
-                    successor = entry
-                    for stmt in reversed(current.stmts):
-                        successor = deepcopy(successor)
-                        successor.next(stmt.pp)
-                        successor = self.semantics.semantics(stmt, successor)
-                        states.appendleft(successor)
-                elif isinstance(current, Loop):
-                    # nothing to be done
-                    pass
-                self.result.set_node_result(current, list(states))
+                self.result.set_node_result(current, self.execute(current, entry))
                 # update worklist and iteration count
                 for node in self.cfg.predecessors(current):
                     worklist.put(node)
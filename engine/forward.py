@@ -1,21 +1,68 @@
+from abstract_domains.numerical.numerical import NumericalMixin
 from abstract_domains.state import State
-from collections import deque
 from copy import deepcopy
-from core.cfg import Basic, Loop, Conditional, ControlFlowGraph, Edge
+from core.cfg import Basic, Loop, Conditional, ControlFlowGraph, Edge, Node
 from engine.interpreter import Interpreter
-from engine.result import AnalysisResult
+from engine.result import AnalysisResult, LazyAnalysisResult
 from semantics.forward import ForwardSemantics
 from queue import Queue
+from typing import List
 
 
 class ForwardInterpreter(Interpreter):
-    def __init__(self, cfg: ControlFlowGraph, semantics: ForwardSemantics, widening: int):
+    def __init__(self, cfg: ControlFlowGraph, semantics: ForwardSemantics, widening: int,
+                 liveness: AnalysisResult = None, lazy: bool = False):
         """Forward control flow graph interpreter.
 
         :param cfg: control flow graph to analyze 
         :param widening: number of iterations before widening 
+        :param liveness: optional result of a live variable analysis of the control flow graph, 
+            used to project dead variables out of numerical states at block boundaries
+        :param lazy: whether to store only the entry state of each node in the result
+            (the other states are recomputed on demand)
         """
         super().__init__(cfg, semantics, widening)
+        self._liveness = liveness
+        if lazy:
+            self._result = LazyAnalysisResult(cfg, self.execute)
+
+    @property
+    def liveness(self):
+        return self._liveness
+
+    def project_dead(self, state: State, node: Node, index: int) -> State:
+        """Project the variables that are dead at a block boundary out of a numerical state.
+
+        :param state: state at the block boundary
+        :param node: current node
+        :param index: ``0`` for the entry and ``-1`` for the exit of the node
+        :return: state without the dead variables
+        """
+        if self.liveness is not None and isinstance(state, NumericalMixin) and node in self.liveness.nodes:
+            dead = self.liveness.get_node_result(node)[index].dead_variables()
+            if dead:
+                state.remove_variables(dead)
+        return state
+
+    def execute(self, node: Node, entry: State) -> List[State]:
+        """Execute the statements of a node.
+
+        :param node: node to execute
+        :param entry: entry state of the node (not modified)
+        :return: list of states before and after each statement of the node (with the dead variables projected out
+            of the exit state)
+        """
+        states = [entry]
+        if isinstance(node, Basic):
+            successor = entry
+            for stmt in node.stmts:
+                successor = deepcopy(successor)
+                successor.next(stmt.pp)
+                successor = self.semantics.semantics(stmt, successor)
+                states.append(successor)
+            if node.stmts:
+                self.project_dead(states[-1], node, -1)
+        return states
 
     def analyze(self, initial: State) -> AnalysisResult:
 
@@ -31,7 +78,7 @@ class ForwardInterpreter(Interpreter):
 
             # retrieve the previous entry state of the node
             if current in self.result.nodes:
-                previous = deepcopy(self.result.get_node_result(current)[0])
+                previous = deepcopy(self.result.get_node_entry(current))
             else:
                 previous = None
 
@@ -43,7 +90,7 @@ class ForwardInterpreter(Interpreter):
                 edges = self.cfg.in_edges(current)
                 for edge in edges:
                     if edge.source in self.result.nodes:
-                        predecessor = deepcopy(self.result.get_node_result(edge.source)[-1])
+                        predecessor = deepcopy(self.result.get_node_exit(edge.source))
                     else:
                         predecessor = deepcopy(initial).bottom()
                     # handle conditional edges
@@ -63,21 +110,11 @@ class ForwardInterpreter(Interpreter):
                 # widening
                 if isinstance(current, Loop) and self.widening < iteration:
                     entry = deepcopy(previous).widening(entry)
+            entry = self.project_dead(entry, current, 0)
 
             # check for termination and execute block
             if previous is None or not entry.less_equal(previous):
-                states = deque([entry])
-                if isinstance(current, Basic):
-                    successor = entry
-                    for stmt in current.stmts:
-                        successor = deepcopy(successor)
-                        successor.next(stmt.pp)
-                        successor = self.semantics.semantics(stmt, successor)
-                        states.append(successor)
-                elif isinstance(current, Loop):
-                    # nothing to be done
-                    pass
-                self.result.set_node_result(current, list(states))
+                self.result.set_node_result(current, self.execute(current, entry))
                 # update worklist and iteration count
                 for node in self.cfg.successors(current):
                     worklist.put(node)
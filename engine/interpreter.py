@@ -2,7 +2,7 @@ from abc import ABCMeta, abstractmethod
 from abstract_domains.state import State
 from core.cfg import ControlFlowGraph
 from engine.result import AnalysisResult
-from semantics.semantics import Semantics
+from semantics.semantics import Semantics, pre_evaluate
 
 
 class Interpreter(metaclass=ABCMeta):
@@ -12,7 +12,7 @@ class Interpreter(metaclass=ABCMeta):
         :param cfg: control flow graph to analyze
         :param widening: number of iterations before widening 
         """
-        self._result = AnalysisResult(cfg)
+        self._result = AnalysisResult(pre_evaluate(cfg))
         self._semantics = semantics
         self._widening = widening
 
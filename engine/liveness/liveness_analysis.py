@@ -1,9 +1,90 @@
 import ast
-from abstract_domains.liveness.liveness_domain import LivenessState
+from copy import deepcopy
+from queue import Queue
+from typing import List, Callable, Tuple
+from abstract_domains.liveness.liveness_domain import LivenessState, BitLivenessState
+from core.cfg import ControlFlowGraph
 from core.expressions import VariableIdentifier
 from engine.backward import BackwardInterpreter
+from engine.result import AnalysisResult
 from engine.runner import Runner
-from semantics.backward import DefaultBackwardSemantics
+from semantics.backward import BackwardSemantics, DefaultBackwardSemantics
+
+
+class BitLivenessInterpreter(BackwardInterpreter):
+    def __init__(self, cfg: ControlFlowGraph, semantics: BackwardSemantics):
+        """Backward control flow graph interpreter for the live variable analysis with bit vector states.
+
+        The statements of each node and the conditions of each edge are summarized once into a pair of *gen* and
+        *kill* masks: the variables they make live and the variables they make dead. The fixpoint is then computed
+        on plain integers, and the states before and after each statement are only computed once it is reached.
+
+        :param cfg: control flow graph to analyze
+        :param semantics: backward semantics to use
+        """
+        super().__init__(cfg, semantics, 0)
+
+    @staticmethod
+    def summarize(transformer: Callable[[BitLivenessState], BitLivenessState],
+                  initial: BitLivenessState) -> Tuple[int, int]:
+        """Summarize a liveness transformer into its gen and kill masks.
+
+        A liveness transformer maps a bit vector ``live`` to ``gen | (live & ~kill)``. Its masks are recovered by
+        applying it once to the bottom and once to the top state.
+
+        :param transformer: liveness transformer (modifying its argument)
+        :param initial: state to start from
+        :return: gen and kill masks of the transformer
+        """
+        top = deepcopy(initial).top()
+        gen = transformer(deepcopy(initial).bottom()).live
+        kill = top.live & ~transformer(deepcopy(top)).live
+        return gen, kill
+
+    def analyze(self, initial: BitLivenessState) -> AnalysisResult:
+
+        # summarize the nodes and the edges
+        nodes = dict()
+        for node in self.cfg.nodes.values():
+            nodes[node] = self.summarize(lambda state: self.execute(node, state)[0], initial)
+        edges = dict()
+        for node in self.cfg.nodes.values():
+            for edge in self.cfg.out_edges(node):
+                edges[edge] = self.summarize(lambda state: self.propagate(edge, state), initial)
+
+        # prepare the worklist
+        worklist = Queue()
+        worklist.put(self.cfg.out_node)
+        entries = dict()    # live variables at the entry of each node
+        exits = {self.cfg.out_node: initial.live}   # live variables at the exit of each node
+
+        while not worklist.empty():
+            current = worklist.get()  # retrieve the current node
+
+            # compute the current exit state of the current node
+            if current is not self.cfg.out_node:
+                live = 0
+                for edge in self.cfg.out_edges(current):
+                    gen, kill = edges[edge]
+                    live |= gen | (entries.get(edge.target, 0) & ~kill)
+                exits[current] = live
+
+            # check for termination and execute block
+            gen, kill = nodes[current]
+            entry = gen | (exits[current] & ~kill)
+            if current not in entries or entry != entries[current]:
+                entries[current] = entry
+                # update worklist
+                for node in self.cfg.predecessors(current):
+                    worklist.put(node)
+
+        # compute the states before and after each statement
+        for node, live in exits.items():
+            exit = deepcopy(initial)
+            exit.live = live
+            self.result.set_node_result(node, self.execute(node, exit))
+
+        return self.result
 
 
 class LivenessAnalysis(Runner):
@@ -15,3 +96,18 @@ class LivenessAnalysis(Runner):
         names = {nd.id for nd in ast.walk(self.tree) if isinstance(nd, ast.Name) and isinstance(nd.ctx, ast.Store)}
         variables = [VariableIdentifier(int, name) for name in names]
         return LivenessState(variables)
+
+
+def live_variables(cfg: ControlFlowGraph, variables: List[VariableIdentifier],
+                   semantics: BackwardSemantics = None) -> AnalysisResult:
+    """Run the live variable analysis as a pre-pass of a forward analysis.
+
+    The result can be passed to a ``ForwardInterpreter`` to project dead variables out of numerical states.
+
+    :param cfg: control flow graph to analyze
+    :param variables: variables whose liveness is of interest, variables that are not of type ``int`` are ignored
+    :param semantics: backward semantics to use, by default ``DefaultBackwardSemantics``
+    :return: result of the live variable analysis
+    """
+    interpreter = BitLivenessInterpreter(cfg, semantics or DefaultBackwardSemantics())
+    return interpreter.analyze(BitLivenessState([var for var in variables if var.typ == int]))
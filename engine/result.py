@@ -1,12 +1,20 @@
+from collections import OrderedDict
+from copy import deepcopy
 from itertools import zip_longest
-from typing import List
+from typing import List, Callable, Tuple
 
 from abstract_domains.state import State
 from core.cfg import Node, ControlFlowGraph, Edge, Conditional
 from core.statements import ProgramPoint
 
 
+# program point (and edge kind, for conditions) after which a state of an analysis result holds
+Location = Tuple[ProgramPoint, Edge.Kind]
+
+
 class AnalysisResult:
+    max_joined_results = 64
+
     def __init__(self, cfg: ControlFlowGraph):
         """Analysis result representation.
         
@@ -23,6 +31,9 @@ class AnalysisResult:
         self._result_before_conditional_edge = dict()
         self._result_after_conditional_edge = dict()
 
+        # cache of the most recently used joins of states {(Location, Location): State}
+        self._joined_results = OrderedDict()
+
     @property
     def cfg(self):
         return self._cfg
@@ -46,6 +57,7 @@ class AnalysisResult:
         :param states: list of states representing the result of the analysis for the block
         """
         self._node_result[node] = states
+        self._joined_results.clear()
 
         # update index data structures
         # -> index the state before and after each statement
@@ -64,6 +76,14 @@ class AnalysisResult:
                 # we have to index with pair (program point, kind) since they are multiple edges for a single condition)
                 self._result_before_conditional_edge[(e.condition.pp, e.kind)] = states[-1]
 
+    def get_node_entry(self, node: Node) -> State:
+        """Get the analysis result at the entry of a node."""
+        return self._node_result[node][0]
+
+    def get_node_exit(self, node: Node) -> State:
+        """Get the analysis result at the exit of a node."""
+        return self._node_result[node][-1]
+
     def get_result_before(self, pp: ProgramPoint, edge_kind: Edge.Kind = None) -> State:
         """Get the analysis result before a program point."""
         if edge_kind:
@@ -78,6 +98,31 @@ class AnalysisResult:
         else:
             return self._result_after_pp[pp]
 
+    def join_results(self, location1: Location, location2: Location) -> State:
+        """Get the join of the states of this analysis result after two program points.
+
+        The joined state is cached by the pair of locations and shared between callers, hence it must not be
+        modified. The cache keeps the ``max_joined_results`` most recently used joins and is cleared whenever a node
+        result is set.
+
+        :param location1: first program point and edge kind (``None`` for statements)
+        :param location2: second program point and edge kind (``None`` for statements)
+        :return: state representing the join of the states after both program points
+        """
+        if location1 == location2:
+            return self.get_result_after(*location1)
+        key = (location1, location2)
+        joined = self._joined_results.get(key)
+        if joined is None:
+            joined = deepcopy(self.get_result_after(*location1)).join(self.get_result_after(*location2))
+            self._joined_results[key] = joined
+            self._joined_results[(location2, location1)] = joined
+            while len(self._joined_results) > self.max_joined_results:
+                self._joined_results.popitem(last=False)
+        else:
+            self._joined_results.move_to_end(key)
+        return joined
+
     def __str__(self):
         """Analysis result string representation.
         
@@ -105,3 +150,62 @@ class AnalysisResult:
                         pending.append(current.target)
                 visited.add(current)
         return "\n".join(res for res in result)
+
+
+class LazyAnalysisResult(AnalysisResult):
+    max_recomputed_nodes = 8
+
+    def __init__(self, cfg: ControlFlowGraph, execute: Callable[[Node, State], List[State]]):
+        """Analysis result representation storing only the entry state of each node.
+        
+        All other states (within and at the exit of a node, and before the conditions leaving it) are recomputed on 
+        demand from the entry state of the node. The states of the ``max_recomputed_nodes`` most recently queried 
+        nodes are kept, so that querying the statements of a node one after the other executes the node only once.
+        
+        :param cfg: analyzed control flow graph
+        :param execute: function computing the list of states of a node from its entry state
+        """
+        super().__init__(cfg)
+        self._execute = execute
+
+        # index data structures
+        # -> {ProgramPoint: (Node, index of the state after the statement)}
+        self._pp_index = {stmt.pp: (node, i + 1) for node in cfg.nodes.values() for i, stmt in enumerate(node.stmts)}
+        # -> {(ProgramPoint, Edge.Kind): Edge}
+        self._edge_index = {(edge.condition.pp, edge.kind): edge for edge in cfg.edges.values()
+                            if isinstance(edge, Conditional)}
+        # recomputed states of the most recently queried nodes {Node: List[State]}
+        self._recomputed = OrderedDict()
+
+    def set_node_result(self, node: Node, states: List[State]) -> None:
+        self._node_result[node] = states[:1]
+        self._joined_results.clear()
+        self._remember(node, states)
+
+    def _remember(self, node: Node, states: List[State]) -> None:
+        self._recomputed[node] = states
+        self._recomputed.move_to_end(node)
+        while len(self._recomputed) > self.max_recomputed_nodes:
+            self._recomputed.popitem(last=False)
+
+    def get_node_result(self, node: Node) -> List[State]:
+        states = self._recomputed.get(node)
+        if states is None:
+            states = list(self._execute(node, self.get_node_entry(node)))
+        self._remember(node, states)
+        return states
+
+    def get_node_exit(self, node: Node) -> State:
+        return self.get_node_result(node)[-1]
+
+    def get_result_before(self, pp: ProgramPoint, edge_kind: Edge.Kind = None) -> State:
+        if edge_kind:
+            return self.get_node_exit(self._edge_index[(pp, edge_kind)].source)
+        node, index = self._pp_index[pp]
+        return self.get_node_result(node)[index - 1]
+
+    def get_result_after(self, pp: ProgramPoint, edge_kind: Edge.Kind = None) -> State:
+        if edge_kind:
+            return self.get_node_entry(self._edge_index[(pp, edge_kind)].target)
+        node, index = self._pp_index[pp]
+        return self.get_node_result(node)[index]
@@ -1,9 +1,14 @@
 import ast
-from abstract_domains.usage.usage_domains import UsedDomain
+from typing import List, Dict, Tuple
+from abstract_domains.numerical.octagon_domain import OctagonDomain
+from abstract_domains.usage.usage_domains import UsedDomain, UsedSegmentationDomain
+from core.cfg import ControlFlowGraph
 from core.expressions import VariableIdentifier
 from engine.backward import BackwardInterpreter
+from engine.forward import ForwardInterpreter
+from engine.result import AnalysisResult
 from engine.runner import Runner
-from semantics.usage.usage_semantics import UsageSemantics
+from semantics.usage.usage_semantics import UsageSemantics, UsageOctagonSemantics
 
 
 class UsageAnalysis(Runner):
@@ -15,3 +20,28 @@ class UsageAnalysis(Runner):
         names = {nd.id for nd in ast.walk(self.tree) if isinstance(nd, ast.Name) and isinstance(nd.ctx, ast.Store)}
         variables = [VariableIdentifier(int, name) for name in names]
         return UsedDomain(variables)
+
+
+def used_segmentation(cfg: ControlFlowGraph, int_vars: List[VariableIdentifier], list_vars: List[VariableIdentifier],
+                      list_to_len_var: Dict[VariableIdentifier, VariableIdentifier],
+                      widening: int = 3) -> Tuple[AnalysisResult, AnalysisResult]:
+    """Run the usage analysis with segmented lists, combining a forward octagon and a backward usage analysis.
+
+    The forward octagon analysis only stores the octagons at the entry and exit of each node. The backward usage
+    analysis requests the octagons it needs per program point, which are then recomputed (and closed) on demand.
+
+    :param cfg: control flow graph to analyze
+    :param int_vars: integer program variables
+    :param list_vars: list program variables
+    :param list_to_len_var: mapping from list variables to the variables representing their length
+    :param widening: number of iterations before widening (of both analyses)
+    :return: results of the forward octagon analysis and of the backward usage analysis
+    """
+    list_len_vars = [list_to_len_var[var] for var in list_vars]
+    octagon_interpreter = ForwardInterpreter(cfg, UsageOctagonSemantics(), widening, lazy=True)
+    octagon_result = octagon_interpreter.analyze(OctagonDomain(int_vars + list_vars + list_len_vars))
+
+    usage_interpreter = BackwardInterpreter(cfg, UsageSemantics(), widening)
+    usage_result = usage_interpreter.analyze(
+        UsedSegmentationDomain(int_vars, list_vars, list_len_vars, list_to_len_var, octagon_result))
+    return octagon_result, usage_result
@@ -6,6 +6,7 @@ import typing
 from core.cfg import *
 from core.expressions import *
 from core.statements import *
+from frontend.constant_folding import fold_constants
 from visualization.graph_renderer import CfgRenderer
 
 
@@ -15,6 +16,10 @@ def main(args):
                          help="Read a code snippet from the specified file")
     optparser.add_option("-l", "--label",
                          help="The label for the visualization")
+    optparser.add_option("-s", "--simplify", action="store_true", default=False,
+                         help="Simplify the control flow graph")
+    optparser.add_option("-p", "--prune", action="store_true", default=False,
+                         help="Prune branches that are infeasible due to constant conditions")
 
     options, args = optparser.parse_args(args)
     if options.file:
@@ -32,6 +37,11 @@ def main(args):
         label = options.label
 
     cfg = source_to_cfg(code)
+    if options.prune:
+        cfg, report = fold_constants(cfg)
+        print(report)
+    if options.simplify:
+        cfg = simplify_cfg(cfg)
 
     CfgRenderer().render(cfg, label=label)
 
@@ -577,24 +587,154 @@ class CfgVisitor(ast.NodeVisitor):
         return CfgVisitor._ensure_stmt(pp, result)
 
 
-def ast_to_cfg(root_node):
+class CfgSimplifier:
+    """
+    A helper class that simplifies a control flow graph without changing the results of its analysis.
+
+    Empty pass-through nodes are removed, straight-line chains of basic nodes are merged and the remaining nodes are
+    renumbered densely. The statements (and thus their program points) are kept, so analysis results can still be
+    queried by program point.
+    """
+
+    def __init__(self, cfg: ControlFlowGraph):
+        self._nodes = {node: list(node.stmts) for node in cfg.nodes.values()}
+        self._in_node = cfg.in_node
+        self._out_node = cfg.out_node
+        self._edges = dict(cfg.edges)
+        self._in_edges = {node: set() for node in self._nodes}
+        self._out_edges = {node: set() for node in self._nodes}
+        for edge in self._edges.values():
+            self._out_edges[edge.source].add(edge)
+            self._in_edges[edge.target].add(edge)
+
+    @staticmethod
+    def _is_trivial(edge: Edge) -> bool:
+        return isinstance(edge, Unconditional) and edge.kind == Edge.Kind.DEFAULT
+
+    @staticmethod
+    def _relink(edge: Edge, source: Node, target: Node) -> Edge:
+        if isinstance(edge, Conditional):
+            return Conditional(source, edge.condition, target, edge.kind)
+        return Unconditional(source, target, edge.kind)
+
+    def _add_edge(self, edge: Edge):
+        self._edges[(edge.source, edge.target)] = edge
+        self._out_edges[edge.source].add(edge)
+        self._in_edges[edge.target].add(edge)
+
+    def _remove_edge(self, edge: Edge):
+        del self._edges[(edge.source, edge.target)]
+        self._out_edges[edge.source].discard(edge)
+        self._in_edges[edge.target].discard(edge)
+
+    def _remove_node(self, node: Node):
+        del self._nodes[node]
+        del self._in_edges[node]
+        del self._out_edges[node]
+
+    def _bypass(self, node: Node) -> bool:
+        """Remove an empty node with a single ingoing and a single outgoing edge by fusing the two edges.
+
+        At most one of the edges may carry a condition or a non-default kind. An ingoing conditional edge is only
+        fused if the target has no other ingoing edge, so the state after the condition remains the same.
+        """
+        if not isinstance(node, Basic) or self._nodes[node] or node in (self._in_node, self._out_node):
+            return False
+        if len(self._in_edges[node]) != 1 or len(self._out_edges[node]) != 1:
+            return False
+        (ingoing,), (outgoing,) = self._in_edges[node], self._out_edges[node]
+        source, target = ingoing.source, outgoing.target
+        if node in (source, target) or source == target or (source, target) in self._edges:
+            return False
+        joined = len(self._in_edges[target]) > 1
+        if self._is_trivial(ingoing):
+            fused = self._relink(outgoing, source, target)
+        elif self._is_trivial(outgoing) and not (isinstance(ingoing, Conditional) and joined):
+            fused = self._relink(ingoing, source, target)
+        else:
+            return False
+        self._remove_edge(ingoing)
+        self._remove_edge(outgoing)
+        self._remove_node(node)
+        self._add_edge(fused)
+        return True
+
+    def _merge(self, node: Node) -> bool:
+        """Merge a basic node into its single successor, if it is a basic node with no other predecessor."""
+        if not isinstance(node, Basic) or len(self._out_edges[node]) != 1:
+            return False
+        (edge,) = self._out_edges[node]
+        successor = edge.target
+        if not self._is_trivial(edge) or not isinstance(successor, Basic) or successor in (node, self._in_node):
+            return False
+        if len(self._in_edges[successor]) != 1:
+            return False
+        self._remove_edge(edge)
+        self._nodes[node].extend(self._nodes[successor])
+        for outgoing in list(self._out_edges[successor]):
+            self._remove_edge(outgoing)
+            self._add_edge(self._relink(outgoing, node, outgoing.target))
+        self._remove_node(successor)
+        if successor == self._out_node:
+            self._out_node = node
+        return True
+
+    def simplify(self) -> ControlFlowGraph:
+        """
+        Simplify the control flow graph.
+        :return: the simplified (new) control flow graph
+        """
+        for simplification in (self._bypass, self._merge):
+            worklist = sorted(self._nodes, key=lambda node: node.identifier, reverse=True)
+            while worklist:
+                node = worklist.pop()
+                if node in self._nodes and simplification(node):
+                    worklist.append(node)
+
+        # renumber the remaining nodes densely, in the order of their original identifiers
+        id_gen = NodeIdentifierGenerator()
+        renamed = {node: type(node)(id_gen.next, self._nodes[node])
+                   for node in sorted(self._nodes, key=lambda node: node.identifier)}
+        edges = {self._relink(edge, renamed[edge.source], renamed[edge.target]) for edge in self._edges.values()}
+        return ControlFlowGraph(set(renamed.values()), renamed[self._in_node], renamed[self._out_node], edges)
+
+
+def simplify_cfg(cfg: ControlFlowGraph) -> ControlFlowGraph:
+    """
+    Simplify a control flow graph without changing the results of its analysis (see ``CfgSimplifier``).
+    :param cfg: the CFG to be simplified
+    :return: the simplified CFG
+    """
+    return CfgSimplifier(cfg).simplify()
+
+
+def ast_to_cfg(root_node, simplify: bool = False, prune: bool = False):
     """
     Create the control flow graph from a ast node.
     :param root_node: the root node of the AST to be translated to CFG
+    :param simplify: whether to simplify the CFG (see ``simplify_cfg``)
+    :param prune: whether to prune the branches that are infeasible due to constant conditions before simplifying
+        the CFG (see ``fold_constants``)
     :return: the CFG of the passed AST.
     """
     loose_cfg = CfgVisitor().visit(root_node)
-    return loose_cfg.eject()
+    cfg = loose_cfg.eject()
+    if prune:
+        cfg, _ = fold_constants(cfg)
+    return simplify_cfg(cfg) if simplify else cfg
 
 
-def source_to_cfg(code):
+def source_to_cfg(code, simplify: bool = False, prune: bool = False):
     """
     Parses the given code and creates its control flow graph.
     :param code: the code as a string
+    :param simplify: whether to simplify the CFG (see ``simplify_cfg``)
+    :param prune: whether to prune the branches that are infeasible due to constant conditions
+        (see ``fold_constants``)
     :return: the CFG of code
     """
     root_node = ast.parse(code)
-    return ast_to_cfg(root_node)
+    return ast_to_cfg(root_node, simplify, prune)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,203 @@
+import operator
+from functools import reduce
+from typing import Dict, List, Set, Tuple, Union
+
+from core.cfg import ControlFlowGraph, Node, Edge, Conditional
+from core.expressions import Literal, VariableIdentifier
+from core.statements import Statement, LiteralEvaluation, VariableAccess, Call, Assignment
+
+_UNKNOWN = object()  # value of expressions that are not constant
+
+_OPERATORS = {
+    'uadd': operator.pos,
+    'usub': operator.neg,
+    'not': operator.not_,
+    'add': operator.add,
+    'sub': operator.sub,
+    'mult': operator.mul,
+    'eq': operator.eq,
+    'noteq': operator.ne,
+    'lt': operator.lt,
+    'lte': operator.le,
+    'gt': operator.gt,
+    'gte': operator.ge,
+    'and': lambda *values: reduce(lambda left, right: left and right, values),
+    'or': lambda *values: reduce(lambda left, right: left or right, values)
+}
+
+
+def _literal_value(literal: Literal):
+    if literal.typ == bool:
+        return literal.val in (True, 'True')
+    elif literal.typ == int:
+        return int(literal.val)
+    elif literal.typ == str:
+        return literal.val
+    return _UNKNOWN
+
+
+def evaluate(stmt: Union[Statement, Literal], constants: Dict[VariableIdentifier, object]):
+    """Evaluate a statement over constant variable values.
+
+    :param stmt: statement to be evaluated (or literal, as emitted for ``True``, ``False`` and ``None``)
+    :param constants: values of the variables known to be constant
+    :return: value of the statement, or ``_UNKNOWN`` if it is not constant
+    """
+    if isinstance(stmt, Literal):
+        return _literal_value(stmt)
+    elif isinstance(stmt, LiteralEvaluation):
+        return _literal_value(stmt.literal)
+    elif isinstance(stmt, VariableAccess):
+        return constants.get(stmt.var, _UNKNOWN)
+    elif isinstance(stmt, Call) and stmt.name in _OPERATORS:
+        arguments = [evaluate(argument, constants) for argument in stmt.arguments]
+        if any(argument is _UNKNOWN for argument in arguments):
+            return _UNKNOWN
+        try:
+            return _OPERATORS[stmt.name](*arguments)
+        except (TypeError, ValueError, ArithmeticError):
+            return _UNKNOWN
+    return _UNKNOWN
+
+
+class PruningReport:
+    """What constant folding removed from a control flow graph."""
+
+    def __init__(self, conditions: List[Tuple[Statement, bool]], nodes: Set[Node], edges: Set[Edge]):
+        """
+        :param conditions: decided conditions and their constant value
+        :param nodes: removed (unreachable) nodes
+        :param edges: removed (infeasible or unreachable) edges
+        """
+        self._conditions = conditions
+        self._nodes = nodes
+        self._edges = edges
+
+    @property
+    def conditions(self):
+        return self._conditions
+
+    @property
+    def nodes(self):
+        return self._nodes
+
+    @property
+    def edges(self):
+        return self._edges
+
+    def __str__(self):
+        lines = [f"removed {len(self.nodes)} nodes and {len(self.edges)} edges"]
+        for condition, value in self.conditions:
+            at = f" at {condition.pp}" if hasattr(condition, 'pp') else ""  # literal conditions have no program point
+            lines.append(f"condition {condition}{at} is always {value}")
+        return "\n".join(lines)
+
+
+class ConstantFolder:
+    """
+    A helper class that prunes the infeasible branches of a control flow graph.
+
+    Variables assigned constant values are propagated forward through the reachable part of the control flow graph
+    (edges whose condition is constantly false are never followed). Afterwards, conditional edges whose condition is
+    constantly false are removed, and so are the unreachable nodes and their edges. Only the entry and exit nodes are
+    kept even if they are unreachable. Conditional edges whose condition is constantly true are kept as they are:
+    the interpreters still need their condition, e.g. to leave the scope of a branch in a backward analysis.
+    """
+
+    def __init__(self, cfg: ControlFlowGraph):
+        self._cfg = cfg
+        self._out_edges = {node: [] for node in cfg.nodes.values()}
+        for edge in cfg.edges.values():
+            self._out_edges[edge.source].append(edge)
+        self._entries = dict()  # entry constants of the reachable nodes {Node: {VariableIdentifier: value}}
+
+    @staticmethod
+    def _execute(node: Node, constants: Dict[VariableIdentifier, object]) -> Dict[VariableIdentifier, object]:
+        constants = dict(constants)
+        for stmt in node.stmts:
+            if isinstance(stmt, Assignment) and isinstance(stmt.left, VariableAccess):
+                value = evaluate(stmt.right, constants)
+                if value is _UNKNOWN:
+                    constants.pop(stmt.left.var, None)
+                else:
+                    constants[stmt.left.var] = value
+        return constants
+
+    @staticmethod
+    def _decide(edge: Edge, constants: Dict[VariableIdentifier, object]):
+        """Value of the condition of an edge (``True`` for unconditional edges, ``None`` if it is not constant)."""
+        if not isinstance(edge, Conditional):
+            return True
+        value = evaluate(edge.condition, constants)
+        return None if value is _UNKNOWN else bool(value)
+
+    @staticmethod
+    def _join(left: Dict[VariableIdentifier, object], right: Dict[VariableIdentifier, object]):
+        return {var: value for var, value in left.items()
+                if var in right and type(right[var]) is type(value) and right[var] == value}
+
+    def _position(self, edge: Conditional) -> Tuple[int, int]:
+        """Position of the condition of an edge in the source code.
+
+        Literal conditions (``True`` and ``False``) have no program point, the one of their negation is used instead.
+        """
+        condition = edge.condition
+        if not hasattr(condition, 'pp'):
+            condition = next((other.condition for other in self._out_edges[edge.source] if isinstance(other, Conditional)
+                              and isinstance(other.condition, Call) and other.condition.arguments[0] is condition),
+                             condition)
+        return (condition.pp.line, condition.pp.column) if hasattr(condition, 'pp') else (0, 0)
+
+    def _propagate(self):
+        self._entries[self._cfg.in_node] = dict()
+        worklist = [self._cfg.in_node]
+        while worklist:
+            node = worklist.pop()
+            exit = self._execute(node, self._entries[node])
+            for edge in self._out_edges[node]:
+                if self._decide(edge, exit) is False:
+                    continue
+                previous = self._entries.get(edge.target)
+                entry = exit if previous is None else self._join(previous, exit)
+                if previous is None or entry != previous:
+                    self._entries[edge.target] = entry
+                    worklist.append(edge.target)
+
+    def fold(self) -> Tuple[ControlFlowGraph, PruningReport]:
+        """
+        Prune the infeasible branches of the control flow graph.
+        :return: the pruned (new) control flow graph and a report of what was pruned
+        """
+        self._propagate()
+        nodes = {node for node in self._cfg.nodes.values() if node in self._entries}
+        nodes.update({self._cfg.in_node, self._cfg.out_node})
+        edges, conditions = set(), []
+        for node, constants in self._entries.items():
+            exit = self._execute(node, constants)
+            for edge in self._out_edges[node]:
+                value = self._decide(edge, exit)
+                if value is None:
+                    edges.add(edge)
+                elif value:
+                    if isinstance(edge, Conditional):
+                        conditions.append((self._position(edge), edge.condition, True))
+                    edges.add(edge)
+                else:
+                    conditions.append((self._position(edge), edge.condition, False))
+        removed_nodes = set(self._cfg.nodes.values()) - nodes
+        removed_edges = set(self._cfg.edges.values()) - edges
+        # a condition and its negation share their position, the value keeps their order deterministic
+        conditions.sort(key=lambda condition: (condition[0], condition[2]))
+        conditions = [(condition, value) for _, condition, value in conditions]
+        cfg = ControlFlowGraph(nodes, self._cfg.in_node, self._cfg.out_node, edges)
+        return cfg, PruningReport(conditions, removed_nodes, removed_edges)
+
+
+def fold_constants(cfg: ControlFlowGraph) -> Tuple[ControlFlowGraph, PruningReport]:
+    """
+    Prune the branches of a control flow graph that are infeasible due to constant conditions
+    (see ``ConstantFolder``).
+    :param cfg: the CFG to be pruned
+    :return: the pruned CFG and a report of what was pruned
+    """
+    return ConstantFolder(cfg).fold()
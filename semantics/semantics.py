@@ -1,8 +1,13 @@
 from abstract_domains.state import State
+from core.cfg import ControlFlowGraph, Conditional
 from core.expressions import BinaryArithmeticOperation, BinaryOperation, BinaryComparisonOperation, UnaryOperation, \
-    UnaryArithmeticOperation, UnaryBooleanOperation, BinaryBooleanOperation, Input, ListDisplay, Slice, Index, Literal
+    UnaryArithmeticOperation, UnaryBooleanOperation, BinaryBooleanOperation, Input, ListDisplay, Slice, Index, Literal, \
+    Expression
 from core.statements import Statement, VariableAccess, LiteralEvaluation, Call, ListDisplayStmt, SliceStmt, IndexStmt
+from core.special_expressions import ExpressionSummary
 from functools import reduce
+from operator import mul
+from typing import Dict, FrozenSet, Iterator, Optional, Set
 import re
 import itertools
 
@@ -20,6 +25,94 @@ def camel_to_snake(name: str) -> str:
     return _all2.sub(r'\1_\2', subbed).lower()
 
 
+def _sub_statements(stmt: Statement) -> Iterator[Statement]:
+    """Iterate over the statements directly nested in a statement."""
+    for cls in type(stmt).__mro__:
+        for name in getattr(cls, '__slots__', ()):
+            value = getattr(stmt, name, None)
+            if isinstance(value, Statement):
+                yield value
+            elif isinstance(value, (list, tuple)):
+                yield from (item for item in value if isinstance(item, Statement))
+
+
+def _evaluate(stmt: Statement) -> Optional[FrozenSet[Expression]]:
+    """Evaluate a statement independently of any state.
+
+    Literal evaluations and variable accesses evaluate to the literal and the variable in all states,
+    and list displays, slices and indices to the combinations of the expressions their items evaluate to.
+
+    :param stmt: statement to be evaluated
+    :return: frozen set of expressions the statement evaluates to, or ``None`` if it depends on the state
+    """
+    if stmt.expressions is not None:
+        return stmt.expressions
+    if isinstance(stmt, LiteralEvaluation):
+        result = frozenset({stmt.literal})
+    elif isinstance(stmt, VariableAccess):
+        result = frozenset({stmt.var})
+    elif isinstance(stmt, ListDisplayStmt):
+        item_sets = [_evaluate(item) for item in stmt.items]
+        if any(items is None for items in item_sets):
+            return None
+        result = frozenset(ListDisplay(list, list(p)) for p in itertools.product(*item_sets))
+    elif isinstance(stmt, SliceStmt):
+        parts = [_evaluate(part) if part else frozenset({None})
+                 for part in (stmt.target, stmt.lower, stmt.step, stmt.upper)]
+        if any(part is None for part in parts):
+            return None
+        result = frozenset(Slice(None, *p) for p in itertools.product(*parts))
+    elif isinstance(stmt, IndexStmt):
+        parts = [_evaluate(stmt.target), _evaluate(stmt.index)]
+        if any(part is None for part in parts):
+            return None
+        result = frozenset(Index(None, *p) for p in itertools.product(*parts))
+    else:
+        return None
+    stmt.expressions = result
+    return result
+
+
+def pre_evaluate(cfg: ControlFlowGraph) -> ControlFlowGraph:
+    """Evaluate once all statements of a control flow graph whose result does not depend on the state.
+
+    The expressions these statements evaluate to are stored on the statements (see :attr:`Statement.expressions`)
+    and used by :meth:`Semantics.semantics` instead of executing the statements again in every iteration,
+    unless the semantics override how these statements are executed.
+    This assumes that accessing a variable and evaluating a literal have no side-effects on the state,
+    which holds for all states of the analyzer.
+
+    :param cfg: control flow graph whose statements should be evaluated
+    :return: the same control flow graph
+    """
+    stmts = [stmt for node in cfg.nodes.values() for stmt in node.stmts]
+    stmts.extend(edge.condition for edge in cfg.edges.values() if isinstance(edge, Conditional))
+    while stmts:
+        stmt = stmts.pop()
+        if _evaluate(stmt) is None:
+            stmts.extend(_sub_statements(stmt))
+    return cfg
+
+
+_pre_evaluating = {}  # type: Dict[type, bool]
+
+
+def _pre_evaluates(cls: type) -> bool:
+    """Check whether semantics of a class may use the expressions stored by :func:`pre_evaluate`.
+
+    This is only the case if the class executes all pre-evaluated statements like :class:`DefaultSemantics` does.
+
+    :param cls: class of the semantics
+    :return: whether the pre-evaluated expressions agree with the semantics of the class
+    """
+    if cls not in _pre_evaluating:
+        _pre_evaluating[cls] = all(getattr(cls, name, None) is getattr(DefaultSemantics, name)
+                                   for name in ('literal_evaluation_semantics', 'variable_access_semantics',
+                                                'list_display_stmt_semantics', 'slice_stmt_semantics',
+                                                'index_stmt_semantics'))
+    return _pre_evaluating[cls]
+
+
 class Semantics:
     """Semantics of statements. Independently of the direction (forward/backward) of the analysis."""
 
@@ -30,6 +123,9 @@ class Semantics:
         :param state: state before executing the statement
         :return: state modified by the statement execution
         """
+        if stmt.expressions is not None and _pre_evaluates(type(self)):  # pre-evaluated, see pre_evaluate
+            state.result = stmt.expressions
+            return state
         name = '{}_semantics'.format(camel_to_snake(stmt.__class__.__name__))
         if hasattr(self, name):
             return getattr(self, name)(stmt, state)
@@ -67,7 +163,26 @@ class VariableAccessSemantics(Semantics):
 
 
 class ListSemantics(Semantics):
-    """Semantics of list accesses."""
+    """Semantics of list accesses.
+
+    List displays, slices and indices evaluate to all combinations of the expressions their sub-statements evaluate
+    to. Beyond ``max_combinations`` combinations, they soundly evaluate to a single :class:`ExpressionSummary`
+    of the expressions of their sub-statements instead.
+    """
+
+    max_combinations = 64
+
+    def _combine(self, typ, build, *parts: Set[Expression]) -> Set[Expression]:
+        """Build an expression from each combination of the given sets of sub-expressions.
+
+        :param typ: type of the built expressions
+        :param build: function building an expression from sub-expressions
+        :param parts: sets of sub-expressions
+        :return: set of built expressions, or a summary if there are more than ``max_combinations`` of them
+        """
+        if reduce(mul, (len(part) for part in parts), 1) > self.max_combinations:
+            return {ExpressionSummary(typ, [expr for part in parts for expr in part if expr is not None])}
+        return {build(*p) for p in itertools.product(*parts)}
 
     def list_display_stmt_semantics(self, stmt: ListDisplayStmt, state: State) -> State:
         """Semantics of a list display statement.
@@ -76,11 +191,8 @@ class ListSemantics(Semantics):
         :param state: state before executing the variable access
         :return: state modified by the variable access
         """
-        item_sets = [list(self.semantics(item, state).result) for item in stmt.items]
-        products = itertools.product(*item_sets)
-        result = {ListDisplay(list, list(p)) for p in products}
-
-        state.result = result
+        item_sets = [self.semantics(item, state).result for item in stmt.items]
+        state.result = self._combine(list, lambda *items: ListDisplay(list, list(items)), *item_sets)
         return state
 
     def slice_stmt_semantics(self, stmt: SliceStmt, state: State) -> State:
@@ -104,12 +216,8 @@ class ListSemantics(Semantics):
         else:
             uppers = {None}
 
-        products = itertools.product(targets, lowers, steps, uppers)
-
         # TODO infer type of Slice??
-        result = {Slice(None, target, lower, step, upper) for target, lower, step, upper in products}
-
-        state.result = result
+        state.result = self._combine(None, lambda *p: Slice(None, *p), targets, lowers, steps, uppers)
         return state
 
     def index_stmt_semantics(self, stmt: IndexStmt, state: State) -> State:
@@ -122,12 +230,8 @@ class ListSemantics(Semantics):
         targets = self.semantics(stmt.target, state).result
         indices = self.semantics(stmt.index, state).result
 
-        products = itertools.product(targets, indices)
-
         # TODO infer type of Slice??
-        result = {Index(None, target, index) for target, index in products}
-
-        state.result = result
+        state.result = self._combine(None, lambda *p: Index(None, *p), targets, indices)
         return state
 
 
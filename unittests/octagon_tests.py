@@ -13,9 +13,11 @@ logging.basicConfig(level=logging.INFO, filename='unittests.log', filemode='w')
 
 
 class OctagonTestCase(ResultCommentsFileTestCase):
-    def __init__(self, source_path):
+    def __init__(self, source_path, domain=OctagonDomain):
+        """Test case checking the results of a relational numerical analysis (with octagons by default)."""
         super().__init__(source_path)
         self._source_path = source_path
+        self._domain = domain
 
     def runTest(self):
         logging.info(self)
@@ -38,15 +40,15 @@ class OctagonTestCase(ResultCommentsFileTestCase):
 
         # print(list(map(str,variables)))
 
-        # Run Octagon numerical Analysis
+        # Run relational numerical Analysis
         forward_interpreter = ForwardInterpreter(self.cfg, DefaultForwardSemantics(), 3)
-        result = forward_interpreter.analyze(OctagonDomain(int_vars + list_vars))
+        result = forward_interpreter.analyze(self._domain(int_vars + list_vars))
 
         # ensure all results are closed for displaying
         for node in result.nodes:
             node_result_list = result.get_node_result(node)
-            for octagon in node_result_list:
-                octagon.close()
+            for state in node_result_list:
+                state.close()
 
         self.render_result_cfg(result)
         self.check_result_comments(result)
@@ -3,12 +3,8 @@ import logging
 import os
 import unittest
 
-from abstract_domains.numerical.octagon_domain import OctagonDomain
-from abstract_domains.usage.usage_domains import UsedSegmentationDomain
 from core.expressions import VariableIdentifier
-from engine.backward import BackwardInterpreter
-from engine.forward import ForwardInterpreter
-from semantics.usage.usage_semantics import UsageSemantics, UsageOctagonSemantics
+from engine.usage.usage_analysis import used_segmentation
 from unittests.generic_tests import ResultCommentsFileTestCase
 
 logging.basicConfig(level=logging.INFO, filename='unittests.log', filemode='w')
@@ -39,27 +35,11 @@ class SegmentationTestCase(ResultCommentsFileTestCase):
                 typ = int
                 var = VariableIdentifier(typ, name)
                 int_vars.append(var)
-        list_len_vars = list(list_to_len_var.values())
 
-        # print(list(map(str,variables)))
-
-        # Run Octagonal Analysis (forward)
-        forward_interpreter = ForwardInterpreter(self.cfg, UsageOctagonSemantics(), 3)
-        result = forward_interpreter.analyze(OctagonDomain(int_vars + list_vars + list_len_vars))
-
-        # ensure all results are closed for displaying
-        for node in result.nodes:
-            node_result_list = result.get_node_result(node)
-            for octagon in node_result_list:
-                octagon.close()
-
-        self.render_result_cfg(result, "Oct")
-
-        # Run Usage Segmentation Analysis (backwards)
-        backward_interpreter = BackwardInterpreter(self.cfg, UsageSemantics(), 3)
-        result = backward_interpreter.analyze(
-            UsedSegmentationDomain(int_vars, list_vars, list_len_vars, list_to_len_var, result))
+        # Run Octagonal Analysis (forward) on demand of the Usage Segmentation Analysis (backwards)
+        octagon_result, result = used_segmentation(self.cfg, int_vars, list_vars, list_to_len_var)
 
+        self.render_result_cfg(octagon_result, "Oct")
         self.render_result_cfg(result, "Seg")
         self.check_result_comments(result)
 
@@ -0,0 +1,76 @@
+import ast
+import glob
+import os
+import unittest
+
+from abstract_domains.traces.bdd import BDD
+from abstract_domains.traces.traces_domain import BoolTracesState, BddTracesState
+from core.expressions import VariableIdentifier
+from engine.backward import BackwardInterpreter
+from frontend.cfg_generator import ast_to_cfg
+from semantics.backward import DefaultBackwardSemantics
+
+
+class TestBDD(unittest.TestCase):
+    def runTest(self):
+        bdd = BDD(3)
+        x, y, z = bdd.var(0), bdd.var(1), bdd.var(2)
+
+        # nodes are unique
+        self.assertEqual(bdd.conj(x, y), bdd.conj(y, x))
+        self.assertEqual(bdd.neg(bdd.neg(z)), z)
+        self.assertEqual(bdd.disj(x, bdd.neg(x)), BDD.TRUE)
+
+        # model counting
+        self.assertEqual(bdd.count(BDD.TRUE), 8)
+        self.assertEqual(bdd.count(x), 4)
+        self.assertEqual(bdd.count(bdd.disj(x, z)), 6)
+        self.assertEqual(len(list(bdd.models(bdd.disj(x, z)))), 6)
+
+        # substitution and quantification
+        self.assertEqual(bdd.compose(bdd.conj(x, z), 0, y), bdd.conj(y, z))
+        self.assertEqual(bdd.exists(bdd.conj(x, z), 0), z)
+        self.assertTrue(bdd.implies(bdd.conj(x, y), bdd.disj(x, z)))
+        self.assertFalse(bdd.implies(x, y))
+
+
+class TestBddTracesState(unittest.TestCase):
+    """Compares the valuations computed by ``BddTracesState`` and ``BoolTracesState`` on the traces test sources."""
+
+    def __init__(self, source_path):
+        super().__init__()
+        self._source_path = source_path
+
+    def __str__(self):
+        return f"BDD traces for Python source at {self._source_path}"
+
+    def runTest(self):
+        with open(self._source_path, 'r') as source_file:
+            root = ast.parse(source_file.read())
+        cfg = ast_to_cfg(root)
+        names = sorted({node.id for node in ast.walk(root)
+                        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store)})
+        variables = [VariableIdentifier(int, name) for name in names]
+
+        expected = BackwardInterpreter(cfg, DefaultBackwardSemantics(), 3).analyze(BoolTracesState(variables))
+        result = BackwardInterpreter(cfg, DefaultBackwardSemantics(), 3).analyze(BddTracesState(variables))
+        for node in cfg.nodes.values():
+            for expected_state, state in zip(expected.get_node_result(node), result.get_node_result(node)):
+                valuations = {"({})".format("".join(trace.trace[0])) for trace in expected_state.traces}
+                models = {"({})".format("".join('T' if value else 'F' for value in model))
+                          for model in state.bdd.models(state.traces)}
+                self.assertEqual(models, valuations)
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTest(TestBDD())
+    for path in sorted(glob.glob(os.path.join(os.path.dirname(__file__), 'traces', '*.py'))):
+        if os.path.basename(path) != "__init__.py":
+            s.addTest(TestBddTracesState(path))
+    runner = unittest.TextTestRunner()
+    runner.run(s)
+
+
+if __name__ == '__main__':
+    suite()
@@ -0,0 +1,52 @@
+import ast
+import unittest
+
+from abstract_domains.liveness.liveness_domain import LivenessState, BitLivenessState
+from core.expressions import VariableIdentifier
+from engine.backward import BackwardInterpreter
+from engine.liveness.liveness_analysis import BitLivenessInterpreter
+from frontend.cfg_generator import ast_to_cfg
+from semantics.backward import DefaultBackwardSemantics
+
+source = """
+x = int(input())
+y = 0
+z = 1
+while x > 0:
+    y = y + x
+    x = x - 1
+if y > 3:
+    z = y
+print(z)
+"""
+
+
+class TestBitLiveness(unittest.TestCase):
+    def runTest(self):
+        cfg = ast_to_cfg(ast.parse(source))
+        x, y, z = VariableIdentifier(int, 'x'), VariableIdentifier(int, 'y'), VariableIdentifier(int, 'z')
+
+        # the statements of a node are summarized into gen and kill masks
+        interpreter = BitLivenessInterpreter(cfg, DefaultBackwardSemantics())
+        node = next(node for node in cfg.nodes.values() if [str(stmt) for stmt in node.stmts] == ['z = y'])
+        gen, kill = interpreter.summarize(lambda state: interpreter.execute(node, state)[0], BitLivenessState([x, y, z]))
+        self.assertEqual((gen, kill), (0b010, 0b100))
+
+        # the results are the same as the ones of the store-based liveness analysis
+        expected = BackwardInterpreter(cfg, DefaultBackwardSemantics(), 3).analyze(LivenessState([x, y, z]))
+        result = interpreter.analyze(BitLivenessState([x, y, z]))
+        self.assertEqual(set(result.nodes), set(expected.nodes))
+        for node in expected.nodes:
+            self.assertEqual([repr(state) for state in result.get_node_result(node)],
+                             [repr(state) for state in expected.get_node_result(node)])
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTest(TestBitLiveness())
+    runner = unittest.TextTestRunner()
+    runner.run(s)
+
+
+if __name__ == '__main__':
+    suite()
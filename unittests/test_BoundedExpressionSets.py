@@ -0,0 +1,72 @@
+import ast
+import unittest
+
+from abstract_domains.numerical.interval_domain import IntervalDomain, IntervalLattice
+from abstract_domains.usage.usage_domains import UsedStore
+from abstract_domains.usage.used import U, O, N
+from core.expressions import VariableIdentifier, Literal, Input
+from core.special_expressions import ExpressionSummary
+from core.statements import Assignment, VariableAccess
+from frontend.cfg_generator import ast_to_cfg
+from semantics.forward import DefaultForwardSemantics
+
+
+class UnknownSemantics(DefaultForwardSemantics):
+    """Variable accesses evaluate to the variable or to an unknown input."""
+
+    def variable_access_semantics(self, stmt: VariableAccess, state):
+        state.result = {stmt.var, Input(stmt.var.typ)}
+        return state
+
+
+class TestBoundedExpressionSets(unittest.TestCase):
+    def runTest(self):
+        x, y, z = VariableIdentifier(int, 'x'), VariableIdentifier(int, 'y'), VariableIdentifier(int, 'z')
+        cfg = ast_to_cfg(ast.parse("list_a = [x, y, z]\n"))
+        display = next(stmt for node in cfg.nodes.values() for stmt in node.stmts if isinstance(stmt, Assignment)).right
+
+        # the combinations of the items are built up to the limit
+        semantics = UnknownSemantics()
+        self.assertEqual(len(semantics.semantics(display, IntervalDomain([x, y, z])).result), 8)
+
+        # beyond the limit, they are summarised
+        semantics.max_combinations = 4
+        result = semantics.semantics(display, IntervalDomain([x, y, z])).result
+        self.assertEqual(len(result), 1)
+        summary = next(iter(result))
+        self.assertIsInstance(summary, ExpressionSummary)
+        self.assertEqual(summary.ids(), {x, y, z})
+        self.assertEqual(IntervalLattice.evaluate(summary), IntervalLattice().top())
+
+        # single expressions are transferred in place, multiple ones are joined
+        state = IntervalDomain([x, y])
+        self.assertIs(state.assign_variable({x}, {Literal(int, '1')}), state)
+        self.assertEqual(state.get_bounds(x), (1, 1))
+        state.assign_variable({y}, {Literal(int, '1'), Literal(int, '3')})
+        self.assertEqual(state.get_bounds(y), (1, 3))
+        state.assign_variable({x}, {summary})
+        self.assertTrue(state.store[x].is_top())
+
+        # summaries soundly use all the variables they read
+        a, b = VariableIdentifier(list, 'list_a'), VariableIdentifier(list, 'list_b')
+        store = UsedStore([x, y, z, a, b])
+        store.output({a})
+        store.substitute_variable({a}, {summary})
+        self.assertEqual([store[x], store[y], store[z]], [U, U, U])
+        self.assertEqual(store._lists[a].used_at(0), O)
+        store = UsedStore([x, y, z, a, b])
+        store.output({z})
+        store.substitute_variable({z}, {ExpressionSummary(int, [b, x])})
+        self.assertEqual([store[x], store[y], store[z]], [U, N, O])
+        self.assertEqual(store._lists[b].used_at(100), U)
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTest(TestBoundedExpressionSets())
+    runner = unittest.TextTestRunner()
+    runner.run(s)
+
+
+if __name__ == '__main__':
+    suite()
@@ -0,0 +1,72 @@
+import ast
+import unittest
+from math import inf
+
+from abstract_domains.numerical.interval_domain import IntervalDomain
+from core.cfg import Basic, Conditional
+from core.expressions import VariableIdentifier
+from engine.forward import ForwardInterpreter
+from frontend.cfg_generator import ast_to_cfg
+from semantics.forward import DefaultForwardSemantics
+
+source = """
+x = 0
+y = 1
+if x < 3:
+    x = 3
+    y = x
+else:
+    x = 4
+while x < 10:
+    x = x + 1
+print(x)
+"""
+
+
+class TestCfgSimplification(unittest.TestCase):
+    def runTest(self):
+        tree = ast.parse(source)
+        cfg = ast_to_cfg(tree)
+        simplified = ast_to_cfg(tree, simplify=True)
+        x, y = VariableIdentifier(int, 'x'), VariableIdentifier(int, 'y')
+
+        # empty nodes are removed, straight-line chains merged and the nodes renumbered densely
+        self.assertLess(len(simplified.nodes), len(cfg.nodes))
+        self.assertEqual(sorted(simplified.nodes), list(range(1, len(simplified.nodes) + 1)))
+        self.assertFalse([node for node in simplified.nodes.values() if isinstance(node, Basic) and not node.stmts
+                          and node not in (simplified.in_node, simplified.out_node)])
+        self.assertIn(['x = 3', 'y = x'], [list(map(str, node.stmts)) for node in simplified.nodes.values()])
+
+        # all statements and conditions are kept
+        def program_points(graph):
+            stmts = {stmt.pp for node in graph.nodes.values() for stmt in node.stmts}
+            edges = [edge for edge in graph.edges.values() if isinstance(edge, Conditional)]
+            return stmts, {(edge.condition.pp, edge.kind) for edge in edges}
+
+        self.assertEqual(program_points(simplified), program_points(cfg))
+
+        # the analysis results at each program point are unchanged
+        expected = ForwardInterpreter(cfg, DefaultForwardSemantics(), 3).analyze(IntervalDomain([x, y]))
+        result = ForwardInterpreter(simplified, DefaultForwardSemantics(), 3).analyze(IntervalDomain([x, y]))
+        stmts = {str(stmt): stmt for node in cfg.nodes.values() for stmt in node.stmts}
+        for analysis in (expected, result):
+            after = analysis.get_result_after(stmts['y = x'].pp)
+            self.assertEqual((after.get_bounds(x), after.get_bounds(y)), ((3, 3), (3, 3)))
+            before = analysis.get_result_before(stmts['print(x)'].pp)
+            self.assertEqual((before.get_bounds(x), before.get_bounds(y)), ((3, inf), (1, 3)))
+        for stmt in (stmt for node in cfg.nodes.values() for stmt in node.stmts):
+            self.assertEqual(result.get_result_before(stmt.pp), expected.get_result_before(stmt.pp))
+            self.assertEqual(result.get_result_after(stmt.pp), expected.get_result_after(stmt.pp))
+        for pp, kind in program_points(cfg)[1]:
+            self.assertEqual(result.get_result_after(pp, kind), expected.get_result_after(pp, kind))
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTest(TestCfgSimplification())
+    runner = unittest.TextTestRunner()
+    runner.run(s)
+
+
+if __name__ == '__main__':
+    suite()
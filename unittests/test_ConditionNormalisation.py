@@ -0,0 +1,69 @@
+import gc
+import unittest
+import weakref
+
+from abstract_domains.numerical.interval_domain import IntervalLattice
+from abstract_domains.numerical.linear_forms import QuasiLinearForm
+from abstract_domains.numerical.octagon_domain import OctagonDomain
+from core.expressions import VariableIdentifier, Literal, BinaryArithmeticOperation, BinaryComparisonOperation, \
+    UnaryBooleanOperation
+from core.expressions_tools import make_condition_not_free
+
+
+class TestConditionNormalisation(unittest.TestCase):
+    def runTest(self):
+        x, y = VariableIdentifier(int, 'x'), VariableIdentifier(int, 'y')
+        comparison = BinaryComparisonOperation(bool, x, BinaryComparisonOperation.Operator.Lt, y)
+        negation = UnaryBooleanOperation(bool, UnaryBooleanOperation.Operator.Neg, comparison)
+
+        # normal forms are computed once per condition
+        not_free = make_condition_not_free(negation)
+        self.assertIs(make_condition_not_free(negation), not_free)
+        condition_set = OctagonDomain.AssumeVisitor.condition_set(not_free)
+        self.assertIs(OctagonDomain.AssumeVisitor.condition_set(not_free), condition_set)
+        self.assertEqual([str(cond) for cond in condition_set.conditions], ["(y - x) <= 0"])
+
+        # memoised linear forms are copied and only used if the domain tracks all their variables
+        left = condition_set.conditions[0].left
+        form = QuasiLinearForm.from_expression(left, OctagonDomain([x, y]))
+        self.assertEqual(form.coefficients, {x: -1, y: 1})
+        form.scale(2)
+        self.assertEqual(QuasiLinearForm.from_expression(left, OctagonDomain([x, y])).coefficients, {x: -1, y: 1})
+        self.assertEqual(QuasiLinearForm.from_expression(left, OctagonDomain([x])).coefficients, {x: -1})
+
+        # non-linear forms still depend on the bounds of the domain
+        octagon = OctagonDomain([x, y])
+        octagon.set_bounds(y, 2, 3)
+        product = BinaryArithmeticOperation(int, x, BinaryArithmeticOperation.Operator.Mult, y)
+        self.assertEqual(str(QuasiLinearForm.from_expression(product, octagon).interval), "[-inf,inf]")
+        octagon.set_bounds(x, 1, 1)
+        self.assertEqual(QuasiLinearForm.from_expression(product, octagon).interval, IntervalLattice(2, 3))
+        self.assertEqual(str(QuasiLinearForm.from_expression(Literal(int, '1'), octagon).interval), "[1,1]")
+
+        # the memoised forms do not keep the conditions alive
+        reference = self.normalised_condition()
+        gc.collect()
+        self.assertIsNone(reference())
+
+    @staticmethod
+    def normalised_condition():
+        """Normalise a fresh condition and return a weak reference to it."""
+        u, v = VariableIdentifier(int, 'u'), VariableIdentifier(int, 'v')
+        comparison = BinaryComparisonOperation(bool, u, BinaryComparisonOperation.Operator.LtE, v)
+        negation = UnaryBooleanOperation(bool, UnaryBooleanOperation.Operator.Neg, comparison)
+        for condition in (negation, make_condition_not_free(negation), comparison):
+            not_free = make_condition_not_free(condition)
+            for inequality in OctagonDomain.AssumeVisitor.condition_set(not_free).conditions:
+                QuasiLinearForm.from_expression(inequality.left, OctagonDomain([u, v]))
+        return weakref.ref(negation)
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTest(TestConditionNormalisation())
+    runner = unittest.TextTestRunner()
+    runner.run(s)
+
+
+if __name__ == '__main__':
+    suite()
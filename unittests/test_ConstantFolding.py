@@ -0,0 +1,111 @@
+import ast
+import unittest
+from math import inf
+
+from abstract_domains.numerical.interval_domain import IntervalDomain
+from abstract_domains.usage.usage_domains import UsedDomain
+from core.cfg import Conditional
+from core.expressions import VariableIdentifier
+from engine.backward import BackwardInterpreter
+from engine.forward import ForwardInterpreter
+from frontend.cfg_generator import ast_to_cfg
+from frontend.constant_folding import fold_constants
+from semantics.forward import DefaultForwardSemantics
+from semantics.usage.usage_semantics import UsageSemantics
+
+source = """
+x = int(input())
+a = 0
+a = a - 1
+if a > 0:
+    a = x
+else:
+    x = a
+while 1 < 0:
+    x = x + 1
+while x < 10:
+    x = x + 1
+print(x)
+"""
+
+usage_source = """
+x = int(input())
+if 1 > 0:
+    y = x
+else:
+    y = 0
+z = int(input())
+if 2 < 1:
+    z = y
+print(y)
+"""
+
+literal_source = """
+x = 0
+while True:
+    if False:
+        x = 1
+    x = x + 1
+"""
+
+
+class TestConstantFolding(unittest.TestCase):
+    def runTest(self):
+        cfg = ast_to_cfg(ast.parse(source))
+        pruned, report = fold_constants(cfg)
+        x, a = VariableIdentifier(int, 'x'), VariableIdentifier(int, 'a')
+
+        # the dead branches are removed
+        stmts = {str(stmt): stmt for node in pruned.nodes.values() for stmt in node.stmts}
+        self.assertNotIn('a = x', stmts)
+        self.assertIn('x = a', stmts)
+        self.assertEqual(len(stmts), 6)
+        self.assertEqual(len(pruned.nodes) + len(report.nodes), len(cfg.nodes))
+        self.assertTrue(report.edges)
+
+        # decided conditions are reported and their feasible edges are kept
+        decided = [(str(condition), value) for condition, value in report.conditions]
+        self.assertEqual(decided, [('gt(a, 0)', False), ('not(gt(a, 0))', True),
+                                   ('lt(1, 0)', False), ('not(lt(1, 0))', True)])
+        conditions = [str(edge.condition) for edge in pruned.edges.values() if isinstance(edge, Conditional)]
+        self.assertEqual(sorted(conditions), ['lt(x, 10)', 'not(gt(a, 0))', 'not(lt(1, 0))', 'not(lt(x, 10))'])
+        self.assertEqual(ast_to_cfg(ast.parse(source), prune=True).edges.keys(), pruned.edges.keys())
+
+        # the results of the analysis at the remaining statements are at least as precise as before pruning
+        # (the interval domain does not refine conditions, so it cannot exclude the infeasible branches itself)
+        unpruned = ForwardInterpreter(cfg, DefaultForwardSemantics(), 3).analyze(IntervalDomain([x, a]))
+        result = ForwardInterpreter(pruned, DefaultForwardSemantics(), 3).analyze(IntervalDomain([x, a]))
+        for stmt in stmts.values():
+            self.assertTrue(result.get_result_after(stmt.pp).less_equal(unpruned.get_result_after(stmt.pp)))
+        after = result.get_result_after(stmts['x = a'].pp)
+        self.assertEqual((after.get_bounds(x), after.get_bounds(a)), ((-1, -1), (-1, -1)))
+        before = result.get_result_before(stmts['print(x)'].pp)
+        self.assertEqual((before.get_bounds(x), before.get_bounds(a)), ((-1, inf), (-1, -1)))
+        before = unpruned.get_result_before(stmts['print(x)'].pp)
+        self.assertEqual((before.get_bounds(x), before.get_bounds(a)), ((-inf, inf), (-inf, inf)))
+
+        # literal conditions are decided too
+        pruned, report = fold_constants(ast_to_cfg(ast.parse(literal_source)))
+        decided = [(str(condition), value) for condition, value in report.conditions]
+        self.assertEqual(decided, [('not(True)', False), ('True', True), ('False', False), ('not(False)', True)])
+        self.assertEqual([str(stmt) for node in pruned.nodes.values() for stmt in node.stmts], ['x = 0', 'x = add(x, 1)'])
+
+        # the scopes of a backward analysis are left as before pruning
+        cfg = ast_to_cfg(ast.parse(usage_source))
+        pruned, report = fold_constants(cfg)
+        variables = [VariableIdentifier(int, name) for name in ('x', 'y', 'z')]
+        expected = BackwardInterpreter(cfg, UsageSemantics(), 3).analyze(UsedDomain(variables))
+        result = BackwardInterpreter(pruned, UsageSemantics(), 3).analyze(UsedDomain(variables))
+        for stmt in (stmt for node in pruned.nodes.values() for stmt in node.stmts):
+            self.assertEqual(str(result.get_result_before(stmt.pp)), str(expected.get_result_before(stmt.pp)))
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTest(TestConstantFolding())
+    runner = unittest.TextTestRunner()
+    runner.run(s)
+
+
+if __name__ == '__main__':
+    suite()
@@ -0,0 +1,53 @@
+import unittest
+from copy import deepcopy
+
+from core.expressions import VariableIdentifier, Literal, BinaryArithmeticOperation, BinaryComparisonOperation, \
+    UnaryBooleanOperation, UnaryArithmeticOperation, ListDisplay
+from core.expressions_tools import make_condition_not_free
+from core.special_expressions import VariadicArithmeticOperation
+from core.statements import ProgramPoint
+
+
+class TestExpressionInterning(unittest.TestCase):
+    def runTest(self):
+        x, y = VariableIdentifier(int, 'x'), VariableIdentifier(int, 'y')
+        self.assertIs(x, VariableIdentifier(int, 'x'))
+        self.assertIsNot(x, VariableIdentifier(bool, 'x'))
+
+        add = BinaryArithmeticOperation(int, x, BinaryArithmeticOperation.Operator.Add, Literal(int, '1'))
+        same = BinaryArithmeticOperation(int, x, BinaryArithmeticOperation.Operator.Add, Literal(int, '1'))
+        self.assertIs(add, same)
+        self.assertIs(deepcopy(add), add)
+        self.assertEqual(add.ids(), {x})
+        self.assertEqual(str(add), "x + 1")
+
+        # transformations build new expressions and leave the original ones untouched
+        comparison = BinaryComparisonOperation(bool, add, BinaryComparisonOperation.Operator.Lt, y)
+        negation = UnaryBooleanOperation(bool, UnaryBooleanOperation.Operator.Neg, comparison)
+        transformed = make_condition_not_free(negation)
+        self.assertEqual(str(transformed), "(x + 1) >= y")
+        self.assertEqual(str(comparison), "(x + 1) < y")
+        self.assertIs(transformed.left, add)
+        self.assertEqual(transformed.ids(), {x, y})
+
+        # expressions holding lists are mutable and therefore not interned
+        self.assertIsNot(ListDisplay(list, [x]), ListDisplay(list, [x]))
+        self.assertEqual(ListDisplay(list, [x]), ListDisplay(list, [x]))
+        variadic = VariadicArithmeticOperation(int, BinaryArithmeticOperation.Operator.Add, [x, y])
+        negation = UnaryArithmeticOperation(int, UnaryArithmeticOperation.Operator.Sub, variadic)
+        self.assertIsNot(negation, UnaryArithmeticOperation(int, UnaryArithmeticOperation.Operator.Sub, variadic))
+        self.assertEqual(str(negation), "-(x + y)")
+
+        self.assertIs(ProgramPoint(1, 2), ProgramPoint(1, 2))
+        self.assertEqual(str(ProgramPoint(1, 2)), "[line:1, column:2]")
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTest(TestExpressionInterning())
+    runner = unittest.TextTestRunner()
+    runner.run(s)
+
+
+if __name__ == '__main__':
+    suite()
@@ -0,0 +1,62 @@
+import ast
+import unittest
+
+from abstract_domains.traces.traces_domain import BoolTracesState, maximal, join_sets, less_equal_sets, split_unique
+from core.expressions import VariableIdentifier
+from engine.backward import BackwardInterpreter
+from frontend.cfg_generator import ast_to_cfg
+from semantics.backward import DefaultBackwardSemantics
+
+
+class TestAntichain(unittest.TestCase):
+    def runTest(self):
+        a, b, c = 'a', 'b', 'c'
+        keys = frozenset({a, b})
+        left = (keys, frozenset({(a, a)}))
+        right = (keys, frozenset({(b, b)}))
+
+        # only the maximal elements are kept
+        both = (keys, frozenset({(a, a), (b, b)}))
+        self.assertEqual(maximal([left, right, both]), frozenset({both}))
+
+        # the sets of traces obtained from the same initial traces are merged
+        joined = join_sets(frozenset({left}), frozenset({right}))
+        self.assertEqual(joined, frozenset({both}))
+        self.assertTrue(less_equal_sets(frozenset({left}), joined))
+        self.assertFalse(less_equal_sets(joined, frozenset({left})))
+
+        # initial traces leading to different values end up in different elements
+        relation = frozenset({(a, a), (b, b), (c, c)})
+        values = {a: 0, b: 1, c: 0}
+        split = split_unique(frozenset({(frozenset({a, b, c}), relation)}), lambda t, _: values[t], [None])
+        self.assertEqual(split, frozenset({
+            (frozenset({a, c}), frozenset({(a, a), (c, c)})),
+            (frozenset({b}), frozenset({(b, b)}))
+        }))
+
+
+class TestHyperScaling(unittest.TestCase):
+    """A hyper analysis over six variables (i.e., 2^64 sets of initial traces) stays tractable."""
+
+    def runTest(self):
+        source = "a = input()\nb = input()\nc = a and b\nd = a or b\nif c:\n    e = d\nelse:\n    e = not d\nf = e\n" \
+                 "print(f)\n"
+        root = ast.parse(source)
+        cfg = ast_to_cfg(root)
+        variables = [VariableIdentifier(int, name) for name in 'abcdef']
+        result = BackwardInterpreter(cfg, DefaultBackwardSemantics(), 3).analyze(BoolTracesState(variables, True))
+        state = result.get_node_result(cfg.in_node)[0]
+        self.assertTrue(state.sets)
+        self.assertTrue(len(state.sets) <= 2 ** len(variables))
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTest(TestAntichain())
+    s.addTest(TestHyperScaling())
+    runner = unittest.TextTestRunner()
+    runner.run(s)
+
+
+if __name__ == '__main__':
+    suite()
@@ -0,0 +1,83 @@
+import unittest
+from copy import deepcopy
+from math import inf
+
+from abstract_domains.numerical.interval_domain import IntervalDomain, IntervalArrayDomain
+from unittests.generic_tests import ExpressionTreeTestCase
+from core.expressions import VariableIdentifier, BinaryArithmeticOperation, Literal, BinaryComparisonOperation, \
+    BinaryBooleanOperation, UnaryBooleanOperation
+
+
+class TestIntervalArrayDomainEvaluation(ExpressionTreeTestCase):
+    def __init__(self, name, source):
+        super().__init__(source, f"IntervalArrayDomain - {name}")
+
+    def runTest(self):
+        result = super().runTest()
+
+        result_store = result.get_node_result(self.cfg.nodes[2])[1]
+        right_expr = result_store.store[self.variables['a']]
+
+        store = IntervalArrayDomain(list(self.variables.values()))
+        expected_store = IntervalDomain(list(self.variables.values()))
+
+        # the array-backed evaluation agrees with the evaluation of the interval domain
+        self.assertEqual(repr(store.evaluate(right_expr)), repr(expected_store.evaluate(right_expr)))
+
+
+class TestIntervalArrayDomainLattice(unittest.TestCase):
+    def runTest(self):
+        x = VariableIdentifier(int, 'x')
+        y = VariableIdentifier(int, 'y')
+
+        a = IntervalArrayDomain([x, y])
+        a.set_bounds(x, 0, 1)
+        a.set_bounds(y, 5, 5)
+        b = IntervalArrayDomain([x, y])
+        b.set_bounds(x, 1, 3)
+        b.set_bounds(y, 5, 5)
+
+        self.assertEqual(repr(deepcopy(a).join(b)), "x→[0,3], y→[5,5]")
+        self.assertEqual(repr(deepcopy(a).meet(b)), "x→[1,1], y→[5,5]")
+        self.assertEqual(repr(deepcopy(a).widening(b)), f"x→[0,{inf}], y→[5,5]")
+        self.assertTrue(a.less_equal(deepcopy(a).join(b)))
+        self.assertFalse(a.less_equal(b))
+
+        a.set_bounds(y, 6, 5)
+        self.assertTrue(a.is_bottom())
+        self.assertTrue(a.less_equal(b))
+        self.assertEqual(repr(a.join(b)), repr(b))
+        self.assertTrue(IntervalArrayDomain([x, y]).is_top())
+
+        c = IntervalArrayDomain([x, y])
+        c.set_bounds(x, -2, 3)
+        expr = BinaryArithmeticOperation(int, x, BinaryArithmeticOperation.Operator.Mult, Literal(int, "-2"))
+        c.assign_variable({y}, {expr})
+        self.assertEqual(c.get_bounds(y), (-6, 4))
+
+        # conditions refine the bounds of the compared variables
+        lt = BinaryComparisonOperation(bool, x, BinaryComparisonOperation.Operator.Lt, y)
+        c.assume({lt})
+        self.assertEqual((c.get_bounds(x), c.get_bounds(y)), ((-2, 3), (-1, 4)))
+        not_lt = UnaryBooleanOperation(bool, UnaryBooleanOperation.Operator.Neg, lt)
+        c.assume({not_lt})
+        self.assertEqual((c.get_bounds(x), c.get_bounds(y)), ((-1, 3), (-1, 3)))
+        one = BinaryComparisonOperation(bool, x, BinaryComparisonOperation.Operator.Eq, Literal(int, "1"))
+        five = BinaryComparisonOperation(bool, x, BinaryComparisonOperation.Operator.GtE, Literal(int, "5"))
+        d = deepcopy(c).assume({BinaryBooleanOperation(bool, one, BinaryBooleanOperation.Operator.Or, five)})
+        self.assertEqual(d.get_bounds(x), (1, 1))
+        self.assertTrue(deepcopy(c).assume({five}).is_bottom())
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTest(TestIntervalArrayDomainEvaluation("arithmetic", """a = 3 * (2 + 5) - 4"""))
+    s.addTest(TestIntervalArrayDomainEvaluation("negation", """a = -3 * (2 - 7)"""))
+    s.addTest(TestIntervalArrayDomainEvaluation("input", """a = 2 * int(input()) + 1"""))
+    s.addTest(TestIntervalArrayDomainLattice())
+    runner = unittest.TextTestRunner()
+    runner.run(s)
+
+
+if __name__ == '__main__':
+    suite()
@@ -0,0 +1,39 @@
+import unittest
+from copy import deepcopy
+
+from abstract_domains.numerical.interval_domain import IntervalLattice, IntervalDomain
+from core.expressions import VariableIdentifier
+
+
+class TestIntervalLatticeBottom(unittest.TestCase):
+    def runTest(self):
+        x = VariableIdentifier(int, 'x')
+
+        # a bottom interval is not top, whatever its bounds were before
+        bottom = IntervalLattice().top().bottom()
+        self.assertTrue(bottom.is_bottom())
+        self.assertFalse(bottom.is_top())
+        self.assertFalse(IntervalLattice().bottom().top().is_bottom())
+
+        # bottom is neutral for the join, in both directions
+        self.assertEqual(deepcopy(IntervalLattice(0, 3)).join(bottom), IntervalLattice(0, 3))
+        self.assertEqual(deepcopy(bottom).join(IntervalLattice(0, 3)), IntervalLattice(0, 3))
+
+        # the same holds for stores (e.g., the results of predecessors that are not analyzed yet)
+        state = IntervalDomain([x])
+        state.set_bounds(x, 0, 3)
+        joined = deepcopy(state).join(IntervalDomain([x]).top().bottom())
+        self.assertEqual(joined.get_bounds(x), (0, 3))
+        self.assertTrue(IntervalDomain([x]).bottom().less_equal(state))
+        self.assertFalse(state.less_equal(IntervalDomain([x]).bottom()))
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTest(TestIntervalLatticeBottom())
+    runner = unittest.TextTestRunner()
+    runner.run(s)
+
+
+if __name__ == '__main__':
+    suite()
@@ -0,0 +1,93 @@
+import unittest
+
+from abstract_domains.numerical.interval_domain import IntervalLattice
+from core.expressions import VariableIdentifier, Literal, BinaryArithmeticOperation, BinaryComparisonOperation, \
+    UnaryBooleanOperation, Index
+from core.expressions_tools import ExpressionVisitor, ExpressionTransformer, Visit, Polynomial, \
+    make_condition_not_free
+
+
+class Depth(ExpressionVisitor):
+    def visit_BinaryArithmeticOperation(self, expr, depth):
+        left = yield Visit(expr.left, depth + 1)
+        right = yield Visit(expr.right, depth + 1)
+        return max(left, right)
+
+    # noinspection PyUnusedLocal
+    def visit_Literal(self, expr, depth):
+        return depth
+
+    def visit_VariableIdentifier(self, expr, depth):
+        raise ValueError(depth)
+
+
+class Tolerant(ExpressionVisitor):
+    def visit_BinaryArithmeticOperation(self, expr):
+        try:
+            return (yield expr.left) + (yield expr.right)
+        except ValueError:
+            return -1
+
+    # noinspection PyMethodMayBeStatic
+    def visit_Literal(self, expr):
+        return int(expr.val)
+
+    def visit_VariableIdentifier(self, expr):
+        raise ValueError(expr)
+
+
+class Renaming(ExpressionTransformer):
+    # noinspection PyMethodMayBeStatic
+    def visit_VariableIdentifier(self, expr):
+        return VariableIdentifier(expr.typ, expr.name.upper())
+
+
+class TestIterativeVisitors(unittest.TestCase):
+    def runTest(self):
+        x, one = VariableIdentifier(int, 'x'), Literal(int, '1')
+        add = BinaryArithmeticOperation.Operator.Add
+
+        # expressions much deeper than the recursion limit
+        deep = one
+        for _ in range(5000):
+            deep = BinaryArithmeticOperation(int, deep, add, one)
+        self.assertEqual(IntervalLattice.evaluate(deep), IntervalLattice(5001, 5001))
+        self.assertEqual(Depth().visit(deep, 0), 5000)
+        self.assertEqual(Polynomial.from_expression(deep), Polynomial.constant(5001))
+        self.assertIs(Renaming().visit(deep), deep)
+
+        deep_x = BinaryArithmeticOperation(int, x, add, deep)
+        renamed = Renaming().visit(deep_x)
+        self.assertEqual(renamed.left, VariableIdentifier(int, 'X'))
+        self.assertIs(renamed.right, deep)
+        self.assertEqual(deep_x.ids(), {x})
+        difference = BinaryArithmeticOperation(int, deep_x, BinaryArithmeticOperation.Operator.Sub, deep_x)
+        self.assertEqual(Polynomial.from_expression(difference), Polynomial())
+
+        condition = BinaryComparisonOperation(bool, deep_x, BinaryComparisonOperation.Operator.Lt, one)
+        not_free = make_condition_not_free(UnaryBooleanOperation(bool, UnaryBooleanOperation.Operator.Neg, condition))
+        self.assertEqual(not_free.operator, BinaryComparisonOperation.Operator.GtE)
+        self.assertIs(not_free.left, deep_x)
+
+        # errors are propagated to the visitor functions of the ancestors
+        with self.assertRaises(ValueError):
+            Depth().visit(deep_x, 0)
+        self.assertEqual(Tolerant().visit(BinaryArithmeticOperation(int, one, add, one)), 2)
+        self.assertEqual(Tolerant().visit(BinaryArithmeticOperation(int, deep_x, add, one)), 0)
+
+        # visitor functions are looked up once per visitor class and class of expressions
+        function, generator = Depth._dispatch[BinaryArithmeticOperation]
+        self.assertIs(function, Depth.visit_BinaryArithmeticOperation)
+        self.assertTrue(generator)
+        self.assertEqual(IntervalLattice.evaluate(Index(int, x, one)), IntervalLattice().top())
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTest(TestIterativeVisitors())
+    runner = unittest.TextTestRunner()
+    runner.run(s)
+
+
+if __name__ == '__main__':
+    suite()
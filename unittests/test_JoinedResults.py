@@ -0,0 +1,59 @@
+import ast
+import unittest
+
+from abstract_domains.numerical.octagon_domain import OctagonDomain
+from core.expressions import VariableIdentifier
+from engine.forward import ForwardInterpreter
+from frontend.cfg_generator import ast_to_cfg
+from semantics.forward import DefaultForwardSemantics
+
+source = """
+x = int(input())
+if x > 0:
+    x = 3
+else:
+    x = 4
+print(x)
+"""
+
+
+class TestJoinedResults(unittest.TestCase):
+    def runTest(self):
+        cfg = ast_to_cfg(ast.parse(source))
+        x = VariableIdentifier(int, 'x')
+        result = ForwardInterpreter(cfg, DefaultForwardSemantics(), 3).analyze(OctagonDomain([x]))
+
+        stmts = {str(stmt): stmt for node in cfg.nodes.values() for stmt in node.stmts}
+        then_location, else_location = (stmts['x = 3'].pp, None), (stmts['x = 4'].pp, None)
+        then_state = result.get_result_after(*then_location)
+
+        joined = result.join_results(then_location, else_location)
+        self.assertEqual((joined.get_lb(x), joined.get_ub(x)), (3, 4))
+        # the join is computed once and shared in both directions
+        self.assertIs(result.join_results(then_location, else_location), joined)
+        self.assertIs(result.join_results(else_location, then_location), joined)
+        # the joined states are left untouched
+        self.assertEqual((then_state.get_lb(x), then_state.get_ub(x)), (3, 3))
+        # joining a state with itself needs no computation
+        self.assertIs(result.join_results(then_location, then_location), then_state)
+
+        # the cache is keyed by program points, hence also hits for recomputed states of a lazy result
+        lazy = ForwardInterpreter(cfg, DefaultForwardSemantics(), 3, lazy=True).analyze(OctagonDomain([x]))
+        joined = lazy.join_results(then_location, else_location)
+        lazy.get_node_result(cfg.in_node)  # recomputes the states of another node
+        self.assertIs(lazy.join_results(else_location, then_location), joined)
+        # the cache is bounded
+        lazy.max_joined_results = 2
+        lazy.join_results(then_location, (stmts['print(x)'].pp, None))
+        self.assertIsNot(lazy.join_results(then_location, else_location), joined)
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTest(TestJoinedResults())
+    runner = unittest.TextTestRunner()
+    runner.run(s)
+
+
+if __name__ == '__main__':
+    suite()
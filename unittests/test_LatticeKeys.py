@@ -0,0 +1,59 @@
+import unittest
+from copy import deepcopy
+
+from abstract_domains.liveness.liveness_domain import BitLivenessState, LivenessState, LivenessLattice
+from abstract_domains.numerical.interval_domain import IntervalLattice, IntervalDomain
+from abstract_domains.numerical.octagon_domain import OctagonDomain
+from abstract_domains.usage.usage_domains import UsedDomain
+from core.expressions import VariableIdentifier
+from core.expressions_tools import PLUS, MINUS
+
+
+class TestLatticeKeys(unittest.TestCase):
+    def runTest(self):
+        x, y = VariableIdentifier(int, 'x'), VariableIdentifier(int, 'y')
+
+        # equal lattice elements have equal keys and hash values
+        self.assertEqual(IntervalLattice(1, 2), IntervalLattice(1, 2))
+        self.assertEqual(hash(IntervalLattice(1, 2)), hash(IntervalLattice(1, 2)))
+        self.assertEqual(IntervalLattice(2, 1), IntervalLattice(3, 1))
+        self.assertNotEqual(IntervalLattice(1, 2), IntervalLattice(1, 3))
+
+        intervals = IntervalDomain([x, y])
+        intervals.set_bounds(x, 0, 1)
+        self.assertNotEqual(intervals, IntervalDomain([x, y]))
+        self.assertEqual(intervals, deepcopy(intervals))
+
+        octagon = OctagonDomain([x, y])
+        octagon[MINUS, x, PLUS, y] = 4
+        self.assertEqual(octagon, deepcopy(octagon))
+        self.assertEqual(len({octagon, deepcopy(octagon), OctagonDomain([x, y])}), 2)
+
+        liveness = LivenessState([x, y])
+        liveness[x] = LivenessLattice.Status.Live
+        self.assertEqual(hash(liveness), hash(deepcopy(liveness)))
+        self.assertNotEqual(liveness, LivenessState([x, y]))
+
+        usage = UsedDomain([x, y])
+        self.assertEqual(usage, deepcopy(usage))
+
+        # cached hash values are invalidated when the element changes
+        bits = BitLivenessState([x, y])
+        copy = deepcopy(bits)
+        states = {bits}
+        copy.live = 1
+        self.assertNotIn(copy, states)
+        bits.join(copy)
+        self.assertIn(bits, {copy})
+        self.assertEqual(hash(bits), hash(copy))
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTest(TestLatticeKeys())
+    runner = unittest.TextTestRunner()
+    runner.run(s)
+
+
+if __name__ == '__main__':
+    suite()
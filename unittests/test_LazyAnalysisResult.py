@@ -0,0 +1,59 @@
+import ast
+import unittest
+
+from abstract_domains.numerical.octagon_domain import OctagonDomain
+from core.cfg import Conditional
+from core.expressions import VariableIdentifier
+from engine.forward import ForwardInterpreter
+from engine.result import LazyAnalysisResult
+from frontend.cfg_generator import ast_to_cfg
+from semantics.forward import DefaultForwardSemantics
+
+source = """
+x = int(input())
+y = 0
+while x > 0:
+    x = x - 1
+    y = y + 2
+if y > 3:
+    y = 3
+print(y)
+"""
+
+
+class TestLazyAnalysisResult(unittest.TestCase):
+    def runTest(self):
+        cfg = ast_to_cfg(ast.parse(source))
+        x = VariableIdentifier(int, 'x')
+        y = VariableIdentifier(int, 'y')
+
+        eager = ForwardInterpreter(cfg, DefaultForwardSemantics(), 3).analyze(OctagonDomain([x, y]))
+        lazy = ForwardInterpreter(cfg, DefaultForwardSemantics(), 3, lazy=True).analyze(OctagonDomain([x, y]))
+        self.assertIsInstance(lazy, LazyAnalysisResult)
+        # only the entry state of each node is stored
+        self.assertTrue(all(len(states) == 1 for states in lazy._node_result.values()))
+
+        for node in cfg.nodes.values():
+            self.assertEqual(str(lazy.get_node_result(node)), str(eager.get_node_result(node)))
+            # the states within a node are recomputed once for consecutive queries
+            for stmt in reversed(node.stmts):
+                self.assertEqual(str(lazy.get_result_before(stmt.pp)), str(eager.get_result_before(stmt.pp)))
+                self.assertEqual(str(lazy.get_result_after(stmt.pp)), str(eager.get_result_after(stmt.pp)))
+                self.assertIs(lazy.get_result_after(stmt.pp), lazy.get_node_result(node)[node.stmts.index(stmt) + 1])
+        for edge in cfg.edges.values():
+            if isinstance(edge, Conditional):
+                pp = edge.condition.pp
+                self.assertEqual(str(lazy.get_result_after(pp, edge.kind)), str(eager.get_result_after(pp, edge.kind)))
+                self.assertEqual(str(lazy.get_result_before(pp, edge.kind)),
+                                 str(eager.get_result_before(pp, edge.kind)))
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTest(TestLazyAnalysisResult())
+    runner = unittest.TextTestRunner()
+    runner.run(s)
+
+
+if __name__ == '__main__':
+    suite()
@@ -0,0 +1,52 @@
+import ast
+import unittest
+
+from abstract_domains.numerical.octagon_domain import OctagonDomain
+from core.expressions import VariableIdentifier
+from engine.forward import ForwardInterpreter
+from engine.liveness.liveness_analysis import live_variables
+from frontend.cfg_generator import ast_to_cfg
+from semantics.forward import DefaultForwardSemantics
+
+source = """
+x = int(input())
+y = 3
+if x > 0:
+    x = y
+else:
+    x = 4
+print(x)
+"""
+
+
+class TestLivenessProjection(unittest.TestCase):
+    def runTest(self):
+        cfg = ast_to_cfg(ast.parse(source))
+        x = VariableIdentifier(int, 'x')
+        y = VariableIdentifier(int, 'y')
+
+        liveness = live_variables(cfg, [x, y])
+        result = ForwardInterpreter(cfg, DefaultForwardSemantics(), 3, liveness).analyze(OctagonDomain([x, y]))
+
+        stmts = {str(stmt): stmt for node in cfg.nodes.values() for stmt in node.stmts}
+        # y is live until it is copied to x
+        before_copy = result.get_result_before(stmts['x = y'].pp)
+        self.assertEqual(before_copy.variables, [y])
+        self.assertEqual(before_copy.get_ub(y), 3)
+        # only x is live before the output, y has been projected out
+        before_print = result.get_result_before(stmts['print(x)'].pp)
+        self.assertEqual(before_print.variables, [x])
+        self.assertEqual(before_print.get_ub(x), 4)
+        # nothing is live at the end of the program
+        self.assertEqual(result.get_result_after(stmts['print(x)'].pp).variables, [])
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTest(TestLivenessProjection())
+    runner = unittest.TextTestRunner()
+    runner.run(s)
+
+
+if __name__ == '__main__':
+    suite()
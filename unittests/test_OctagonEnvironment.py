@@ -0,0 +1,69 @@
+import unittest
+from copy import deepcopy
+from math import inf
+
+from abstract_domains.numerical.octagon_domain import OctagonLattice
+from core.expressions import *
+from core.expressions_tools import MINUS, PLUS
+
+
+class TestOctagonEnvironment(unittest.TestCase):
+    def runTest(self):
+        a = VariableIdentifier(int, 'a')
+        b = VariableIdentifier(int, 'b')
+        c = VariableIdentifier(int, 'c')
+        d = VariableIdentifier(int, 'd')
+
+        octagon = OctagonLattice([a, b])
+        octagon.set_bounds(a, 0, 5)
+        octagon.set_octagonal_constraint(PLUS, b, MINUS, a, 1)  # b - a <= 1
+
+        # adding a variable keeps all constraints, the new variable is unconstrained
+        octagon.add_variables([c])
+        self.assertEqual(octagon.variables, [a, b, c])
+        self.assertEqual(octagon.dbm.size, 6)
+        self.assertEqual(str(octagon), "0≤a≤5, b-a≤1")
+
+        # constraints on variables outside the environment add the variable
+        octagon.set_octagonal_constraint(PLUS, d, MINUS, b, 0)  # d - b <= 0
+        self.assertEqual(octagon.variables, [a, b, c, d])
+
+        # removing a variable keeps the constraints implied through it
+        octagon.remove_variables([b])
+        self.assertEqual(octagon.variables, [a, c, d])
+        self.assertEqual(octagon.get_ub(d), 6)
+        self.assertEqual(octagon.get_octagonal_constraint(PLUS, d, MINUS, a), 1)
+
+        # renaming and permuting keeps the constraints of each variable
+        octagon.rename_variables({d: b})
+        octagon.permute_variables([b, c, a])
+        self.assertEqual(octagon.variables, [b, c, a])
+        self.assertEqual(octagon.get_ub(b), 6)
+        self.assertEqual(octagon.get_octagonal_constraint(PLUS, b, MINUS, a), 1)
+
+        # lattice operations unify differing environments
+        other = OctagonLattice([a])
+        other.set_bounds(a, 2, 8)
+        other_copy = deepcopy(other)
+        joined = deepcopy(octagon).join(other)
+        self.assertEqual(joined.get_bounds(a), (0, 8))
+        self.assertEqual(joined.get_ub(b), inf)
+        self.assertEqual(str(other), str(other_copy))  # the other octagon is not modified
+        self.assertTrue(octagon.less_equal(joined))
+        self.assertFalse(joined.less_equal(octagon))
+
+        # order tests modify neither octagon
+        self.assertFalse(other.less_equal(octagon))
+        self.assertEqual(other.variables, [a])
+        self.assertEqual(octagon.variables, [b, c, a])
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTest(TestOctagonEnvironment())
+    runner = unittest.TextTestRunner()
+    runner.run(s)
+
+
+if __name__ == '__main__':
+    suite()
@@ -0,0 +1,56 @@
+import unittest
+from copy import deepcopy
+from itertools import product
+
+from abstract_domains.usage.usage_domains import UsedStore
+from abstract_domains.usage.used import UsedLattice, U, S, O, N
+from core.expressions import VariableIdentifier
+
+
+class TestFiniteLattice(unittest.TestCase):
+    def runTest(self):
+        lattice = UsedStore.LATTICE
+        elements = [N, O, S, U]
+        codes1 = bytearray(lattice.code(e) for e, _ in product(elements, elements))
+        codes2 = bytearray(lattice.code(e) for _, e in product(elements, elements))
+
+        # the tabulated operations agree with the operations of the lattice elements
+        joined = lattice.apply2(lattice.join, codes1, codes2)
+        met = lattice.apply2(lattice.meet, codes1, codes2)
+        less_equal = lattice.apply2(lattice.less_equal, codes1, codes2)
+        combined = lattice.apply2(UsedStore.COMBINE, codes1, codes2)
+        for i, (e1, e2) in enumerate(product(elements, elements)):
+            self.assertEqual(lattice.element(joined[i]), UsedLattice(e1).join(UsedLattice(e2)).used)
+            self.assertEqual(lattice.element(met[i]), UsedLattice(e1).meet(UsedLattice(e2)).used)
+            self.assertEqual(bool(less_equal[i]), UsedLattice(e1).less_equal(UsedLattice(e2)))
+            self.assertEqual(lattice.element(combined[i]), UsedLattice.COMBINE[(e1, e2)])
+        descended = lattice.apply(UsedStore.DESCEND, bytearray(lattice.code(e) for e in elements))
+        self.assertEqual([lattice.element(code) for code in descended], [UsedLattice.DESCEND[e] for e in elements])
+
+
+class TestPackedStore(unittest.TestCase):
+    def runTest(self):
+        x, y, z = VariableIdentifier(int, 'x'), VariableIdentifier(int, 'y'), VariableIdentifier(int, 'z')
+        store1 = UsedStore([x, y, z])
+        store1[x], store1[y] = U, O
+        store2 = deepcopy(store1)
+        store2[y], store2[z] = S, S
+
+        self.assertEqual(store1[y], O)
+        self.assertTrue(store1.less_equal(deepcopy(store1).join(store2)))
+        self.assertFalse(store2.less_equal(store1))
+        self.assertEqual([e for _, e in deepcopy(store1).join(store2).items()], [U, U, S])
+        self.assertEqual([e for _, e in deepcopy(store1).descend().items()], [S, N, N])
+        self.assertEqual(repr(store1), "x→{}, y→{}, z→{}".format(repr(U), repr(O), repr(N)))
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTest(TestFiniteLattice())
+    s.addTest(TestPackedStore())
+    runner = unittest.TextTestRunner()
+    runner.run(s)
+
+
+if __name__ == '__main__':
+    suite()
@@ -0,0 +1,71 @@
+import ast
+import unittest
+from math import inf
+
+from abstract_domains.numerical.interval_domain import IntervalDomain
+from core.cfg import Conditional
+from core.expressions import VariableIdentifier, Input
+from core.statements import Assignment, Call, IndexStmt, LiteralEvaluation
+from engine.forward import ForwardInterpreter
+from frontend.cfg_generator import ast_to_cfg
+from semantics.forward import DefaultForwardSemantics
+from semantics.semantics import pre_evaluate
+
+
+class UnknownLiteralSemantics(DefaultForwardSemantics):
+    """Literals evaluate to an unknown input."""
+
+    def literal_evaluation_semantics(self, stmt: LiteralEvaluation, state):
+        state.result = {Input(stmt.literal.typ)}
+        return state
+
+
+class TestPreEvaluation(unittest.TestCase):
+    def runTest(self):
+        source = "list_a = [1, 2]\nb = list_a[0]\nif b < 3:\n    b = int(input())\n"
+        cfg = pre_evaluate(ast_to_cfg(ast.parse(source)))
+        stmts = [stmt for node in cfg.nodes.values() for stmt in node.stmts]
+        a, b = VariableIdentifier(list, 'list_a'), VariableIdentifier(int, 'b')
+
+        # side-effect-free statements are evaluated once into frozen expression sets
+        first = next(stmt for stmt in stmts if isinstance(stmt, Assignment) and stmt.left.var == a)
+        self.assertIsNone(first.expressions)
+        self.assertEqual(first.left.expressions, frozenset({a}))
+        self.assertEqual([str(expr) for expr in first.right.expressions], ["[1, 2]"])
+        second = next(stmt for stmt in stmts if isinstance(stmt, Assignment) and isinstance(stmt.right, IndexStmt))
+        self.assertEqual([str(expr) for expr in second.right.expressions], ["list_a[0]"])
+        condition = next(edge.condition for edge in cfg.edges.values() if isinstance(edge, Conditional))
+        self.assertIsNone(condition.expressions)
+        self.assertEqual(condition.arguments[0].expressions, frozenset({b}))
+
+        # statements depending on the state are still executed
+        call = next(stmt.right for stmt in stmts if isinstance(stmt, Assignment) and isinstance(stmt.right, Call))
+        self.assertIsNone(call.expressions)
+        self.assertIsNone(call.arguments[0].expressions)
+
+        # the runtime semantics use the pre-evaluated expressions
+        semantics = DefaultForwardSemantics()
+        state = semantics.semantics(second.right, IntervalDomain([b]))
+        self.assertIs(state.result, second.right.expressions)
+        state = semantics.semantics(Assignment(second.pp, second.left, first.right.items[1]), state)
+        self.assertEqual(state.get_bounds(b), (2, 2))
+
+        # semantics overriding how pre-evaluated statements are executed are not bypassed
+        cfg = ast_to_cfg(ast.parse("b = 3\n"))
+        assignment = next(stmt for node in cfg.nodes.values() for stmt in node.stmts)
+        result = ForwardInterpreter(cfg, DefaultForwardSemantics(), 3).analyze(IntervalDomain([b]))
+        self.assertEqual(result.get_result_after(assignment.pp).get_bounds(b), (3, 3))
+        self.assertIsNotNone(assignment.right.expressions)
+        result = ForwardInterpreter(cfg, UnknownLiteralSemantics(), 3).analyze(IntervalDomain([b]))
+        self.assertEqual(result.get_result_after(assignment.pp).get_bounds(b), (-inf, inf))
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTest(TestPreEvaluation())
+    runner = unittest.TextTestRunner()
+    runner.run(s)
+
+
+if __name__ == '__main__':
+    suite()
@@ -0,0 +1,46 @@
+import unittest
+from copy import deepcopy
+
+from abstract_domains.usage.usage_domains import UsedDomain
+from abstract_domains.usage.used import U, S, N
+from core.expressions import VariableIdentifier
+
+
+class TestScopeStackSharing(unittest.TestCase):
+    def runTest(self):
+        x, y = VariableIdentifier(int, 'x'), VariableIdentifier(int, 'y')
+        domain = UsedDomain([x, y])
+        domain.output({x})
+        domain.enter_if()
+        self.assertEqual(len(domain.stack), 2)
+
+        # copies share their frames until they are modified
+        copy = deepcopy(domain)
+        self.assertTrue(all(f1 is f2 for f1, f2 in zip(domain.stack, copy.stack)))
+        copy.output({y})
+        self.assertIs(domain.stack[0], copy.stack[0])
+        self.assertIsNot(domain.stack[1], copy.stack[1])
+        self.assertEqual(domain.stack[1][y], N)
+        self.assertEqual(copy.stack[1][y], U)
+
+        # the original stack copies shared frames before modifying them
+        domain.frame(0)[y] = S
+        self.assertEqual(copy.stack[0][y], N)
+
+        # popping combines the top frame into the (owned) frame below
+        copy.exit_if()
+        copy.assume({x})
+        self.assertEqual(len(copy.stack), 1)
+        self.assertEqual(copy.stack[0][y], U)
+        self.assertEqual(domain.stack[0][y], S)
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTest(TestScopeStackSharing())
+    runner = unittest.TextTestRunner()
+    runner.run(s)
+
+
+if __name__ == '__main__':
+    suite()
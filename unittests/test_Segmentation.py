@@ -69,9 +69,40 @@ class TestSegmentationUnification(unittest.TestCase):
         print(s1)
 
 
+class TestSegmentationJoinManySegments(unittest.TestCase):
+    def runTest(self):
+        n = VariableIdentifier(int, 'n')  # n is used as the length of the list
+        octagon = OctagonLattice([n])
+        octagon.set_lb(n, 100)
+
+        def segmentation(limits, used):
+            seg = SegmentedListLattice(n, UsedLattice, octagon)
+            for k, limit in enumerate(limits):
+                seg.add_limit(k, Limit({VarFormOct.from_expression(Literal(int, str(limit)))}),
+                              predicate_after=UsedLattice(used), possibly_empty_before=False)
+            return seg
+
+        s1 = segmentation(range(2, 100, 2), Used.U)
+        s2 = segmentation(range(1, 100, 2), Used.S)
+        s2_before = str(s2)
+
+        s1.join(s2)
+        # all limits of both segmentations are kept (in order) and the other segmentation is left untouched
+        self.assertEqual(len(s1), 100)
+        self.assertEqual([str(limit) for limit in s1.limits[:4]], ['{【[0,0]】}', '{【[1,1]】}', '{【[2,2]】}', '{【[3,3]】}'])
+        self.assertEqual(str(s1.limits[-1]), '{【+n】}')
+        self.assertEqual(str(s2), s2_before)
+        self.assertEqual(s1.predicates[0].used, Used.N)
+        self.assertEqual(s1.predicates[1].used, Used.S)
+        self.assertEqual(s1.predicates[2].used, Used.U)
+        self.assertTrue(s2.less_equal(s1))
+        self.assertEqual(str(s2), s2_before)
+
+
 def suite():
     s = unittest.TestSuite()
     s.addTest(TestSegmentationUnification())
+    s.addTest(TestSegmentationJoinManySegments())
     runner = unittest.TextTestRunner()
     runner.run(s)
 
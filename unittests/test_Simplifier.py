@@ -23,10 +23,12 @@ class TestSimplifier(ExpressionTreeTestCase):
 def suite():
     s = unittest.TestSuite()
     s.addTest(TestSimplifier("simple", """a = b + 2 + 3""", "b + 5"))
-    s.addTest(TestSimplifier("simple", """a = c - 4 - b + 2 + 3""", "c + (-b) + 1"))
-    s.addTest(TestSimplifier("simple", """a = c - 10 - b + 2 + 3""", "c + (-b) + (-5)"))
-    s.addTest(TestSimplifier("simple", """a = -(c - 3) - b""", "(-c) + (-b) + 3"))
-    s.addTest(TestSimplifier("simple", """a = -(c - 3) * (3 + 4)""", "((-c) * 3) + ((-c) * 4) + 21"))
+    s.addTest(TestSimplifier("simple", """a = c - 4 - b + 2 + 3""", "(-b) + c + 1"))
+    s.addTest(TestSimplifier("simple", """a = c - 10 - b + 2 + 3""", "(-b) + c + (-5)"))
+    s.addTest(TestSimplifier("simple", """a = -(c - 3) - b""", "(-b) + (-c) + 3"))
+    s.addTest(TestSimplifier("simple", """a = -(c - 3) * (3 + 4)""", "(-(7 * c)) + 21"))
+    s.addTest(TestSimplifier("scaling", """a = 2 * (b - (c - 3)) - b""", "b + (-(2 * c)) + 6"))
+    s.addTest(TestSimplifier("cancellation", """a = (b + c) * (b - c) + c * c""", "b * b"))
     runner = unittest.TextTestRunner()
     runner.run(s)
 
@@ -0,0 +1,50 @@
+import unittest
+from copy import copy, deepcopy
+
+from abstract_domains.numerical.interval_domain import IntervalLattice
+from abstract_domains.numerical.linear_forms import QuasiLinearForm
+from core.cfg import Basic, Conditional
+from core.expressions import VariableIdentifier, Literal, BinaryArithmeticOperation, ListDisplay
+from core.expressions_tools import ExpressionTransformer
+from core.statements import ProgramPoint, VariableAccess
+
+
+class Incrementer(ExpressionTransformer):
+    # noinspection PyMethodMayBeStatic
+    def visit_Literal(self, expr):
+        return Literal(expr.typ, str(int(expr.val) + 1))
+
+
+class TestSlottedDataModel(unittest.TestCase):
+    def runTest(self):
+        x = VariableIdentifier(int, 'x')
+        add = BinaryArithmeticOperation(int, x, BinaryArithmeticOperation.Operator.Add, Literal(int, '1'))
+        access = VariableAccess(ProgramPoint(1, 0), x)
+        edge = Conditional(Basic(1), access, Basic(2))
+        for element in (x, add, access, access.pp, edge, edge.source, IntervalLattice(), QuasiLinearForm()):
+            self.assertFalse(hasattr(element, '__dict__'), type(element))
+
+        # transformers and copies work on slotted expressions
+        self.assertIs(Incrementer().visit(add), BinaryArithmeticOperation(int, x, add.operator, Literal(int, '2')))
+        items = ListDisplay(list, [add])
+        self.assertEqual(Incrementer().visit(items).items[0].right, Literal(int, '2'))
+        self.assertEqual(deepcopy(items), items)
+        self.assertIsNot(copy(items), items)
+
+        # slotted lattice elements are copied and replaced
+        interval = IntervalLattice(1, 2)
+        copied = deepcopy(interval)
+        copied.bottom()
+        self.assertEqual(interval, IntervalLattice(1, 2))
+        self.assertTrue(interval.replace(copied).is_bottom())
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTest(TestSlottedDataModel())
+    runner = unittest.TextTestRunner()
+    runner.run(s)
+
+
+if __name__ == '__main__':
+    suite()
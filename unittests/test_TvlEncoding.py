@@ -0,0 +1,50 @@
+import unittest
+
+from abstract_domains.traces.traces_domain import TvlTracesState
+from core.expressions import VariableIdentifier, Literal, UnaryBooleanOperation, BinaryBooleanOperation
+
+
+class TestTvlEncoding(unittest.TestCase):
+    def runTest(self):
+        x, y, z = VariableIdentifier(bool, 'x'), VariableIdentifier(bool, 'y'), VariableIdentifier(bool, 'z')
+        encoding = TvlTracesState.TvlEncoding([x, y, z])
+
+        # encoding and decoding
+        trace = encoding.encode(('T', '?', 'F'))
+        self.assertEqual(encoding.decode(trace), "(T?F)")
+        self.assertTrue(encoding.test(trace, x, 'T'))
+        self.assertTrue(encoding.test(trace, y, '?'))
+        self.assertTrue(encoding.test(trace, z, 'F'))
+        self.assertFalse(encoding.test(trace, z, '?'))
+
+        # replacement extends the trace
+        replaced = encoding.replace(trace, x, 'F')
+        self.assertEqual(encoding.decode(replaced), "(F?F)(T?F)")
+        self.assertEqual(encoding.decode(encoding.replace(replaced, y, 'F')), "(FFF)(F?F)(T?F)")
+        false = encoding.encode(('F', 'F', 'F'))
+        self.assertNotEqual(encoding.replace(false, x, 'F'), false)
+
+        # three-valued evaluation
+        And, Or = BinaryBooleanOperation.Operator.And, BinaryBooleanOperation.Operator.Or
+        neg = UnaryBooleanOperation(bool, UnaryBooleanOperation.Operator.Neg, y)
+        self.assertEqual(encoding.evaluate(trace, neg), '?')
+        self.assertEqual(encoding.evaluate(trace, BinaryBooleanOperation(bool, x, And, y)), '?')
+        self.assertEqual(encoding.evaluate(trace, BinaryBooleanOperation(bool, x, Or, y)), 'T')
+        self.assertEqual(encoding.evaluate(trace, BinaryBooleanOperation(bool, z, Or, z)), 'F')
+        self.assertEqual(encoding.evaluate(trace, Literal(bool, 'False')), 'F')
+
+        # selection of the values of some variables
+        mask = encoding.mask([x])
+        self.assertEqual(trace & mask, encoding.encode(('T', 'F', 'T')) & mask)
+        self.assertNotEqual(trace & mask, encoding.encode(('?', '?', 'F')) & mask)
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTest(TestTvlEncoding())
+    runner = unittest.TextTestRunner()
+    runner.run(s)
+
+
+if __name__ == '__main__':
+    suite()
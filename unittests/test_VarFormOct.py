@@ -1,7 +1,7 @@
 import unittest
 
 from abstract_domains.numerical.octagon_domain import OctagonLattice
-from abstract_domains.segmentation.bounds import VarFormOct
+from abstract_domains.segmentation.bounds import VarFormOct, BoundComparator
 from core.expressions import *
 from core.expressions_tools import MINUS, PLUS
 
@@ -47,9 +47,33 @@ class TestVarFormOct(unittest.TestCase):
         self.assertFalse(f1.le_octagonal(f2, octagon))
 
 
+class TestBoundComparator(unittest.TestCase):
+    def runTest(self):
+        a = VariableIdentifier(int, 'a')
+        b = VariableIdentifier(int, 'b')
+        b_minus_1 = BinaryArithmeticOperation(int, b, BinaryArithmeticOperation.Operator.Sub, Literal(int, '1'))
+
+        octagon = OctagonLattice([a, b])
+        octagon.set_octagonal_constraint(PLUS, a, MINUS, b, -2)  # a - b <= -2
+        comparator = BoundComparator(octagon)
+
+        f1 = VarFormOct.from_expression(a)
+        f2 = VarFormOct.from_expression(b_minus_1)
+        self.assertTrue(comparator.lt(f1, f2))
+        self.assertTrue(comparator.le(f1, f2))
+        self.assertFalse(comparator.ge(f1, f2))
+        self.assertFalse(comparator.eq(f1, f2))
+
+        # comparisons are answered from the cache for syntactically equal bounds (even if octagon changes)
+        octagon.forget(a)
+        self.assertTrue(comparator.lt(VarFormOct.from_expression(a), VarFormOct.from_expression(b_minus_1)))
+        self.assertFalse(BoundComparator(octagon).lt(f1, f2))
+
+
 def suite():
     s = unittest.TestSuite()
     s.addTest(TestVarFormOct())
+    s.addTest(TestBoundComparator())
     runner = unittest.TextTestRunner()
     runner.run(s)
 
@@ -1,6 +1,8 @@
 import unittest
 from unittest import TestCase
-from abstract_domains.numerical.dbm import IntegerCDBM
+from math import inf
+
+from abstract_domains.numerical.dbm import IntegerCDBM, DBM
 
 
 class TestCDBM(TestCase):
@@ -122,9 +124,60 @@ class TestCDBM(TestCase):
         self.assertTrue(not consistent or dbm.tightly_closed)
 
 
+class TestDBM(TestCase):
+    def test_close(self):
+        dbm = DBM(4)
+        dbm[0, 1] = 5  # v1 <= 5
+        dbm[1, 2] = 1  # v2 - v1 <= 1
+        dbm[2, 3] = -2  # v3 - v2 <= -2
+        self.assertTrue(dbm.close())
+        self.assertTrue(dbm.closed)
+        self.assertEqual(dbm[0, 2], 6)
+        self.assertEqual(dbm[0, 3], 4)
+        self.assertEqual(dbm[1, 3], -1)
+
+        dbm[3, 1] = 0  # v1 - v3 <= 0, negative cycle with v3 - v1 <= -1
+        self.assertFalse(dbm.closed)
+        self.assertFalse(dbm.close())
+
+    def test_tighten(self):
+        dbm = DBM(4)
+        dbm[0, 1] = 5
+        dbm[1, 2] = 1
+        dbm.close()
+
+        # incremental closure agrees with a full closure
+        self.assertTrue(dbm.tighten(2, 3, -2))
+        self.assertTrue(dbm.closed)
+        expected = DBM(4)
+        expected[0, 1] = 5
+        expected[1, 2] = 1
+        expected[2, 3] = -2
+        expected.close()
+        self.assertEqual(list(dbm.values()), list(expected.values()))
+
+        self.assertTrue(dbm.tighten(0, 3, 10))  # weaker than the implied bound
+        self.assertEqual(dbm[0, 3], 4)
+        self.assertFalse(dbm.tighten(3, 1, 0))
+
+    def test_dimensions(self):
+        dbm = DBM(3)
+        dbm[0, 1] = 5
+        dbm[1, 2] = 1
+        dbm.close()
+        dbm.add_dimensions(1)
+        self.assertTrue(dbm.closed)
+        self.assertEqual(dbm[0, 3], inf)
+        self.assertEqual(dbm[3, 3], 0)
+        dbm.select_dimensions([0, 2])
+        self.assertEqual(dbm.size, 2)
+        self.assertEqual(dbm[0, 1], 6)
+
+
 def suite():
     s = unittest.TestSuite()
     s.addTest(TestCDBM())
+    s.addTest(TestDBM())
     runner = unittest.TextTestRunner()
     runner.run(s)
 
@@ -0,0 +1,17 @@
+x = int(input())
+y = int(input())
+z = 2
+
+# make positive
+if x < 0:
+    x = -x
+if y < 0:
+    y = -y
+
+if 2 * x + 3 * y <= 6:
+    # RESULT: 0≤x≤3, 0≤y≤2, 2≤z≤2, y-x≤2, -y+x≤3, z-x≤2, -z+x≤1, z-y≤2, -z+y≤0
+    print(x)
+
+if x + y + z < 10:
+    # RESULT: 0≤x≤7, 0≤y≤7, 2≤z≤2, y-x≤7, -y+x≤7, z-x≤2, -z+x≤5, z-y≤2, -z+y≤5
+    print(y)
@@ -0,0 +1,10 @@
+x = int(input())
+y = int(input())
+a = x - 1
+b = a
+
+b += 10
+
+# RESULT: b-a≤10, -b+a≤-10, x-a≤1, -x+a≤-1, x-b≤-9, -x+b≤9
+
+print(a - x)
@@ -0,0 +1,10 @@
+n = int(input())
+i = 0
+j = 5
+
+while i < n:
+    i = i + 1
+    j = j + 1
+
+# RESULT: 0≤i, 5≤j, j-i≤5, -j+i≤-5, n-i≤0, n-j≤-5
+print(j)
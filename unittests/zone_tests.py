@@ -0,0 +1,20 @@
+import glob
+import os
+import unittest
+
+from abstract_domains.numerical.zone_domain import ZoneDomain
+from unittests.octagon_tests import OctagonTestCase
+
+
+def suite():
+    s = unittest.TestSuite()
+    g = os.getcwd() + '/zone/**.py'
+    for path in glob.iglob(g):
+        if os.path.basename(path) != "__init__.py":
+            s.addTest(OctagonTestCase(path, ZoneDomain))
+    runner = unittest.TextTestRunner()
+    runner.run(s)
+
+
+if __name__ == '__main__':
+    suite()